@@ -0,0 +1,823 @@
+#!/usr/bin/env python3
+#
+# Benchmarks of encoding, decoding and loading databases, printing
+# the time or memory used by each compared alternative. They are not
+# part of the test suite.
+#
+# > env PYTHONPATH=. python3 benchmarks/database.py [benchmark ...]
+#
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from unittest.mock import patch
+
+import numpy as np
+
+import cantools
+
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    BENCHMARKS[function.__name__] = function
+
+    return function
+
+
+@benchmark
+def codec_engines():
+    """Compare the decode performance of the codec engines.
+
+    """
+
+    iterations = 10000
+    db = cantools.database.load_file('tests/files/dbc/vehicle.dbc')
+    message = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+    data = b'\x30\x23\x78\x12\x26\x19\x30\x00'
+
+    for codec_engine in ['bitstruct', 'compiled']:
+        db.codec_engine = codec_engine
+
+        def decode():
+            message.decode(data)
+
+        time = timeit.timeit(decode, number=iterations)
+
+        print("Decode time {}: {} s ({} s/decode)".format(
+            codec_engine,
+            time,
+            time / iterations))
+
+
+@benchmark
+def multiplexer_dispatch():
+    """Compare the decode performance of a nested multiplexed message
+    with and without the multiplexer dispatch table.
+
+    """
+
+    iterations = 10000
+    db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+    message = db.get_message_by_name('Extended')
+    data = message.encode({'S0': 0, 'S1': 0, 'S2': 1, 'S3': 2, 'S6': 1, 'S7': 3})
+
+    def decode():
+        message.decode(data)
+
+    time = timeit.timeit(decode, number=iterations)
+    print("Decode time dispatch: {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+    dispatch = message._mux_dispatch
+    message._mux_dispatch = None
+    time = timeit.timeit(decode, number=iterations)
+    message._mux_dispatch = dispatch
+    print("Decode time tree: {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+
+@benchmark
+def decode_selected_signals():
+    """Compare the decode performance of all signals and two selected
+    signals of a message with 64 signals.
+
+    """
+
+    iterations = 10000
+    message = cantools.database.can.Message(
+        1,
+        'Wide',
+        8,
+        [cantools.database.can.Signal(f'S{i}', i, 1) for i in range(64)])
+    data = bytes(range(8))
+    decoder = message.make_decoder(['S3', 'S40'])
+
+    def decode():
+        message.decode(data)
+
+    def decode_selected():
+        decoder(data)
+
+    time = timeit.timeit(decode, number=iterations)
+    print("Decode time all signals: {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+    time = timeit.timeit(decode_selected, number=iterations)
+    print("Decode time selected signals: {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+
+@benchmark
+def database_decoder():
+    """Compare the decode performance of Database.decode_message() and a
+    decoder created by Database.decoder().
+
+    """
+
+    iterations = 10000
+    data = b'\xc0\x06\xe0\x00\x00\x00\x00\x00'
+
+    for codec_engine in ['bitstruct', 'compiled']:
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                         codec_engine=codec_engine)
+        decoder = db.decoder()
+
+        def decode_message():
+            db.decode_message(496, data)
+
+        def decode():
+            decoder(496, data)
+
+        time = timeit.timeit(decode_message, number=iterations)
+        print("Decode time decode_message() {}: {} s ({} s/decode)".format(
+            codec_engine,
+            time,
+            time / iterations))
+
+        time = timeit.timeit(decode, number=iterations)
+        print("Decode time decoder() {}: {} s ({} s/decode)".format(
+            codec_engine,
+            time,
+            time / iterations))
+
+
+@benchmark
+def database_decoder_memoizing():
+    """Compare the decode performance of a decoder without and with a
+    cache when decoding the same frame repeatedly.
+
+    """
+
+    iterations = 10000
+    db = cantools.database.load_file('tests/files/dbc/vehicle.dbc')
+    message = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+    data = b'\x00\x11\x22\x33\x44\x55\x66\x77'
+
+    for cache_size in [0, 128]:
+        decoder = db.decoder(cache_size=cache_size)
+
+        def decode():
+            decoder(message.frame_id, data)
+
+        time = timeit.timeit(decode, number=iterations)
+        print("Decode time cache size {}: {} s ({} s/decode)".format(
+            cache_size,
+            time,
+            time / iterations))
+
+
+@benchmark
+def decode_lazy():
+    """Compare the performance of decoding all signals of a 64 bytes
+    message with 128 signals and lazily decoding one of them.
+
+    """
+
+    iterations = 10000
+    message = cantools.database.can.Message(
+        1,
+        'Wide',
+        64,
+        [
+            cantools.database.can.Signal(f'S{i}', 4 * i, 4, scale=0.5)
+            for i in range(128)
+        ])
+    data = bytes(range(64))
+
+    def decode():
+        message.decode(data)['S100']
+
+    def decode_lazy():
+        message.decode_lazy(data)['S100']
+
+    time = timeit.timeit(decode, number=iterations)
+    print("Decode time all signals: {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+    time = timeit.timeit(decode_lazy, number=iterations)
+    print("Decode time lazy: {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+
+@benchmark
+def make_encoder():
+    """Compare the encode performance of Message.encode() and an
+    encoder created by Message.make_encoder().
+
+    """
+
+    iterations = 10000
+    db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+    message = db.get_message_by_name('ExampleMessage')
+    encoder = message.make_encoder(['Enable', 'AverageRadius', 'Temperature'])
+
+    def encode():
+        message.encode({
+            'Enable': 'Enabled',
+            'AverageRadius': 3.2,
+            'Temperature': 250.55
+        })
+
+    def encode_encoder():
+        encoder('Enabled', 3.2, 250.55)
+
+    time = timeit.timeit(encode, number=iterations)
+    print("Encode time encode(): {} s ({} s/encode)".format(
+        time,
+        time / iterations))
+
+    time = timeit.timeit(encode_encoder, number=iterations)
+    print("Encode time encoder(): {} s ({} s/encode)".format(
+        time,
+        time / iterations))
+
+
+@benchmark
+def encode_batch():
+    """Compare the encode performance of Message.encode() in a loop
+    and Message.encode_batch().
+
+    """
+
+    rows = 10000
+    db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+    message = db.get_message_by_name('ExampleMessage')
+    columns = {
+        'Enable': np.ones(rows, dtype=np.int64),
+        'AverageRadius': np.linspace(0.0, 5.0, rows),
+        'Temperature': np.linspace(230.0, 260.0, rows)
+    }
+    frames = [
+        {name: column[i].item() for name, column in columns.items()}
+        for i in range(rows)
+    ]
+
+    def encode():
+        for frame in frames:
+            message.encode(frame)
+
+    def encode_batch():
+        message.encode_batch(columns)
+
+    time = timeit.timeit(encode, number=1)
+    print("Encode time encode(): {} s ({} s/frame)".format(
+        time,
+        time / rows))
+
+    time = timeit.timeit(encode_batch, number=1)
+    print("Encode time encode_batch(): {} s ({} s/frame)".format(
+        time,
+        time / rows))
+
+
+@benchmark
+def validate_raw():
+    """Compare the performance of checking the signal values of
+    recorded frames one by one and with Message.validate_raw().
+
+    """
+
+    frames = 10000
+    db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+    message = db.get_message_by_name('ExampleMessage')
+    payloads = [
+        message.encode({'Enable': 1,
+                        'AverageRadius': 0.1 * (i % 64),
+                        'Temperature': 229.52 + 0.01 * (i % 4096)},
+                       strict=False)
+        for i in range(frames)
+    ]
+
+    def validate():
+        for payload in payloads:
+            decoded = message.decode(payload, decode_choices=False)
+
+            try:
+                message._assert_signal_values_valid(decoded, True)
+            except cantools.database.EncodeError:
+                pass
+
+    def validate_raw():
+        message.validate_raw(payloads)
+
+    time = timeit.timeit(validate, number=1)
+    print("Validate time decode(): {} s ({} s/frame)".format(
+        time,
+        time / frames))
+
+    time = timeit.timeit(validate_raw, number=1)
+    print("Validate time validate_raw(): {} s ({} s/frame)".format(
+        time,
+        time / frames))
+
+
+@benchmark
+def iter_container():
+    """Compare the performance of unpacking a container message with
+    30 contained messages out of 300 by Message.unpack_container()
+    and Message.iter_container().
+
+    """
+
+    iterations = 1000
+    contained_messages = [
+        cantools.database.can.Message(frame_id=i,
+                                      name=f'Contained{i}',
+                                      length=8,
+                                      signals=[],
+                                      header_id=i)
+        for i in range(300)
+    ]
+    container = cantools.database.can.Message(
+        frame_id=1,
+        name='Container',
+        length=64 * 8,
+        signals=[],
+        contained_messages=contained_messages)
+    encoded = container.encode([
+        (contained_messages[10 * i], bytes(8)) for i in range(30)
+    ])
+
+    def unpack_container():
+        container.unpack_container(encoded)
+
+    def iter_container():
+        for _ in container.iter_container(encoded):
+            pass
+
+    time = timeit.timeit(unpack_container, number=iterations)
+    print("Unpack time unpack_container(): {} s ({} s/unpack)".format(
+        time,
+        time / iterations))
+
+    time = timeit.timeit(iter_container, number=iterations)
+    print("Unpack time iter_container(): {} s ({} s/unpack)".format(
+        time,
+        time / iterations))
+
+
+@benchmark
+def container_packer():
+    """Compare the performance of encoding container messages with
+    Message.encode() and a container packer.
+
+    """
+
+    iterations = 1000
+    db = cantools.database.load_file('tests/files/arxml/system-4.2.arxml')
+    container = db.get_message_by_name('OneToContainThemAll')
+    contained = [(0x100 + i, bytes(4)) for i in range(container.length // 8)]
+    packer = container.make_container_packer(strict=False)
+
+    def encode():
+        container.encode(contained, strict=False)
+
+    def pack():
+        for header, data in contained:
+            packer.add(header, data)
+
+        packer.flush()
+
+    time = timeit.timeit(encode, number=iterations)
+    print("Encode time encode(): {} s ({} s/encode)".format(
+        time,
+        time / iterations))
+
+    time = timeit.timeit(pack, number=iterations)
+    print("Encode time container packer: {} s ({} s/encode)".format(
+        time,
+        time / iterations))
+
+
+@benchmark
+def codec_engines_message_length():
+    """Compare the decode performance of the codec engines on 8 and 64
+    bytes messages, with one signal per byte and one signal per
+    two bytes respectively.
+
+    """
+
+    iterations = 10000
+
+    for length, signal_length in [(8, 8), (64, 16)]:
+        signals = [
+            cantools.database.can.Signal(
+                f'S{i}',
+                signal_length * i + (7 if i % 2 else 0),
+                signal_length,
+                'big_endian' if i % 2 else 'little_endian',
+                is_signed=(i % 4 < 2),
+                scale=0.1)
+            for i in range(8 * length // signal_length)
+        ]
+        data = bytes(range(length))
+
+        for codec_engine in ['bitstruct', 'compiled']:
+            message = cantools.database.can.Message(
+                frame_id=1,
+                name='Message',
+                length=length,
+                signals=signals,
+                codec_engine=codec_engine)
+
+            def decode():
+                message.decode(data)
+
+            time = timeit.timeit(decode, number=iterations)
+
+            print("Decode time {} bytes {}: {} s ({} s/decode)".format(
+                length,
+                codec_engine,
+                time,
+                time / iterations))
+
+
+@benchmark
+def decode_into():
+    """Compare the performance of copying the values of
+    Message.decode() into arrays and Message.decode_into().
+
+    """
+
+    iterations = 10000
+    db = cantools.database.load_file('tests/files/dbc/vehicle.dbc')
+    message = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+    data = b'\x30\x23\x78\x12\x26\x19\x30\x00'
+    columns = {
+        signal.name: np.zeros(iterations) for signal in message.signals
+    }
+    counter = iter(range(2 * iterations))
+
+    def decode():
+        index = next(counter) % iterations
+
+        for name, value in message.decode(data, False).items():
+            columns[name][index] = value
+
+    def decode_into():
+        message.decode_into(data, columns, next(counter) % iterations)
+
+    time = timeit.timeit(decode, number=iterations)
+    print("Decode time decode(): {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+    time = timeit.timeit(decode_into, number=iterations)
+    print("Decode time decode_into(): {} s ({} s/decode)".format(
+        time,
+        time / iterations))
+
+
+@benchmark
+def decode_as_record():
+    """Compare the memory used by the decoded messages returned by
+    Message.decode() as dictionaries and as records.
+
+    """
+
+    frames = 1000
+    db = cantools.database.load_file('tests/files/dbc/vehicle.dbc')
+    message = db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+    payloads = [
+        bytes([i & 0xff, 0x23, 0x78, 0x12, 0x26, 0x19, 0x30, 0x00])
+        for i in range(frames)
+    ]
+    message.record_class
+
+    for as_record in [False, True]:
+        tracemalloc.start()
+        decoded = [
+            message.decode(payload, as_record=as_record)
+            for payload in payloads
+        ]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del decoded
+
+        print("Memory as_record={}: {} bytes ({} bytes/frame)".format(
+            as_record,
+            size,
+            size / frames))
+
+
+@benchmark
+def choice_lookup():
+    """Decode a message of many signals with choices, of which most
+    raw values have no choice.
+
+    """
+
+    message = cantools.database.can.Message(
+        frame_id=1,
+        name='Choices',
+        length=8,
+        signals=[
+            cantools.database.can.Signal(
+                f'S{i}',
+                8 * i,
+                8,
+                choices={value: f'Choice{value}' for value in range(4)})
+            for i in range(8)
+        ])
+    data = bytes(range(0, 32, 4))
+    iterations = 10000
+
+    for codec_engine in cantools.database.engines.CODEC_ENGINES:
+        message.codec_engine = codec_engine
+
+        def decode():
+            message.decode(data)
+
+        time = timeit.timeit(decode, number=iterations)
+        print("Decode time {}: {} s ({} s/decode)".format(
+            codec_engine,
+            time,
+            time / iterations))
+
+
+@benchmark
+def encode_padding():
+    """Encode a CAN FD message of 64 bytes with and without padding.
+
+    """
+
+    message = cantools.database.can.Message(
+        frame_id=1,
+        name='Padded',
+        length=64,
+        is_fd=True,
+        unused_bit_pattern=0xff,
+        signals=[
+            cantools.database.can.Signal(f'S{i}', 16 * i, 8)
+            for i in range(32)
+        ])
+    data = {f'S{i}': i for i in range(32)}
+    iterations = 10000
+
+    for padding in [False, True]:
+        def encode():
+            message.encode(data, padding=padding)
+
+        time = timeit.timeit(encode, number=iterations)
+        print("Encode time padding={}: {} s ({} s/encode)".format(
+            padding,
+            time,
+            time / iterations))
+
+
+@benchmark
+def load_lazy():
+    """Compare the time to load a database with and without creating
+    the codecs of its messages.
+
+    """
+
+    filename = 'tests/files/dbc/vehicle.dbc'
+    iterations = 5
+
+    for lazy in [False, True]:
+        def load():
+            cantools.database.load_file(filename, lazy=lazy)
+
+        time = timeit.timeit(load, number=iterations)
+        print("Load time lazy={}: {} s ({} s/load)".format(
+            lazy,
+            time,
+            time / iterations))
+
+
+def _copy_attributes(obj, cls, slots):
+    copy = cls.__new__(cls)
+
+    for name in slots:
+        setattr(copy, name, getattr(obj, name))
+
+    return copy
+
+
+@benchmark
+def load_memory():
+    """Compare the memory used per message and signal object of loaded
+    databases with and without __slots__, by copying the objects to
+    instances of equivalent classes storing the attributes in a
+    dictionary. The attribute values are shared by the copies, so
+    only the memory of the objects themselves is measured.
+
+    """
+
+    filenames = [
+        'tests/files/dbc/vehicle.dbc',
+        'tests/files/arxml/system-4.2.arxml',
+        'tests/files/kcd/the_homer.kcd'
+    ]
+
+    for filename in filenames:
+        db = cantools.database.load_file(filename)
+        messages = []
+
+        for message in db.messages:
+            messages.append(message)
+            messages += message.contained_messages or []
+
+        signals = [signal for message in messages for signal in message.signals]
+
+        for cls, objects in [(cantools.database.can.Message, messages),
+                             (cantools.database.can.Signal, signals)]:
+            unslotted_cls = type(f'Unslotted{cls.__name__}', (object, ), {})
+
+            for name, copy_cls in [('with __slots__', cls),
+                                   ('without __slots__', unslotted_cls)]:
+                gc.collect()
+                tracemalloc.start()
+                copies = [
+                    _copy_attributes(obj, copy_cls, cls.__slots__)
+                    for obj in objects
+                ]
+                size, _ = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                size -= sys.getsizeof(copies)
+                del copies
+                print("Memory {} {} {}: {} bytes/object".format(
+                    os.path.basename(filename),
+                    cls.__name__,
+                    name,
+                    size // len(objects)))
+
+
+@benchmark
+def load_file_cache():
+    filename = 'tests/files/arxml/system-4.2.arxml'
+    number = 20
+
+    def load(cache_dir=None):
+        return cantools.database.load_file(filename, cache_dir=cache_dir)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load(cache_dir)
+
+        uncached = timeit.timeit(load, number=number) / number
+        cached = timeit.timeit(lambda: load(cache_dir),
+                               number=number) / number
+
+        with cantools.database.cache.DatabaseCache(cache_dir) as cache:
+            statistics = cache.statistics()
+
+    print(f'Load file uncached: {1e3 * uncached:.3f} ms')
+    print(f'Load file cached:   {1e3 * cached:.3f} ms')
+    print(f'Cache statistics:   {statistics}')
+
+
+@benchmark
+def load_string_autodetect():
+    datas = [
+        ('tests/files/arxml/system-4.2.arxml', 'utf-8'),
+        ('tests/files/dbc/vehicle.dbc', 'cp1252'),
+        ('tests/files/kcd/the_homer.kcd', 'utf-8'),
+        ('tests/files/sym/jopp-6.0.sym', 'cp1252'),
+        ('tests/files/cdd/example.cdd', 'iso-8859-1')
+    ]
+    number = 5
+
+    for filename, encoding in datas:
+        with open(filename, encoding=encoding) as fin:
+            string = fin.read()
+
+        def load():
+            return cantools.database.load_string(string)
+
+        sniffed = timeit.timeit(load, number=number) / number
+
+        with patch('cantools.database.sniff_database_format',
+                   return_value=None):
+            trials = timeit.timeit(load, number=number) / number
+
+        print(f'Load {os.path.basename(filename)}: sniffed '
+              f'{1e3 * sniffed:.3f} ms, trial chain {1e3 * trials:.3f} ms')
+
+
+@benchmark
+def load_dbc_streaming():
+    # A synthetic database of 2000 messages with 8 signals each,
+    # with comments, attributes and choices.
+    lines = [
+        'VERSION ""',
+        'BS_:',
+        'BU_: Node1 Node2',
+        'BA_DEF_ BO_  "GenMsgCycleTime" INT 0 65535;',
+        'BA_DEF_DEF_  "GenMsgCycleTime" 0;'
+    ]
+    statements = []
+
+    for i in range(1, 2001):
+        lines.append(f'BO_ {i} Message{i}: 8 Node1')
+        statements.append(f'CM_ BO_ {i} "Message {i}.";')
+        statements.append(f'BA_ "GenMsgCycleTime" BO_ {i} 100;')
+
+        for j in range(8):
+            lines.append(f' SG_ Signal{i}_{j} : {8 * j}|8@1+ (0.5,-10) '
+                         f'[-10|117.5] "km/h" Node2')
+            statements.append(f'CM_ SG_ {i} Signal{i}_{j} "Signal {j}.";')
+            statements.append(f'VAL_ {i} Signal{i}_{j} 0 "Off" 1 "On" ;')
+
+    string = '\n'.join(lines + statements) + '\n'
+
+    def load(streaming):
+        return cantools.database.load_string(string,
+                                             database_format='dbc',
+                                             lazy=True,
+                                             streaming=streaming)
+
+    grammar = timeit.timeit(lambda: load(False), number=1)
+    streaming = timeit.timeit(lambda: load(True), number=1)
+
+    print(f'Load {len(string) / 1e6:.1f} MB DBC with grammar:   '
+          f'{grammar:.3f} s')
+    print(f'Load {len(string) / 1e6:.1f} MB DBC with streaming: '
+          f'{streaming:.3f} s')
+
+
+@benchmark
+def load_arxml_streaming():
+    # A synthetic system description where most of the file
+    # consists of software component types not needed by the
+    # loader, as is common in real system descriptions.
+    with open('tests/files/arxml/system-4.2.arxml', encoding='utf-8') as fin:
+        string = fin.read()
+
+    component = (
+        '<APPLICATION-SW-COMPONENT-TYPE>'
+        '<SHORT-NAME>Component{}</SHORT-NAME>'
+        '<PORTS>'
+        + ''.join('<P-PORT-PROTOTYPE>'
+                  f'<SHORT-NAME>Port{i}</SHORT-NAME>'
+                  '<PROVIDED-INTERFACE-TREF DEST="SENDER-RECEIVER-INTERFACE">'
+                  f'/Interfaces/Interface{i}'
+                  '</PROVIDED-INTERFACE-TREF>'
+                  '</P-PORT-PROTOTYPE>'
+                  for i in range(20))
+        + '</PORTS>'
+        '</APPLICATION-SW-COMPONENT-TYPE>')
+    string = string.replace(
+        '<ELEMENTS>',
+        '<ELEMENTS>' + ''.join(component.format(i) for i in range(5000)),
+        1)
+
+    for streaming in [False, True]:
+        load_time = timeit.timeit(
+            lambda: cantools.database.load_string(string, streaming=streaming),
+            number=1)
+
+        # Measure the peak memory of the parse separately, as tracing
+        # the allocations slows it down.
+        gc.collect()
+        tracemalloc.start()
+        cantools.database.load_string(string, streaming=streaming)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'Load {len(string) / 1e6:.1f} MB ARXML with '
+              f'streaming={streaming}: {load_time:.3f} s, '
+              f'peak memory {peak / 1e6:.1f} MB')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run given benchmarks, by default all.')
+    parser.add_argument('benchmarks',
+                        nargs='*',
+                        help=f'One of {", ".join(BENCHMARKS)}.')
+    args = parser.parse_args()
+
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark '{name}'")
+
+    # Some database files of the tests overwrite messages, which is
+    # logged as a warning.
+    logging.basicConfig(level=logging.ERROR)
+
+    # The benchmarks load the database files of the tests.
+    os.chdir(os.path.join(SCRIPT_DIR, '..'))
+
+    for name in args.benchmarks or BENCHMARKS:
+        print(f'{name}:')
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main()
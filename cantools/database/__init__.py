@@ -1,5 +1,6 @@
 import os
-from typing import Union, Optional, TextIO, MutableMapping, cast
+import re
+from typing import Dict, Optional, TextIO, Tuple, Type, Union, cast
 from xml.etree import ElementTree
 
 from .errors import ParseError
@@ -8,8 +9,8 @@ from ..compat import fopen
 from . import can
 from . import diagnostics
 from . import utils
+from .cache import DatabaseCache
 import textparser
-import diskcache
 
 # Remove once less users are using the old package structure.
 from .can import *
@@ -80,25 +81,101 @@ def _load_file_cache(filename: StringPathLike,
                      strict: bool,
                      cache_dir: str,
                      sort_signals: utils.type_sort_signals,
+                     codec_engine: str,
+                     lazy: bool,
+                     streaming: bool,
                      ) -> Union[can.Database, diagnostics.Database]:
-    with open(filename, 'rb') as fin:
-        key = fin.read()
+    def load_database() -> Union[can.Database, diagnostics.Database]:
+        with fopen(filename, 'r', encoding=encoding) as fin:
+            return load(cast(TextIO, fin),
+                        database_format,
+                        frame_id_mask,
+                        prune_choices,
+                        strict,
+                        sort_signals,
+                        codec_engine,
+                        lazy,
+                        streaming)
+
+    options = {
+        'database_format': database_format,
+        'encoding': encoding,
+        'frame_id_mask': frame_id_mask,
+        'prune_choices': prune_choices,
+        'strict': strict,
+        'sort_signals': sort_signals,
+        'codec_engine': codec_engine,
+        'lazy': lazy,
+        'streaming': streaming
+    }
+
+    with DatabaseCache(cache_dir) as cache:
+        return cache.load(filename, options, load_database)
+
+
+# The errors raised by the loaders of each database format if given
+# string is not in that format, in the order the formats are tried.
+_LOAD_ERRORS: Dict[str, Tuple[Type[Exception], ...]] = {
+    'arxml': (ElementTree.ParseError, ValueError),
+    'dbc': (textparser.ParseError, ),
+    'kcd': (ElementTree.ParseError, ValueError),
+    'sym': (ParseError, ),
+    'cdd': (ElementTree.ParseError, ValueError)
+}
+
+# The database format of each XML root element.
+_XML_ROOT_FORMATS = {
+    'AUTOSAR': 'arxml',
+    'NetworkDefinition': 'kcd',
+    'CANDELA': 'cdd'
+}
+
+# The number of characters at the start of a string that are searched
+# for keywords of text formats.
+_SNIFF_LENGTH = 4096
+
+_RE_XML_PROLOG = re.compile(r'\s*(?:<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^>]*>)',
+                            re.DOTALL)
+_RE_XML_ROOT = re.compile(r'\s*<(?:[\w.-]+:)?([\w.-]+)[\s/>]')
+_RE_SYM = re.compile(r'^\s*FormatVersion\s*=', re.MULTILINE)
+_RE_DBC = re.compile(r'^\s*(?:VERSION|NS_|BS_|BU_|BO_)\b', re.MULTILINE)
+
+
+def sniff_database_format(string: str) -> Optional[str]:
+    """Returns the database format of given database string, guessed
+    from its start without parsing it, or ``None`` if unknown.
+
+    XML formats are told apart by their root element, and the DBC and
+    SYM formats by keywords at the start of a line.
+
+    >>> cantools.database.sniff_database_format('VERSION ""\\nBO_ 1 Foo: 8 Bar\\n')
+    'dbc'
 
-    cache: MutableMapping[bytes, Union[can.Database, diagnostics.Database]]
-    with diskcache.Cache(cache_dir) as cache:
-        try:
-            return cache[key]
-        except KeyError:
-            with fopen(filename, 'r', encoding=encoding) as fin:
-                database = load(cast(TextIO, fin),
-                                database_format,
-                                frame_id_mask,
-                                prune_choices,
-                                strict,
-                                sort_signals)
-            cache[key] = database
+    """
+
+    position = 1 if string.startswith('\ufeff') else 0
+
+    while True:
+        mo = _RE_XML_PROLOG.match(string, position)
+
+        if mo is None:
+            break
+
+        position = mo.end()
+
+    mo = _RE_XML_ROOT.match(string, position)
 
-            return database
+    if mo is not None:
+        return _XML_ROOT_FORMATS.get(mo.group(1))
+
+    head = string[position:position + _SNIFF_LENGTH]
+
+    if _RE_SYM.search(head):
+        return 'sym'
+    elif _RE_DBC.search(head):
+        return 'dbc'
+
+    return None
 
 
 def load_file(filename: StringPathLike,
@@ -109,6 +186,9 @@ def load_file(filename: StringPathLike,
               strict: bool = True,
               cache_dir: Optional[str] = None,
               sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+              codec_engine: str = 'bitstruct',
+              lazy: bool = False,
+              streaming: bool = False,
               ) -> Union[can.Database, diagnostics.Database]:
     """Open, read and parse given database file and return a
     :class:`can.Database<.can.Database>` or
@@ -163,11 +243,16 @@ def load_file(filename: StringPathLike,
 
     `cache_dir` specifies the database cache location in the file
     system. Give as ``None`` to disable the cache. By default the
-    cache is disabled. The cache key is the contents of given
-    file. Using a cache will significantly reduce the load time when
+    cache is disabled. The cache key is a hash of the contents of
+    given file, the load options and the cantools version. Unchanged
+    files, by path, size and modification time, are not hashed
+    again. Using a cache will significantly reduce the load time when
     reloading the same file. The cache directory is automatically
-    created if it does not exist. Remove the cache directory
-    `cache_dir` to clear the cache.
+    created if it does not exist. The least recently used databases
+    are evicted when the cache grows beyond
+    :data:`~cantools.database.cache.DEFAULT_SIZE_LIMIT` bytes. See
+    :class:`~cantools.database.cache.DatabaseCache` for statistics,
+    or remove the cache directory `cache_dir` to clear the cache.
 
     See :func:`~cantools.database.load_string()` for descriptions of
     other arguments.
@@ -195,7 +280,10 @@ def load_file(filename: StringPathLike,
                         frame_id_mask,
                         prune_choices,
                         strict,
-                        sort_signals)
+                        sort_signals,
+                        codec_engine,
+                        lazy,
+                        streaming)
     else:
         return _load_file_cache(filename,
                                 database_format,
@@ -204,7 +292,10 @@ def load_file(filename: StringPathLike,
                                 prune_choices,
                                 strict,
                                 cache_dir,
-                                sort_signals)
+                                sort_signals,
+                                codec_engine,
+                                lazy,
+                                streaming)
 
 
 def dump_file(database,
@@ -263,7 +354,10 @@ def load(fp: TextIO,
          frame_id_mask: Optional[int] = None,
          prune_choices: bool = False,
          strict: bool = True,
-         sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit) -> Union[can.Database, diagnostics.Database]:
+         sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+         codec_engine: str = 'bitstruct',
+         lazy: bool = False,
+         streaming: bool = False) -> Union[can.Database, diagnostics.Database]:
     """Read and parse given database file-like object and return a
     :class:`can.Database<.can.Database>` or
     :class:`diagnostics.Database<.diagnostics.Database>` object with
@@ -289,7 +383,10 @@ def load(fp: TextIO,
                        frame_id_mask,
                        prune_choices,
                        strict,
-                       sort_signals)
+                       sort_signals,
+                       codec_engine,
+                       lazy,
+                       streaming)
 
 
 def load_string(string: str,
@@ -297,7 +394,10 @@ def load_string(string: str,
                 frame_id_mask: Optional[int] = None,
                 prune_choices: bool = False,
                 strict: bool = True,
-                sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit) -> Union[can.Database, diagnostics.Database]:
+                sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+                codec_engine: str = 'bitstruct',
+                lazy: bool = False,
+                streaming: bool = False) -> Union[can.Database, diagnostics.Database]:
     """Parse given database string and return a
     :class:`can.Database<.can.Database>` or
     :class:`diagnostics.Database<.diagnostics.Database>` object with
@@ -305,7 +405,10 @@ def load_string(string: str,
 
     `database_format` may be one of ``'arxml'``, ``'dbc'``, ``'kcd'``,
     ``'sym'``, ``'cdd'`` or ``None``, where ``None`` means transparent
-    format.
+    format. The format of a transparent string is guessed with
+    :func:`~cantools.database.sniff_database_format()` and parsed
+    with the guessed format first. All formats are tried in order if
+    that fails.
 
     `prune_choices` is a bool indicating whether signal names are supposed to be abbreviated
     by stripping a common prefix ending on an underscore. This is enabled by default.
@@ -319,6 +422,19 @@ def load_string(string: str,
     If you want the signals to be sorted in another way pass something like
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
 
+    `codec_engine` is ``'bitstruct'`` or ``'compiled'``. See
+    :attr:`can.Database.codec_engine<.can.Database.codec_engine>`.
+
+    If `lazy` is ``True`` the codecs of the messages are created when
+    first needed, see :attr:`can.Database.lazy<.can.Database.lazy>`.
+
+    If `streaming` is ``True``, DBC strings are parsed with a faster
+    parser of the common statements, see
+    :meth:`can.Database.add_dbc_string()<.can.Database.add_dbc_string>`,
+    and ARXML strings are parsed incrementally, keeping only the
+    elements needed, see
+    :meth:`can.Database.add_arxml_string()<.can.Database.add_arxml_string>`.
+
     Raises an
     :class:`~cantools.database.UnsupportedDatabaseFormatError`
     exception if given string does not contain a supported database
@@ -336,21 +452,23 @@ def load_string(string: str,
             "expected database format 'arxml', 'dbc', 'kcd', 'sym', 'cdd' or "
             "None, but got '{}'".format(database_format))
 
-    e_arxml = None
-    e_dbc = None
-    e_kcd = None
-    e_sym = None
-    e_cdd = None
+    def load_database(fmt: str) -> Union[can.Database, diagnostics.Database]:
+        if fmt == 'cdd':
+            cdd_db = diagnostics.Database()
+            cdd_db.add_cdd_string(string)
+
+            return cdd_db
 
-    def load_can_database(fmt: str) -> can.Database:
         db = can.Database(frame_id_mask=frame_id_mask,
                           strict=strict,
-                          sort_signals=sort_signals)
+                          sort_signals=sort_signals,
+                          codec_engine=codec_engine,
+                          lazy=lazy)
 
         if fmt == 'arxml':
-            db.add_arxml_string(string)
+            db.add_arxml_string(string, streaming)
         elif fmt == 'dbc':
-            db.add_dbc_string(string)
+            db.add_dbc_string(string, streaming)
         elif fmt == 'kcd':
             db.add_kcd_string(string)
         elif fmt == 'sym':
@@ -361,36 +479,28 @@ def load_string(string: str,
 
         return db
 
-    if database_format in ['arxml', None]:
-        try:
-            return load_can_database('arxml')
-        except (ElementTree.ParseError, ValueError) as e:
-            e_arxml = e
-
-    if database_format in ['dbc', None]:
-        try:
-            return load_can_database('dbc')
-        except textparser.ParseError as e:
-            e_dbc = e
-
-    if database_format in ['kcd', None]:
-        try:
-            return load_can_database('kcd')
-        except (ElementTree.ParseError, ValueError) as e:
-            e_kcd = e
+    if database_format is None:
+        # Try the sniffed format first, and then all formats in order
+        # if sniffing failed or the sniffed format did not parse.
+        formats = list(_LOAD_ERRORS)
+        sniffed_format = sniff_database_format(string)
+
+        if sniffed_format is not None:
+            formats.remove(sniffed_format)
+            formats.insert(0, sniffed_format)
+    else:
+        formats = [database_format]
 
-    if database_format in ['sym', None]:
-        try:
-            return load_can_database('sym')
-        except ParseError as e:
-            e_sym = e
+    errors = {}
 
-    if database_format in ['cdd', None]:
+    for fmt in formats:
         try:
-            db = diagnostics.Database()
-            db.add_cdd_string(string)
-            return db
-        except (ElementTree.ParseError, ValueError) as e:
-            e_cdd = e
-
-    raise UnsupportedDatabaseFormatError(e_arxml, e_dbc, e_kcd, e_sym, e_cdd)
+            return load_database(fmt)
+        except _LOAD_ERRORS[fmt] as e:
+            errors[fmt] = e
+
+    raise UnsupportedDatabaseFormatError(errors.get('arxml'),
+                                         errors.get('dbc'),
+                                         errors.get('kcd'),
+                                         errors.get('sym'),
+                                         errors.get('cdd'))
@@ -0,0 +1,228 @@
+# Cache of loaded databases in the file system.
+
+import hashlib
+import os
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+import diskcache
+
+from ..typechecking import StringPathLike
+from ..version import __version__
+
+#: The default maximum size of a cache directory in bytes. The least
+#: recently used entries are evicted when it is exceeded.
+DEFAULT_SIZE_LIMIT = 2 ** 30
+
+# Files are hashed in chunks of this size instead of being read into
+# memory at once.
+_CHUNK_SIZE = 2 ** 20
+
+_HITS_KEY = ('statistics', 'hits')
+_MISSES_KEY = ('statistics', 'misses')
+_STAT_HITS_KEY = ('statistics', 'stat_hits')
+
+T = TypeVar('T')
+
+
+class CacheStatistics(NamedTuple):
+    """Statistics of a database cache directory, as returned by
+    :meth:`DatabaseCache.statistics()`.
+
+    """
+
+    #: The number of loads returning a cached database.
+    hits: int
+
+    #: The number of loads that parsed the database file.
+    misses: int
+
+    #: The number of loads where hashing of the file was skipped as
+    #: its path, size and modification time were unchanged.
+    stat_hits: int
+
+    #: The number of entries in the cache.
+    entries: int
+
+    #: The size of the cache directory in bytes.
+    volume: int
+
+
+def options_key(options: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """Returns a key of given load options that is stable between
+    processes, or ``None`` if an option cannot be part of such a key,
+    for example a lambda function, or a function defined in a script,
+    as functions of different scripts may have the same name.
+
+    """
+
+    key = []
+
+    for name, value in sorted(options.items()):
+        if callable(value):
+            qualname = getattr(value, '__qualname__', None)
+            module = getattr(value, '__module__', None)
+
+            if (qualname is None
+                or module is None
+                or module == '__main__'
+                or '<' in qualname):
+                return None
+
+            value = f'{module}.{qualname}'
+
+        key.append((name, value))
+
+    return tuple(key)
+
+
+def file_digest(filename: StringPathLike) -> str:
+    """Returns the SHA-256 digest of the contents of given file.
+
+    """
+
+    sha256 = hashlib.sha256()
+
+    with open(filename, 'rb') as fin:
+        while True:
+            chunk = fin.read(_CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+class DatabaseCache(object):
+    """A cache of loaded databases in the directory `directory`, used
+    by :func:`~cantools.database.load_file()` when given `cache_dir`.
+
+    A database is cached with a key of the SHA-256 digest of the file
+    contents, the load options and the cantools version, so loading
+    the same file with other options or another version of cantools
+    never returns a wrong database. The digest of each file is in turn
+    cached by its path, size and modification time, so that unchanged
+    files are not read at all.
+
+    The least recently used entries are evicted when the directory
+    grows beyond `size_limit` bytes. The statistics are stored in a
+    subdirectory that is never evicted.
+
+    """
+
+    def __init__(self,
+                 directory: StringPathLike,
+                 size_limit: int = DEFAULT_SIZE_LIMIT) -> None:
+        directory = os.fspath(directory)
+        self._cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit,
+            eviction_policy='least-recently-used')
+        self._statistics = diskcache.Cache(
+            os.path.join(directory, 'statistics'),
+            eviction_policy='none')
+
+    def __enter__(self) -> 'DatabaseCache':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def directory(self) -> str:
+        """The cache directory.
+
+        """
+
+        return cast(str, self._cache.directory)
+
+    def close(self) -> None:
+        """Close the cache.
+
+        """
+
+        self._cache.close()
+        self._statistics.close()
+
+    def digest(self, filename: StringPathLike) -> str:
+        """Returns the SHA-256 digest of the contents of given file,
+        hashing it only if its path, size or modification time has
+        changed since it was last hashed.
+
+        """
+
+        stat = os.stat(filename)
+        key = ('stat',
+               os.path.abspath(filename),
+               stat.st_size,
+               stat.st_mtime_ns)
+        digest = cast(Optional[str], self._cache.get(key))
+
+        if digest is None:
+            digest = file_digest(filename)
+            self._cache[key] = digest
+        else:
+            self._statistics.incr(_STAT_HITS_KEY)
+
+        return digest
+
+    def load(self,
+             filename: StringPathLike,
+             options: Dict[str, Any],
+             load: Callable[[], T]) -> T:
+        """Returns the database of given file loaded with given options
+        from the cache, or calls `load` to load it and adds it to the
+        cache. The cache is bypassed if any of the options cannot be
+        part of a key, see :func:`options_key()`.
+
+        """
+
+        key = options_key(options)
+
+        if key is None:
+            return load()
+
+        key = ('database', self.digest(filename), __version__, key)
+
+        try:
+            database = cast(T, self._cache[key])
+        except KeyError:
+            self._statistics.incr(_MISSES_KEY)
+        else:
+            self._statistics.incr(_HITS_KEY)
+
+            return database
+
+        database = load()
+        self._cache[key] = database
+
+        return database
+
+    def statistics(self) -> CacheStatistics:
+        """Returns statistics of the cache directory.
+
+        """
+
+        return CacheStatistics(self._statistics.get(_HITS_KEY, 0),
+                               self._statistics.get(_MISSES_KEY, 0),
+                               self._statistics.get(_STAT_HITS_KEY, 0),
+                               len(self._cache),
+                               self._cache.volume())
+
+    def clear(self) -> None:
+        """Remove all entries, including the statistics, from the cache.
+
+        """
+
+        self._cache.clear()
+        self._statistics.clear()
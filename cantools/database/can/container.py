@@ -0,0 +1,265 @@
+# Packing of contained messages into container messages.
+
+import struct
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    List,
+    MutableSequence,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..errors import EncodeError
+from ...typechecking import ContainerHeaderSpecType, SignalMappingType
+
+if TYPE_CHECKING:
+    from .message import Message
+
+#: The length of the header of each contained message.
+HEADER_LENGTH = 4
+
+PendingItem = Tuple[ContainerHeaderSpecType, Union[bytes, SignalMappingType]]
+
+
+class ContainerPacker(object):
+    """Packs contained messages into frames of given container message
+    one by one, for example to fill containers from a queue of pending
+    contained messages. Created by
+    :meth:`Message.make_container_packer()<cantools.database.can.Message.make_container_packer()>`.
+
+    Contained messages are written directly into a buffer of the
+    length of the container message. Each contained message is given
+    as a ``(header, data)`` tuple as in the list passed to
+    :meth:`Message.encode()<cantools.database.can.Message.encode()>`
+    of container messages, where `scaling`, `padding` and `strict`
+    have the same meaning.
+
+    The frame is due to be sent when no further contained message
+    fits in it, or if `timeout` is given, when `timeout` seconds have
+    passed since the first contained message was added. `clock`
+    returns the current time in seconds and defaults to
+    :func:`time.monotonic()`.
+
+    """
+
+    def __init__(self,
+                 message: "Message",
+                 scaling: bool = True,
+                 padding: bool = False,
+                 strict: bool = True,
+                 timeout: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if not message.is_container:
+            raise EncodeError(f'Message "{message.name}" is not a container')
+
+        assert message.contained_messages is not None
+
+        self._message = message
+        self._scaling = scaling
+        self._padding = padding
+        self._strict = strict
+        self._timeout = timeout
+        self._clock = clock
+
+        # The header id and the payload length are written at once as
+        # a 32 bits integer.
+        if message.header_byte_order == 'big_endian':
+            self._pack_header = struct.Struct('>I').pack_into
+            self._header_length_shift = 0
+            self._header_id_shift = 8
+        else:
+            self._pack_header = struct.Struct('<I').pack_into
+            self._header_length_shift = 24
+            self._header_id_shift = 0
+
+        self._buffer = bytearray(message.length)
+        self._size = 0
+        self._count = 0
+        self._started: Optional[float] = None
+        self._minimum_length = HEADER_LENGTH + min(
+            [contained_message.length
+             for contained_message in message.contained_messages],
+            default=0)
+
+    @property
+    def message(self) -> "Message":
+        """The container message of this packer.
+
+        """
+
+        return self._message
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of the contained messages added since the
+        last flush, including their headers.
+
+        """
+
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """The number of bytes left in the frame.
+
+        """
+
+        return len(self._buffer) - self._size
+
+    @property
+    def is_full(self) -> bool:
+        """``True`` if none of the contained messages of the container
+        message fits in the frame anymore.
+
+        """
+
+        return self.capacity < self._minimum_length
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return (f"container_packer('{self._message.name}', {self._count}, "
+                f"{self._size})")
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        """Returns ``True`` if the frame is full, or if the timeout has
+        passed since the first contained message was added. `now` is
+        the current time, by default read from the clock.
+
+        """
+
+        if self.is_full:
+            return True
+
+        if self._timeout is None or self._started is None:
+            return False
+
+        if now is None:
+            now = self._clock()
+
+        return now - self._started >= self._timeout
+
+    def add(self,
+            header: ContainerHeaderSpecType,
+            data: Union[bytes, SignalMappingType]) -> bool:
+        """Add given contained message to the frame. Returns ``False``
+        without adding it if it does not fit in the remaining capacity
+        of the frame, and otherwise ``True``.
+
+        """
+
+        # Check the capacity first, as encoding a message which does
+        # not fit is wasted.
+        if HEADER_LENGTH + self._payload_length(header, data) > self.capacity:
+            return False
+
+        if self._strict:
+            self._message.assert_container_encodable([(header, data)],
+                                                     scaling=self._scaling)
+
+        header_id, payload = self._message._encode_contained(header,
+                                                             data,
+                                                             self._scaling,
+                                                             self._padding)
+
+        if header_id >> 24:
+            raise EncodeError(f'Header id 0x{header_id:x} of contained '
+                              f'message is more than 24 bits')
+
+        size = self._size
+        start = size + HEADER_LENGTH
+        end = start + len(payload)
+        self._pack_header(self._buffer,
+                          size,
+                          (header_id << self._header_id_shift)
+                          | (len(payload) << self._header_length_shift))
+        self._buffer[start:end] = payload
+        self._size = end
+        self._count += 1
+
+        if self._started is None:
+            self._started = self._clock()
+
+        return True
+
+    def _payload_length(self,
+                        header: ContainerHeaderSpecType,
+                        data: Union[bytes, SignalMappingType]) -> int:
+        """Returns the length of the payload of given contained message,
+        or 0 if it is unknown, in which case encoding it fails.
+
+        """
+
+        if isinstance(data, bytes):
+            return len(data)
+
+        if isinstance(header, str):
+            contained_message = \
+                self._message.get_contained_message_by_name(header)
+        elif isinstance(header, int):
+            contained_message = \
+                self._message.get_contained_message_by_header_id(header)
+        elif header.header_id is not None:
+            contained_message = \
+                self._message.get_contained_message_by_header_id(header.header_id)
+        else:
+            contained_message = None
+
+        if contained_message is None:
+            return 0
+
+        return contained_message.length
+
+    def fill(self, pending: MutableSequence[PendingItem]) -> int:
+        """Greedily add the contained messages of the queue `pending`
+        that fit in the frame, in order, and remove them from the
+        queue. The messages that do not fit are left in the queue in
+        their original order. Returns the number of added messages.
+
+        If a message cannot be encoded, neither the frame nor the queue
+        is modified and the error is raised.
+
+        """
+
+        remaining: List[PendingItem] = []
+        added = 0
+        size = self._size
+        count = self._count
+        started = self._started
+
+        try:
+            for item in pending:
+                if not self.is_full and self.add(*item):
+                    added += 1
+                else:
+                    remaining.append(item)
+        except Exception:
+            # Remove the messages added so far, as they are still in
+            # the queue.
+            self._size = size
+            self._count = count
+            self._started = started
+            raise
+
+        if added > 0:
+            pending.clear()
+            pending.extend(remaining)
+
+        return added
+
+    def flush(self) -> bytes:
+        """Returns the frame of the contained messages added since the
+        last flush, and starts a new, empty frame.
+
+        """
+
+        frame = bytes(self._buffer[:self._size])
+        self._size = 0
+        self._count = 0
+        self._started = None
+
+        return frame
@@ -1,9 +1,11 @@
 import logging
 from typing import (
     Dict,
+    Iterable,
     List,
     Tuple,
     Optional,
+    Sequence,
     TextIO,
     Union,
 )
@@ -16,9 +18,13 @@ from .formats import sym
 from .formats.arxml import AutosarDatabaseSpecifics
 from .formats.dbc import DbcSpecifics
 from .internal_database import InternalDatabase
+from .decoder import DatabaseDecoder
+from .decoder import DecodedRecord
+from .decoder import MemoizingDecoder
 from .message import Message
 from .node import Node
 from ..errors import DecodeError
+from ..engines import check_codec_engine
 from ..utils import (
     type_sort_signals,
     type_sort_attributes,
@@ -27,7 +33,12 @@ from ..utils import (
     SORT_SIGNALS_DEFAULT
 )
 from ...compat import fopen
-from ...typechecking import StringPathLike, EncodeInputType, DecodeResultType
+from ...typechecking import (
+    BytesLike,
+    StringPathLike,
+    EncodeInputType,
+    DecodeResultType,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -48,6 +59,12 @@ class Database(object):
     If you don't want them to be sorted pass `sort_signals = None`.
     If you want the signals to be sorted in another way pass something like
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
+
+    `codec_engine` selects how the messages' signals are decoded, see
+    :attr:`.codec_engine`.
+
+    If `lazy` is ``True`` the codecs of the messages are created when
+    first needed, see :attr:`.lazy`.
     """
 
     def __init__(self,
@@ -60,7 +77,10 @@ class Database(object):
                  frame_id_mask: Optional[int] = None,
                  strict: bool = True,
                  sort_signals: type_sort_signals = sort_signals_by_start_bit,
+                 codec_engine: str = 'bitstruct',
+                 lazy: bool = False,
                  ) -> None:
+        check_codec_engine(codec_engine)
         self._messages = messages or []
         self._nodes = nodes or []
         self._buses = buses or []
@@ -76,6 +96,8 @@ class Database(object):
         self._frame_id_mask = frame_id_mask
         self._strict = strict
         self._sort_signals = sort_signals
+        self._codec_engine = codec_engine
+        self._lazy = lazy
         self.refresh()
 
     @property
@@ -142,34 +164,112 @@ class Database(object):
     def autosar(self, value: Optional[AutosarDatabaseSpecifics]) -> None:
         self._autosar = value
 
-    def add_arxml(self, fp: TextIO) -> None:
+    @property
+    def codec_engine(self) -> str:
+        """The engine used to decode the signals of all messages in the
+        database, either ``'bitstruct'`` or ``'compiled'``. See
+        :attr:`Message.codec_engine<.Message.codec_engine>`.
+
+        Setting the engine refreshes the database.
+
+        >>> db.codec_engine = 'compiled'
+
+        """
+
+        return self._codec_engine
+
+    @codec_engine.setter
+    def codec_engine(self, value: str) -> None:
+        check_codec_engine(value)
+        self._codec_engine = value
+        self.refresh()
+
+    @property
+    def lazy(self) -> bool:
+        """If ``True``, the codecs used to encode and decode each message
+        are created when the message is first encoded or decoded
+        instead of when the database is refreshed, which makes
+        loading large databases considerably faster. Errors of the
+        `strict` checks of a message are then raised when it is first
+        used. See :attr:`Message.lazy<.Message.lazy>` and
+        :meth:`.warm_up()`.
+
+        Setting it refreshes the database.
+
+        """
+
+        return self._lazy
+
+    @lazy.setter
+    def lazy(self, value: bool) -> None:
+        self._lazy = value
+        self.refresh()
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> None:
+        """Create the codecs of the messages with given names, or of all
+        messages if `names` is ``None``, ahead of their first use in
+        a lazy database. Contained messages of container messages
+        are included.
+
+        >>> db = cantools.database.load_file('foo.dbc', lazy=True)
+        >>> db.warm_up(['Foo', 'Bar'])
+
+        """
+
+        if names is None:
+            messages = self._messages
+        else:
+            messages = [self.get_message_by_name(name) for name in names]
+
+        for message in messages:
+            message._get_codecs()
+
+            for contained_message in message.contained_messages or []:
+                contained_message._get_codecs()
+
+    def add_arxml(self, fp: TextIO, streaming: bool = False) -> None:
         """Read and parse ARXML data from given file-like object and add the
         parsed data to the database.
 
+        See :meth:`.add_arxml_string()` for a description of `streaming`.
+
         """
 
-        self.add_arxml_string(fp.read())
+        self.add_arxml_string(fp.read(), streaming)
 
     def add_arxml_file(self,
                        filename: StringPathLike,
-                       encoding: str = 'utf-8') -> None:
+                       encoding: str = 'utf-8',
+                       streaming: bool = False) -> None:
         """Open, read and parse ARXML data from given file and add the parsed
         data to the database.
 
         `encoding` specifies the file encoding.
 
+        See :meth:`.add_arxml_string()` for a description of `streaming`.
+
         """
 
         with fopen(filename, 'r', encoding=encoding) as fin:
-            self.add_arxml(fin)
+            self.add_arxml(fin, streaming)
 
-    def add_arxml_string(self, string: str) -> None:
+    def add_arxml_string(self, string: str, streaming: bool = False) -> None:
         """Parse given ARXML data string and add the parsed data to the
         database.
 
+        If `streaming` is ``True``, the XML tree is built incrementally
+        and package elements not needed to load the database, for
+        example software component types and port interfaces, are
+        dropped as soon as they have been parsed. This considerably
+        reduces the memory needed to load large system descriptions.
+        The result is the same.
+
         """
 
-        database = arxml.load_string(string, self._strict, sort_signals=self._sort_signals)
+        database = arxml.load_string(string,
+                                     self._strict,
+                                     sort_signals=self._sort_signals,
+                                     streaming=streaming)
 
         self._messages += database.messages
         self._nodes = database.nodes
@@ -179,45 +279,60 @@ class Database(object):
         self._autosar = database.autosar
         self.refresh()
 
-    def add_dbc(self, fp: TextIO) -> None:
+    def add_dbc(self, fp: TextIO, streaming: bool = False) -> None:
         """Read and parse DBC data from given file-like object and add the
         parsed data to the database.
 
+        See :meth:`.add_dbc_string()` for a description of `streaming`.
+
         >>> db = cantools.database.Database()
         >>> with open ('foo.dbc', 'r') as fin:
         ...     db.add_dbc(fin)
 
         """
 
-        self.add_dbc_string(fp.read())
+        self.add_dbc_string(fp.read(), streaming)
 
     def add_dbc_file(self,
                      filename: StringPathLike,
-                     encoding: str = 'cp1252') -> None:
+                     encoding: str = 'cp1252',
+                     streaming: bool = False) -> None:
         """Open, read and parse DBC data from given file and add the parsed
         data to the database.
 
         `encoding` specifies the file encoding.
 
+        See :meth:`.add_dbc_string()` for a description of `streaming`.
+
         >>> db = cantools.database.Database()
         >>> db.add_dbc_file('foo.dbc')
 
         """
 
         with fopen(filename, 'r', encoding=encoding) as fin:
-            self.add_dbc(fin)
+            self.add_dbc(fin, streaming)
 
-    def add_dbc_string(self, string: str) -> None:
+    def add_dbc_string(self, string: str, streaming: bool = False) -> None:
         """Parse given DBC data string and add the parsed data to the
         database.
 
+        If `streaming` is ``True``, the common statements (``BO_``,
+        ``SG_``, ``CM_``, ``BA_``, ``VAL_`` and ``SG_MUL_VAL_``) are
+        parsed one at a time by a hand-written parser instead of
+        tokenizing the whole string first, which is considerably
+        faster and uses less memory for large files. The result is the
+        same.
+
         >>> db = cantools.database.Database()
         >>> with open ('foo.dbc', 'r') as fin:
         ...     db.add_dbc_string(fin.read())
 
         """
 
-        database = dbc.load_string(string, self._strict, sort_signals=self._sort_signals)
+        database = dbc.load_string(string,
+                                   self._strict,
+                                   sort_signals=self._sort_signals,
+                                   streaming=streaming)
 
         self._messages += database.messages
         self._nodes = database.nodes
@@ -450,13 +565,17 @@ class Database(object):
 
     def decode_message(self,
                        frame_id_or_name: Union[int, str],
-                       data: bytes,
+                       data: BytesLike,
                        decode_choices: bool = True,
                        scaling: bool = True,
                        decode_containers: bool = False,
-                       allow_truncated:  bool = False
+                       allow_truncated:  bool = False,
+                       offset: int = 0,
+                       length: Optional[int] = None,
+                       signals: Optional[Sequence[str]] = None,
+                       as_record: bool = False
                        ) \
-        -> DecodeResultType:
+        -> Union[DecodeResultType, DecodedRecord]:
 
         """Decode given signal data `data` as a message of given frame id or
         name `frame_id_or_name`. Returns a dictionary of signal
@@ -479,6 +598,10 @@ class Database(object):
         expect this to misbehave. Trying to decode a container message
         with `decode_containers` set to ``False`` will raise a
         `DecodeError`.
+
+        See :meth:`Message.decode()<cantools.database.can.Message.decode()>`
+        for a description of `offset`, `length`, `signals` and
+        `as_record`.
         """
 
         if isinstance(frame_id_or_name, int):
@@ -494,7 +617,11 @@ class Database(object):
                                       decode_choices,
                                       scaling,
                                       decode_containers=True,
-                                      allow_truncated=allow_truncated)
+                                      allow_truncated=allow_truncated,
+                                      offset=offset,
+                                      length=length,
+                                      signals=signals,
+                                      as_record=as_record)
             else:
                 raise DecodeError(f'Message "{message.name}" is a container '
                                   f'message, but decoding such messages has '
@@ -503,7 +630,71 @@ class Database(object):
         return message.decode(data,
                               decode_choices,
                               scaling,
-                              allow_truncated=allow_truncated)
+                              allow_truncated=allow_truncated,
+                              offset=offset,
+                              length=length,
+                              signals=signals,
+                              as_record=as_record)
+
+    def decoder(self,
+                decode_choices: bool = True,
+                scaling: bool = True,
+                decode_containers: bool = False,
+                allow_truncated: bool = False,
+                cache_size: int = 0,
+                delta: bool = False) -> DatabaseDecoder:
+        """Create a decoder of all messages in this database with given
+        options, intended for decoding a high rate of frames. The
+        decoder is called with a frame id and data and returns the
+        same as :meth:`decode_message()`, but the options are not
+        passed and checked on every call and each message is looked
+        up in a precomputed table of frame ids to bound decode
+        functions.
+
+        The decoder must be created again after this database has
+        been modified.
+
+        >>> decoder = db.decoder()
+        >>> decoder(158, b'\\x01\\x45\\x23\\x00\\x11')
+        {'Bar': 1, 'Fum': 5.0}
+
+        If `cache_size` is greater than zero, the signals of the
+        `cache_size` most recently decoded distinct frames are cached
+        and returned as read-only mappings when the same frame is
+        decoded again, which is useful on buses where cyclic frames
+        often repeat their payload.
+
+        If `delta` is ``True``, only the signals whose raw values
+        changed since the previous frame with the same frame id are
+        returned.
+
+        See :class:`~cantools.database.can.decoder.MemoizingDecoder`
+        for details.
+
+        >>> decoder = db.decoder(cache_size=256, delta=True)
+        >>> decoder(158, b'\\x01\\x45\\x23\\x00\\x11')
+        {'Bar': 1, 'Fum': 5.0}
+        >>> decoder(158, b'\\x01\\x45\\x23\\x00\\x12')
+        {'Fum': 5.25}
+        >>> decoder.hits, decoder.misses
+        (0, 2)
+
+        """
+
+        if cache_size > 0 or delta:
+            return MemoizingDecoder(self,
+                                    decode_choices,
+                                    scaling,
+                                    decode_containers,
+                                    allow_truncated,
+                                    cache_size,
+                                    delta)
+
+        return DatabaseDecoder(self,
+                               decode_choices,
+                               scaling,
+                               decode_containers,
+                               allow_truncated)
 
     def refresh(self) -> None:
         """Refresh the internal database state.
@@ -518,9 +709,16 @@ class Database(object):
         self._frame_id_to_message = {}
 
         for message in self._messages:
+            message.codec_engine = self._codec_engine
+            message.lazy = self._lazy
             message.refresh(self._strict)
             self._add_message(message)
 
+            for contained_message in message.contained_messages or []:
+                contained_message.codec_engine = self._codec_engine
+                contained_message.lazy = self._lazy
+                contained_message.refresh()
+
     def __repr__(self) -> str:
         lines = ["version('{}')".format(self._version), '']
 
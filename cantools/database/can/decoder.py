@@ -0,0 +1,608 @@
+# Decoders of messages with bound options, of a subset of the signals
+# of a message, lazily decoded messages and decoded message records.
+
+import keyword
+import re
+from collections import OrderedDict
+from collections import namedtuple
+from functools import partial
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    cast,
+)
+
+from ..engines import create_decoder
+from ..engines import create_field_extractor
+from ..engines import FieldExtractor
+from ..errors import DecodeError
+from ..utils import create_encode_decode_formats
+from ..utils import data_view
+from ..utils import decode_data
+from ...typechecking import (
+    BytesLike,
+    Codec,
+    DecodeResultType,
+    SignalDictType,
+    SignalMappingType,
+    SignalValueType,
+)
+
+if TYPE_CHECKING:
+    from .database import Database
+    from .message import Message, MuxDispatchNode
+    from .signal import Signal
+
+
+def _select_codec(message: "Message",
+                  codec: Codec,
+                  signal_names: AbstractSet[str]) -> Codec:
+    """Create a copy of given codec with all signals not in
+    `signal_names` removed, except multiplexers. This is a recursive
+    function.
+
+    """
+
+    multiplexers = codec['multiplexers']
+    signals = [
+        signal
+        for signal in codec['signals']
+        if signal.name in signal_names or signal.name in multiplexers
+    ]
+    formats = create_encode_decode_formats(signals, message.length)
+
+    return {
+        'signals': signals,
+        'formats': formats,
+        'decoder': create_decoder(message.codec_engine,
+                                  signals,
+                                  message.length,
+                                  formats),
+        'multiplexers': {
+            signal_name: {
+                mux: _select_codec(message, mux_codec, signal_names)
+                for mux, mux_codec in mux_codecs.items()
+            }
+            for signal_name, mux_codecs in multiplexers.items()
+        }
+    }
+
+
+class MessageDecoder(object):
+    """Decoder of given signals of given message, created by
+    :meth:`Message.make_decoder()<cantools.database.can.Message.make_decoder()>`.
+
+    Only the given signals and the multiplexers they depend on are
+    extracted from the data, and only the given signals are
+    returned. All multiplexers are still validated, so invalid
+    multiplexer ids raise the same errors as
+    :meth:`Message.decode()<cantools.database.can.Message.decode()>`.
+
+    The decoder must be created again after the message has been
+    modified.
+
+    """
+
+    def __init__(self, message: "Message", signal_names: Iterable[str]) -> None:
+        codecs = message._get_codecs()
+        signal_names = list(signal_names)
+
+        for signal_name in signal_names:
+            message.get_signal_by_name(signal_name)
+
+        self._message = message
+        self._signal_names = signal_names
+        self._codec = _select_codec(message,
+                                    codecs,
+                                    set(signal_names))
+        self._mux_dispatch: Optional["MuxDispatchNode"] = \
+            message._create_mux_dispatch(self._codec)
+        self._multiplexers: List[str] = [
+            signal.name
+            for signal in message.signals
+            if signal.is_multiplexer and signal.name not in signal_names
+        ]
+
+    @property
+    def message(self) -> "Message":
+        """The message of this decoder.
+
+        """
+
+        return self._message
+
+    @property
+    def signal_names(self) -> List[str]:
+        """The names of the decoded signals.
+
+        """
+
+        return self._signal_names
+
+    def decode(self,
+               data: BytesLike,
+               decode_choices: bool = True,
+               scaling: bool = True,
+               allow_truncated: bool = False,
+               offset: int = 0,
+               length: Optional[int] = None) -> SignalDictType:
+        """Decode the signals of this decoder from given data. Signals
+        not present in the data, i.e. signals of other multiplexer
+        branches or truncated signals if `allow_truncated` is
+        ``True``, are omitted.
+
+        See
+        :meth:`Message.decode()<cantools.database.can.Message.decode()>`
+        for a description of the arguments.
+
+        >>> decoder = foo.make_decoder(['Fum'])
+        >>> decoder.decode(b'\\x01\\x45\\x23\\x00\\x11')
+        {'Fum': 5.0}
+
+        """
+
+        message = self._message
+        data = data_view(data, offset, length)[:message.length]
+        codec = None
+
+        if self._mux_dispatch is not None and len(data) == message.length:
+            codec = message._dispatch_mux(self._mux_dispatch, data)
+
+        if codec is None:
+            codec = self._codec
+
+        decoded = message._decode(codec,
+                                  data,
+                                  decode_choices,
+                                  scaling,
+                                  allow_truncated)
+
+        for signal_name in self._multiplexers:
+            decoded.pop(signal_name, None)
+
+        return decoded
+
+    __call__ = decode
+
+    def __repr__(self) -> str:
+        return f"decoder('{self._message.name}', {self._signal_names})"
+
+
+
+def _bind_message(message: "Message",
+                  decode_choices: bool,
+                  scaling: bool,
+                  decode_containers: bool,
+                  allow_truncated: bool) -> Callable[[BytesLike], DecodeResultType]:
+    """Returns a function decoding given message with given options.
+
+    """
+
+    if message.is_container:
+        if not decode_containers:
+            def decode_container(data: BytesLike) -> DecodeResultType:
+                raise DecodeError(f'Message "{message.name}" is a container '
+                                  f'message, but decoding such messages has '
+                                  f'not been enabled!')
+
+            return decode_container
+
+        return partial(message.decode_container,
+                       decode_choices=decode_choices,
+                       scaling=scaling,
+                       allow_truncated=allow_truncated)
+
+    codec = message._get_codecs()
+
+    if codec['multiplexers']:
+        return partial(message.decode_simple,
+                       decode_choices=decode_choices,
+                       scaling=scaling,
+                       allow_truncated=allow_truncated)
+
+    length = message.length
+    decoder = codec['decoder']
+
+    # Messages without multiplexers are decoded directly by the codec.
+    if decoder is None:
+        signals = codec['signals']
+        formats = codec['formats']
+
+        def decode_simple(data: BytesLike) -> DecodeResultType:
+            return decode_data(data[:length],
+                               length,
+                               signals,
+                               formats,
+                               decode_choices,
+                               scaling,
+                               allow_truncated)
+    else:
+        decode = decoder.decode
+
+        def decode_simple(data: BytesLike) -> DecodeResultType:
+            return decode(data[:length],
+                          decode_choices,
+                          scaling,
+                          allow_truncated)
+
+    return decode_simple
+
+
+class DatabaseDecoder(object):
+    """Decoder of all messages of given database with given options,
+    created by
+    :meth:`Database.decoder()<cantools.database.can.Database.decoder()>`.
+
+    The messages are looked up in a table of frame ids to functions
+    decoding the message with the options bound to them.
+
+    The decoder must be created again after the database has been
+    modified.
+
+    """
+
+    def __init__(self,
+                 database: "Database",
+                 decode_choices: bool = True,
+                 scaling: bool = True,
+                 decode_containers: bool = False,
+                 allow_truncated: bool = False) -> None:
+        self._frame_id_mask = database._frame_id_mask
+        self._decoders = {
+            frame_id: _bind_message(message,
+                                    decode_choices,
+                                    scaling,
+                                    decode_containers,
+                                    allow_truncated)
+            for frame_id, message in database._frame_id_to_message.items()
+        }
+
+    def decode(self, frame_id: int, data: BytesLike) -> DecodeResultType:
+        """Decode given data as the message with given frame id. Raises
+        ``KeyError`` if the frame id is unknown.
+
+        >>> decoder = db.decoder(decode_choices=False)
+        >>> decoder.decode(158, b'\\x01\\x45\\x23\\x00\\x11')
+        {'Bar': 1, 'Fum': 5.0}
+
+        """
+
+        return self._decoders[frame_id & self._frame_id_mask](data)
+
+    __call__ = decode
+
+
+class MemoizingDecoder(DatabaseDecoder):
+    """A :class:`DatabaseDecoder` remembering the decoded signals of the
+    `cache_size` most recently decoded distinct ``(frame_id, data)``
+    pairs, created by
+    :meth:`Database.decoder()<cantools.database.can.Database.decoder()>`.
+
+    Cached signals are returned as read-only mappings, as they are
+    shared by all calls decoding the same frame. Container messages
+    are not cached.
+
+    In delta mode, only the signals whose raw values changed since
+    the previous frame with the same frame id are returned, in a new
+    dictionary. All signals are returned for the first frame of each
+    frame id.
+
+    """
+
+    def __init__(self,
+                 database: "Database",
+                 decode_choices: bool = True,
+                 scaling: bool = True,
+                 decode_containers: bool = False,
+                 allow_truncated: bool = False,
+                 cache_size: int = 128,
+                 delta: bool = False) -> None:
+        super().__init__(database,
+                         decode_choices,
+                         scaling,
+                         decode_containers,
+                         allow_truncated)
+        self._cache_size = cache_size
+        self._delta = delta
+        self._decode_choices = decode_choices
+        self._scaling = scaling
+        self._messages = database._frame_id_to_message
+        self._cache: "OrderedDict[Tuple[int, bytes], Tuple[SignalMappingType, SignalMappingType]]" = OrderedDict()
+        self._previous: Dict[int, SignalMappingType] = {}
+        self._containers = {
+            frame_id
+            for frame_id, message in database._frame_id_to_message.items()
+            if message.is_container
+        }
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if delta and (decode_choices or scaling):
+            self._raw_decoders = DatabaseDecoder(database,
+                                                 False,
+                                                 False,
+                                                 decode_containers,
+                                                 allow_truncated)._decoders
+        else:
+            self._raw_decoders = self._decoders
+
+    @property
+    def cache_size(self) -> int:
+        """The maximum number of cached frames.
+
+        """
+
+        return self._cache_size
+
+    @property
+    def delta(self) -> bool:
+        """``True`` if only changed signals are returned, ``False``
+        otherwise.
+
+        """
+
+        return self._delta
+
+    @property
+    def hits(self) -> int:
+        """The number of frames found in the cache.
+
+        """
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of frames not found in the cache.
+
+        """
+
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """The number of frames removed from the cache to make room for
+        new frames.
+
+        """
+
+        return self._evictions
+
+    def clear(self) -> None:
+        """Clear the cache, the counters and the previous frames used in
+        delta mode.
+
+        """
+
+        self._cache.clear()
+        self._previous.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def decode(self, frame_id: int, data: BytesLike) -> Any:
+        """Decode given data as the message with given frame id. Raises
+        ``KeyError`` if the frame id is unknown.
+
+        """
+
+        frame_id &= self._frame_id_mask
+
+        if frame_id in self._containers:
+            return self._decoders[frame_id](data)
+
+        key = (frame_id, bytes(data))
+        entry = self._cache.get(key)
+
+        if entry is None:
+            self._misses += 1
+
+            if self._raw_decoders is self._decoders:
+                decoded = cast(SignalDictType, self._decoders[frame_id](data))
+                raw = decoded
+            else:
+                # Decode the raw values once, and scale them.
+                raw = cast(SignalDictType, self._raw_decoders[frame_id](data))
+                decoded = self._scale(frame_id, raw)
+
+            entry = (MappingProxyType(decoded), MappingProxyType(raw))
+
+            if self._cache_size > 0:
+                self._cache[key] = entry
+
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+                    self._evictions += 1
+        else:
+            self._hits += 1
+            self._cache.move_to_end(key)
+
+        signals, raw_signals = entry
+
+        if not self._delta:
+            return signals
+
+        previous = self._previous.get(frame_id)
+        self._previous[frame_id] = raw_signals
+
+        if previous is None:
+            return dict(signals)
+
+        return {
+            name: value
+            for name, value in signals.items()
+            if name not in previous
+            or _is_changed(previous[name], raw_signals[name])
+        }
+
+    def _scale(self, frame_id: int, raw: SignalDictType) -> SignalDictType:
+        """Returns given raw values of the signals of the message with
+        given frame id, scaled and converted to choices as given
+        signals are decoded.
+
+        """
+
+        message = self._messages[frame_id]
+        decoded: SignalDictType = {}
+
+        for name, value in raw.items():
+            signal = message.get_signal_by_name(name)
+
+            if self._decode_choices and signal.choices is not None \
+               and value in signal.choices:
+                value = signal.choices[value]  # type: ignore[index]
+            elif self._scaling:
+                value = signal.scale * value + signal.offset  # type: ignore[operator]
+
+            decoded[name] = value
+
+        return decoded
+
+    __call__ = decode
+
+
+def _is_changed(previous: SignalValueType, value: SignalValueType) -> bool:
+    # NaN raw values of float signals are not equal to themselves, but
+    # are unchanged.
+    return previous != value and not (previous != previous and value != value)
+
+
+LazyFields = Dict[str, Tuple["Signal", FieldExtractor]]
+
+
+def create_lazy_fields(message: "Message",
+                       signals: Iterable["Signal"]) -> Optional[LazyFields]:
+    """Create the field extractors of given signals of given message, or
+    ``None`` if any signal cannot be extracted by itself.
+
+    """
+
+    fields = {}
+
+    for signal in signals:
+        extractor = create_field_extractor(signal, message.length)
+
+        if extractor is None:
+            return None
+
+        fields[signal.name] = (signal, extractor)
+
+    return fields
+
+
+class LazyDecodedMessage(Mapping[str, SignalValueType]):
+    """A read-only mapping of signal names to values, extracting, scaling
+    and converting each signal to a choice only when it is first
+    accessed. Created by
+    :meth:`Message.decode_lazy()<cantools.database.can.Message.decode_lazy()>`.
+
+    The mapping contains the same signals in the same order as the
+    dictionary returned by
+    :meth:`Message.decode()<cantools.database.can.Message.decode()>`.
+
+    """
+
+    def __init__(self,
+                 fields: LazyFields,
+                 big: int,
+                 little: int,
+                 decode_choices: bool,
+                 scaling: bool,
+                 decoded: Optional[SignalDictType] = None) -> None:
+        self._fields = fields
+        self._big = big
+        self._little = little
+        self._decode_choices = decode_choices
+        self._scaling = scaling
+        self._decoded: SignalDictType = {} if decoded is None else decoded
+
+    @classmethod
+    def from_decoded(cls, decoded: SignalDictType) -> "LazyDecodedMessage":
+        """Create a mapping of already decoded signals.
+
+        """
+
+        return cls({}, 0, 0, False, False, decoded)
+
+    def __getitem__(self, name: str) -> SignalValueType:
+        try:
+            return self._decoded[name]
+        except KeyError:
+            pass
+
+        signal, extractor = self._fields[name]
+        value: SignalValueType = extractor.extract(self._big, self._little)
+
+        if self._decode_choices and signal.choices is not None \
+           and value in signal.choices:
+            value = signal.choices[value]  # type: ignore[index]
+        elif self._scaling:
+            value = signal.scale * value + signal.offset  # type: ignore[operator]
+
+        self._decoded[name] = value
+
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        if self._fields:
+            return iter(self._fields)
+
+        return iter(self._decoded)
+
+    def __len__(self) -> int:
+        if self._fields:
+            return len(self._fields)
+
+        return len(self._decoded)
+
+    def __contains__(self, name: object) -> bool:
+        if self._fields:
+            return name in self._fields
+
+        return name in self._decoded
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+#: A decoded message as an instance of a named tuple class created by
+#: create_record_class().
+DecodedRecord = Tuple[Optional[SignalValueType], ...]
+
+
+def create_record_class(name: str,
+                        signal_names: Sequence[str]) -> Type[DecodedRecord]:
+    """Create a named tuple class of given message name with one field
+    per signal, in given order. Fields default to ``None``.
+
+    Signal names which are not valid field names are replaced by
+    ``_<index>``, while the original signal names are stored in the
+    ``_signal_names`` attribute of the class.
+
+    """
+
+    typename = re.sub(r'\W', '_', name)
+
+    if not typename.isidentifier() or keyword.iskeyword(typename):
+        typename = f'_{typename}'
+
+    cls = namedtuple(typename,  # type: ignore[misc]
+                     signal_names,
+                     rename=True,
+                     defaults=len(signal_names) * (None, ))  # type: ignore[misc]
+    cls._signal_names = tuple(signal_names)  # type: ignore[attr-defined]
+
+    return cast(Type[DecodedRecord], cls)
@@ -0,0 +1,302 @@
+# Encoders of a message with a fixed signal order.
+
+import struct
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .signal import NamedSignalValue
+from ..engines import FLOAT_FORMATS
+from ..engines import field_shift
+from ..engines import source_literal
+from ..errors import EncodeError
+from ..utils import create_encode_decode_formats
+from ..utils import format_or
+
+if TYPE_CHECKING:
+    from .message import Message
+    from .signal import Signal
+
+EncodeFunction = Callable[..., bytes]
+
+
+class MessageEncoder(object):
+    """Encoder of given signals of given message, taking the signal
+    values as positional arguments in a fixed order. Created by
+    :meth:`Message.make_encoder()<cantools.database.can.Message.make_encoder()>`.
+
+    The signals are validated, scaled and packed by a function
+    generated for the signals when the encoder is created.
+
+    The encoder must be created again after the message has been
+    modified.
+
+    """
+
+    def __init__(self,
+                 message: "Message",
+                 signal_names: Sequence[str],
+                 scaling: bool = True,
+                 padding: bool = False,
+                 strict: bool = True) -> None:
+        if message.is_container:
+            raise EncodeError(f'Message "{message.name}" is a container')
+
+        signal_names = list(signal_names)
+        signals = [message.get_signal_by_name(name) for name in signal_names]
+
+        if len(set(signal_names)) != len(signal_names):
+            raise EncodeError(f'Duplicated signals in {signal_names}.')
+
+        self._message = message
+        self._signal_names = signal_names
+        self._scaling = scaling
+        self._padding = padding
+        self._strict = strict
+        self._multiplexers, self._multiplexer_ids = \
+            self._find_multiplexer_ids(signal_names)
+        self.encode: EncodeFunction = self._generate_encode(signals)
+
+    @property
+    def message(self) -> "Message":
+        """The message of this encoder.
+
+        """
+
+        return self._message
+
+    @property
+    def signal_names(self) -> List[str]:
+        """The names of the encoded signals, in argument order.
+
+        """
+
+        return self._signal_names
+
+    def __call__(self, *values: Any) -> bytes:
+        return self.encode(*values)
+
+    def __repr__(self) -> str:
+        return f"encoder('{self._message.name}', {self._signal_names})"
+
+    def _find_multiplexer_ids(self, signal_names: List[str]) \
+            -> Tuple[List[str], Dict[Tuple[int, ...], None]]:
+        """Find the multiplexer branches containing exactly given signals.
+        Returns the names of their multiplexers and all valid
+        combinations of multiplexer ids.
+
+        """
+
+        codecs = self._message._get_codecs()
+
+        multiplexers: List[str] = []
+        multiplexer_ids: Dict[Tuple[int, ...], None] = {}
+
+        for conditions, signals in self._message._create_mux_branches(codecs):
+            if {signal.name for signal in signals} != set(signal_names):
+                continue
+
+            multiplexers = [signal.name for signal, _ in conditions]
+            multiplexer_ids[tuple(mux for _, mux in conditions)] = None
+
+        if not multiplexer_ids:
+            raise EncodeError(f'The signals {signal_names} are not exactly the '
+                              f'signals of a multiplexer branch of message '
+                              f'"{self._message.name}".')
+
+        return multiplexers, multiplexer_ids
+
+    def _value_error(self, index: int, value: Any) -> EncodeError:
+        name = self._signal_names[index]
+        bounds = self._message._bounds[name]
+        limits = bounds.physical if self._scaling else bounds.raw
+
+        if value < limits.lower:
+            return EncodeError(
+                f'Expected signal "{name}" value greater than '
+                f'or equal to {limits.minimum} in message "{self._message.name}", '
+                f'but got {value}.')
+
+        return EncodeError(
+            f'Expected signal "{name}" value less than or '
+            f'equal to {limits.maximum} in message "{self._message.name}", '
+            f'but got {value}.')
+
+    def _raw_error(self, index: int, value: int) -> EncodeError:
+        signal = self._message.get_signal_by_name(self._signal_names[index])
+
+        return EncodeError(f'Signal "{signal.name}" raw value {value} does '
+                           f'not fit in {signal.length} bits.')
+
+    def _multiplexer_error(self, multiplexer_ids: Tuple[int, ...]) -> EncodeError:
+        valid: List[Union[int, str]] = [
+            '(' + ', '.join([str(mux) for mux in ids]) + ')'
+            for ids in self._multiplexer_ids
+        ]
+
+        return EncodeError(f'Expected multiplexer ids '
+                           f'({", ".join(self._multiplexers)}) in '
+                           f'{{{format_or(valid)}}}, but got '
+                           f'{multiplexer_ids}')
+
+    def _generate_encode(self, signals: List["Signal"]) -> EncodeFunction:
+        message = self._message
+        length = message.length
+        namespace: Dict[str, Any] = {
+            '_from_bytes': int.from_bytes,
+            '_str_types': (str, NamedSignalValue),
+            '_value_error': self._value_error,
+            '_raw_error': self._raw_error,
+            '_multiplexer_error': self._multiplexer_error,
+            '_multiplexer_ids': self._multiplexer_ids
+        }
+        lines = []
+        big_items = []
+        little_items = []
+        multiplexer_values = {}
+
+        for i, signal in enumerate(signals):
+            shift = field_shift(signal, length)
+
+            if shift is None:
+                raise EncodeError(f'Signal "{signal.name}" does not fit in '
+                                  f'message "{message.name}".')
+
+            value = f'v{i}'
+            is_multiplexer = signal.name in self._multiplexers
+            transform = 'float' if signal.is_float else 'round'
+
+            if not self._scaling or (signal.offset == 0 and signal.scale == 1):
+                numeric = f'{transform}({value})'
+            else:
+                scale = source_literal(signal.scale, f'_scale{i}', namespace)
+                offset = source_literal(signal.offset, f'_offset{i}', namespace)
+                numeric = f'{transform}(({value} - {offset}) / {scale})'
+
+            indent = '    '
+
+            if signal.choices:
+                choices: Dict[str, int] = {}
+
+                for number, choice in signal.choices.items():
+                    choices.setdefault(str(choice), number)
+
+                namespace[f'_choices{i}'] = choices
+                namespace[f'_signal{i}'] = signal
+                lines += [
+                    f'    if isinstance({value}, _str_types):',
+                    f'        r{i} = _choices{i}.get(str({value}))',
+                    f'        if r{i} is None:',
+                    f'            r{i} = _signal{i}.choice_string_to_number(str({value}))'
+                ]
+
+                if is_multiplexer:
+                    lines.append(f'        m{i} = r{i}')
+
+                lines.append('    else:')
+                indent = '        '
+
+            if self._strict:
+                bounds = message._bounds[signal.name]
+                limits = bounds.physical if self._scaling else bounds.raw
+                conditions = []
+
+                if limits.minimum is not None:
+                    lower = source_literal(limits.lower, f'_lower{i}', namespace)
+                    conditions.append(f'{value} < {lower}')
+
+                if limits.maximum is not None:
+                    upper = source_literal(limits.upper, f'_upper{i}', namespace)
+                    conditions.append(f'{value} > {upper}')
+
+                if conditions:
+                    lines += [
+                        f'{indent}if {" or ".join(conditions)}:',
+                        f'{indent}    raise _value_error({i}, {value})'
+                    ]
+
+            if is_multiplexer:
+                lines.append(f'{indent}m{i} = int({value})')
+                multiplexer_values[signal.name] = f'm{i}'
+
+            lines.append(f'{indent}r{i} = {numeric}')
+            mask = (1 << signal.length) - 1
+
+            if signal.is_float:
+                fmt = FLOAT_FORMATS.get(signal.length)
+
+                if fmt is None:
+                    raise EncodeError(f'Float signal "{signal.name}" of '
+                                      f'unsupported length {signal.length}.')
+
+                namespace[f'_pack{i}'] = struct.Struct(fmt).pack
+                raw = f'_from_bytes(_pack{i}(r{i}), "big")'
+            else:
+                if signal.is_signed:
+                    minimum_raw = -(1 << (signal.length - 1))
+                    maximum_raw = (1 << (signal.length - 1)) - 1
+                else:
+                    minimum_raw = 0
+                    maximum_raw = mask
+
+                lines += [
+                    f'    if r{i} < {minimum_raw} or r{i} > {maximum_raw}:',
+                    f'        raise _raw_error({i}, r{i})'
+                ]
+                raw = f'(r{i} & 0x{mask:x})' if signal.is_signed else f'r{i}'
+
+            if shift > 0:
+                raw = f'({raw} << {shift})'
+
+            if signal.byte_order == 'big_endian':
+                big_items.append(raw)
+            else:
+                little_items.append(raw)
+
+        if self._multiplexers:
+            values = ', '.join([multiplexer_values[name]
+                                for name in self._multiplexers]) + ','
+            lines += [
+                f'    if ({values}) not in _multiplexer_ids:',
+                f'        raise _multiplexer_error(({values}))'
+            ]
+
+        items = big_items
+
+        if little_items:
+            items.append(f'_from_bytes(({" | ".join(little_items)}).to_bytes('
+                         f'{length}, "little"), "big")')
+
+        if self._padding:
+            # The padding mask is the same for all valid combinations
+            # of multiplexer ids, as they encode the same signals.
+            positions = {
+                id(signal): i for i, signal in enumerate(message.signals)
+            }
+            formats = create_encode_decode_formats(
+                sorted(signals, key=lambda signal: positions[id(signal)]),
+                length)
+            padding = formats.padding_mask & message._padding_pattern
+
+            if padding:
+                items.append(f'0x{padding:x}')
+
+        if not items:
+            items.append('0')
+
+        arguments = ', '.join([f'v{i}' for i in range(len(signals))])
+        lines = [f'def encode({arguments}):'] + lines + [
+            f'    return ({" | ".join(items)}).to_bytes({length}, "big")'
+        ]
+        exec(compile('\n'.join(lines), '<cantools generated encoder>', 'exec'),
+             namespace)
+
+        return cast(EncodeFunction, namespace['encode'])
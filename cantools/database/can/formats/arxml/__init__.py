@@ -1,6 +1,6 @@
 import re
 
-from typing import Any
+from typing import Any, List
 from xml.etree import ElementTree
 
 from .system_loader import SystemLoader
@@ -40,15 +40,116 @@ def is_ecu_extract(root: Any # For whatever reason, mypy does not
 
     return ecuc_value_collection is not None
 
+# The kinds of package elements needed by the loaders. All other
+# package elements, for example software component types and port
+# interfaces, are dropped when streaming.
+STREAMING_ELEMENT_KINDS = frozenset([
+    'SYSTEM',
+    'ECU-INSTANCE',
+    'NM-CONFIG',
+    'COMPU-METHOD',
+    'UNIT',
+    'DATA-CONSTR',
+    'SW-BASE-TYPE',
+    'CONSTANT-SPECIFICATION',
+    'END-TO-END-PROTECTION-SET',
+    'DATA-TRANSFORMATION-SET',
+    'SECURE-COMMUNICATION-PROPS-SET',
+    # AUTOSAR 3 data types.
+    'ARRAY-TYPE',
+    'BOOLEAN-TYPE',
+    'CHAR-TYPE',
+    'INTEGER-TYPE',
+    'OPAQUE-TYPE',
+    'REAL-TYPE',
+    'RECORD-TYPE',
+    'STRING-TYPE'
+])
+
+# Clusters, frames, PDUs, PDU groups, signals and signal groups, and
+# ECU configuration values of ECU extracts.
+STREAMING_ELEMENT_KIND_SUFFIXES = (
+    'CLUSTER',
+    'FRAME',
+    'PDU',
+    'PDU-GROUP',
+    'SIGNAL',
+    'SIGNAL-GROUP'
+)
+STREAMING_ELEMENT_KIND_PREFIXES = ('ECUC-', )
+
+# Elements not needed by the loaders wherever they are.
+STREAMING_DROPPED_KINDS = frozenset(['ADMIN-DATA', 'INTRODUCTION'])
+
+# The number of characters fed to the XML parser at once.
+STREAMING_CHUNK_SIZE = 2 ** 16
+
+
+def _is_needed_element_kind(kind: str) -> bool:
+    return (kind in STREAMING_ELEMENT_KINDS
+            or kind.endswith(STREAMING_ELEMENT_KIND_SUFFIXES)
+            or kind.startswith(STREAMING_ELEMENT_KIND_PREFIXES))
+
+
+def parse_streaming(string: str) -> Any:
+    """Parse given ARXML format string incrementally, dropping each
+    package element not needed by the loaders as soon as it has been
+    parsed, so that the tree never holds more than one unneeded
+    element. Returns the root element.
+
+    """
+
+    parser: Any = ElementTree.XMLPullParser(events=('start', 'end'))
+    stack: List[Any] = []
+    root = None
+
+    for offset in range(0, len(string), STREAMING_CHUNK_SIZE):
+        parser.feed(string[offset:offset + STREAMING_CHUNK_SIZE])
+
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = elem
+
+                stack.append(elem)
+                continue
+
+            stack.pop()
+
+            if not stack:
+                continue
+
+            parent = stack[-1]
+            kind = elem.tag.rpartition('}')[2]
+
+            if kind in STREAMING_DROPPED_KINDS:
+                parent.remove(elem)
+            elif (parent.tag.endswith('}ELEMENTS')
+                  and not _is_needed_element_kind(kind)):
+                parent.remove(elem)
+
+    parser.close()
+
+    if root is None:
+        raise ElementTree.ParseError('no element found')
+
+    return root
+
+
 def load_string(string:str,
                 strict:bool=True,
-                sort_signals:type_sort_signals=sort_signals_by_start_bit) \
+                sort_signals:type_sort_signals=sort_signals_by_start_bit,
+                streaming:bool=False) \
             -> InternalDatabase:
-    """Parse given ARXML format string.
+    """Parse given ARXML format string. If `streaming` is ``True`` it
+    is parsed with :func:`parse_streaming()`.
 
     """
 
-    root = ElementTree.fromstring(string)
+    if streaming:
+        root = parse_streaming(string)
+    else:
+        root = ElementTree.fromstring(string)
 
     m = re.match(r'{(.*)}AUTOSAR', root.tag)
     if not m:
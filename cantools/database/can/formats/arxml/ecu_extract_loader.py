@@ -178,7 +178,8 @@ class EcuExtractLoader(object):
                        comment=comments,
                        bus_name=None,
                        strict=self.strict,
-                       sort_signals=self.sort_signals)
+                       sort_signals=self.sort_signals,
+                       lazy=True)
 
     def load_message_tx(self, com_pdu_id_ref):
         return self.load_message_rx_tx(com_pdu_id_ref,
@@ -774,7 +774,8 @@ class SystemLoader(object):
                            comment=None,
                            autosar_specifics=autosar_specifics,
                            strict=self._strict,
-                           sort_signals=self._sort_signals)
+                           sort_signals=self._sort_signals,
+                           lazy=True)
 
         pdu_path = self._get_pdu_path(can_frame)
         autosar_specifics._pdu_paths.append(pdu_path)
@@ -823,7 +824,8 @@ class SystemLoader(object):
                        comment=comments,
                        autosar_specifics=autosar_specifics,
                        strict=self._strict,
-                       sort_signals=self._sort_signals)
+                       sort_signals=self._sort_signals,
+                       lazy=True)
 
     def _load_secured_properties(self,
                                  message_name,
@@ -1032,7 +1034,8 @@ class SystemLoader(object):
                             unused_bit_pattern=unused_bit_pattern,
                             comment=comments,
                             autosar_specifics=contained_autosar_specifics,
-                            sort_signals=self._sort_signals)
+                            sort_signals=self._sort_signals,
+                            lazy=True)
 
                 contained_messages.append(contained_message)
 
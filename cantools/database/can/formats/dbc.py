@@ -5,6 +5,7 @@ from collections import OrderedDict
 from collections import defaultdict
 from decimal import Decimal
 from copy import deepcopy
+from functools import lru_cache
 
 import textparser
 from textparser import Sequence
@@ -140,6 +141,13 @@ def to_int(value):
     return int(Decimal(value))
 
 
+@lru_cache(maxsize=4096)
+def to_decimal(value):
+    # Decimals are immutable, so signals with equal scales, offsets
+    # and limits share the same objects.
+    return Decimal(value)
+
+
 class Parser(textparser.Parser):
 
     def tokenize(self, string):
@@ -361,6 +369,279 @@ class Parser(textparser.Parser):
                 bs,
                 version))
 
+
+# Regular expressions of the streaming parser, matching the same
+# tokens as the tokenizer of the textparser grammar.
+_RE_NUMBER = r'[-+]?\d+\.?\d*(?:[eE][+-]?\d+)?'
+_RE_WORD = r'(?!\d)[A-Za-z0-9_]+'
+_RE_STRING = r'"((?:\\"|[^"])*?)"'
+
+RE_STREAM_SKIP = re.compile(r'(?:[ \r\n\t]+|//[^\n]*\n)*')
+RE_STREAM_KEYWORD = re.compile(r'[A-Za-z0-9_]+')
+RE_STREAM_MESSAGE = re.compile(
+    rf'BO_\s+({_RE_NUMBER})\s+({_RE_WORD})\s*:\s*({_RE_NUMBER})\s+({_RE_WORD})')
+RE_STREAM_SIGNAL = re.compile(
+    rf'SG_\s+({_RE_WORD})(?:\s+({_RE_WORD}))?\s*:'
+    rf'\s*({_RE_NUMBER})\s*\|\s*({_RE_NUMBER})\s*@\s*({_RE_NUMBER})\s*([+-])'
+    rf'\s*\(\s*({_RE_NUMBER})\s*,\s*({_RE_NUMBER})\s*\)'
+    rf'\s*\[\s*({_RE_NUMBER})\s*\|\s*({_RE_NUMBER})\s*\]'
+    rf'\s*{_RE_STRING}'
+    rf'\s*({_RE_WORD}(?:\s*,\s*{_RE_WORD})*)')
+RE_STREAM_COMMENT = re.compile(
+    rf'CM_\s+(?:(SG_)\s+({_RE_NUMBER})\s+({_RE_WORD})\s*'
+    rf'|(BO_)\s+({_RE_NUMBER})\s*'
+    rf'|(EV_)\s+({_RE_WORD})\s*'
+    rf'|(BU_)\s+({_RE_WORD})\s*)?'
+    rf'{_RE_STRING}\s*;')
+RE_STREAM_ATTRIBUTE = re.compile(
+    rf'BA_\s+{_RE_STRING}\s+'
+    rf'(?:(BO_)\s+({_RE_NUMBER})\s+'
+    rf'|(SG_)\s+({_RE_NUMBER})\s+({_RE_WORD})\s+'
+    rf'|(BU_)\s+({_RE_WORD})\s+'
+    rf'|(EV_)\s+({_RE_WORD})\s+)?'
+    rf'(?:({_RE_NUMBER})|{_RE_STRING})\s*;')
+RE_STREAM_CHOICE = re.compile(
+    rf'VAL_\s+(?:({_RE_NUMBER})\s+)?({_RE_WORD})'
+    rf'((?:\s+{_RE_NUMBER}\s+"(?:\\"|[^"])*?")*)\s*;')
+RE_STREAM_CHOICE_ITEM = re.compile(rf'({_RE_NUMBER})\s+{_RE_STRING}')
+RE_STREAM_SIGNAL_MULTIPLEXER_VALUES = re.compile(
+    rf'SG_MUL_VAL_\s+({_RE_NUMBER})\s+({_RE_WORD})\s+({_RE_WORD})'
+    r'\s+(\d+-\d+(?:\s*,\s*\d+-\d+)*)\s*;')
+RE_STREAM_RANGE = re.compile(r'(\d+)(-\d+)')
+RE_STREAM_DELIMITER = re.compile(r'\s*,\s*')
+
+# The start of the next statement parsed by the streaming parser,
+# ending a chunk of other statements.
+RE_STREAM_NEXT_STATEMENT = re.compile(
+    r'\n[ \t]*(?=(?:BO_|CM_|BA_|VAL_|SG_MUL_VAL_)[ \t]+\S)')
+
+
+def _unescape(string):
+    if '\\"' in string:
+        string = string.replace('\\"', '"')
+
+    return string
+
+
+class StreamingParser(object):
+    """A hand-written parser of the common DBC statements, that is
+    ``BO_``, ``SG_``, ``CM_``, ``BA_``, ``VAL_`` and ``SG_MUL_VAL_``,
+    matching one statement at a time with a regular expression instead
+    of tokenizing the whole string first. It returns the same parse
+    tree as :class:`Parser`. Other statements, and statements not
+    matching the regular expressions, are parsed by :class:`Parser`
+    chunk by chunk.
+
+    """
+
+    def __init__(self):
+        self._statement_parsers = {
+            'BO_': self._parse_message,
+            'CM_': self._parse_comment,
+            'BA_': self._parse_attribute,
+            'VAL_': self._parse_choice,
+            'SG_MUL_VAL_': self._parse_signal_multiplexer_values
+        }
+
+    def parse(self, string):
+        tokens = defaultdict(list)
+        position = 0
+        length = len(string)
+
+        while True:
+            position = RE_STREAM_SKIP.match(string, position).end()
+
+            if position == length:
+                break
+
+            mo = RE_STREAM_KEYWORD.match(string, position)
+            end = None
+
+            if mo is not None:
+                parse_statement = self._statement_parsers.get(mo.group())
+
+                if parse_statement is not None:
+                    end = parse_statement(string, position, tokens)
+
+            if end is None:
+                try:
+                    end = self._parse_chunk(string, position, tokens)
+                except textparser.ParseError:
+                    # The chunk may end within a statement spanning
+                    # several lines. Parse the whole string instead,
+                    # which also raises an error with the correct
+                    # location if it is invalid.
+                    return Parser().parse(string)
+
+            position = end
+
+        if not tokens:
+            # Raises the same error as the grammar.
+            Parser().parse(string)
+
+        return dict(tokens)
+
+    def _parse_chunk(self, string, position, tokens):
+        mo = RE_STREAM_NEXT_STATEMENT.search(string, position)
+
+        if mo is None:
+            end = len(string)
+        else:
+            end = mo.end()
+
+        chunk_tokens = Parser().parse(string[position:end])
+
+        for kind, statements in chunk_tokens.items():
+            tokens[kind] += statements
+
+        return end
+
+    def _parse_message(self, string, position, tokens):
+        mo = RE_STREAM_MESSAGE.match(string, position)
+
+        if mo is None:
+            return None
+
+        frame_id, name, length, sender = mo.groups()
+        signals = []
+        position = mo.end()
+
+        while True:
+            start = RE_STREAM_SKIP.match(string, position).end()
+            mo = RE_STREAM_SIGNAL.match(string, start)
+
+            if mo is None:
+                keyword = RE_STREAM_KEYWORD.match(string, start)
+
+                if keyword is not None and keyword.group() == 'SG_':
+                    return None
+
+                break
+
+            (signal_name,
+             multiplexer,
+             start_bit,
+             signal_length,
+             byte_order,
+             sign,
+             scale,
+             offset,
+             minimum,
+             maximum,
+             unit,
+             receivers) = mo.groups()
+
+            if multiplexer is None:
+                names = [signal_name]
+            else:
+                names = [signal_name, multiplexer]
+
+            if ',' in receivers:
+                receivers = RE_STREAM_DELIMITER.split(receivers)
+            else:
+                receivers = [receivers]
+
+            signals.append(['SG_', names, ':',
+                            start_bit, '|', signal_length, '@', byte_order, sign,
+                            '(', scale, ',', offset, ')',
+                            '[', minimum, '|', maximum, ']',
+                            _unescape(unit),
+                            receivers])
+            position = mo.end()
+
+        tokens['BO_'].append(['BO_', frame_id, name, ':', length, sender, signals])
+
+        return position
+
+    def _parse_comment(self, string, position, tokens):
+        mo = RE_STREAM_COMMENT.match(string, position)
+
+        if mo is None:
+            return None
+
+        groups = mo.groups()
+        text = _unescape(groups[9])
+
+        if groups[0] is not None:
+            item = ['SG_', groups[1], groups[2], text]
+        elif groups[3] is not None:
+            item = ['BO_', groups[4], text]
+        elif groups[5] is not None:
+            item = ['EV_', groups[6], text]
+        elif groups[7] is not None:
+            item = ['BU_', groups[8], text]
+        else:
+            item = text
+
+        tokens['CM_'].append(['CM_', item, ';'])
+
+        return mo.end()
+
+    def _parse_attribute(self, string, position, tokens):
+        mo = RE_STREAM_ATTRIBUTE.match(string, position)
+
+        if mo is None:
+            return None
+
+        groups = mo.groups()
+
+        if groups[1] is not None:
+            items = [['BO_', groups[2]]]
+        elif groups[3] is not None:
+            items = [['SG_', groups[4], groups[5]]]
+        elif groups[6] is not None:
+            items = [['BU_', groups[7]]]
+        elif groups[8] is not None:
+            items = [['EV_', groups[9]]]
+        else:
+            items = []
+
+        if groups[10] is not None:
+            value = groups[10]
+        else:
+            value = _unescape(groups[11])
+
+        tokens['BA_'].append(['BA_', _unescape(groups[0]), items, value, ';'])
+
+        return mo.end()
+
+    def _parse_choice(self, string, position, tokens):
+        mo = RE_STREAM_CHOICE.match(string, position)
+
+        if mo is None:
+            return None
+
+        frame_id, name, items = mo.groups()
+        tokens['VAL_'].append([
+            'VAL_',
+            [] if frame_id is None else [frame_id],
+            name,
+            [[value, _unescape(text)]
+             for value, text in RE_STREAM_CHOICE_ITEM.findall(items)],
+            ';'
+        ])
+
+        return mo.end()
+
+    def _parse_signal_multiplexer_values(self, string, position, tokens):
+        mo = RE_STREAM_SIGNAL_MULTIPLEXER_VALUES.match(string, position)
+
+        if mo is None:
+            return None
+
+        frame_id, name, multiplexer_signal, ranges = mo.groups()
+        tokens['SG_MUL_VAL_'].append([
+            'SG_MUL_VAL_',
+            frame_id,
+            name,
+            multiplexer_signal,
+            [[lower, upper] for lower, upper in RE_STREAM_RANGE.findall(ranges)],
+            ';'
+        ])
+
+        return mo.end()
+
+
 class LongNamesConverter(object):
 
     def __init__(self, database):
@@ -1406,13 +1687,13 @@ def _load_signals(tokens,
         if minimum == maximum == '0':
             return None
         else:
-            return Decimal(minimum)
+            return to_decimal(minimum)
 
     def get_maximum_decimal(minimum, maximum):
         if minimum == maximum == '0':
             return None
         else:
-            return Decimal(maximum)
+            return to_decimal(maximum)
 
     def get_is_float(frame_id_dbc, signal):
         """Get is_float for given signal.
@@ -1465,8 +1746,8 @@ def _load_signals(tokens,
                    offset=num(signal[12]),
                    minimum=get_minimum(signal[15], signal[17]),
                    maximum=get_maximum(signal[15], signal[17]),
-                   decimal=SignalDecimal(Decimal(signal[10]),
-                                         Decimal(signal[12]),
+                   decimal=SignalDecimal(to_decimal(signal[10]),
+                                         to_decimal(signal[12]),
                                          get_minimum_decimal(signal[15],
                                                              signal[17]),
                                          get_maximum_decimal(signal[15],
@@ -1663,7 +1944,8 @@ def _load_messages(tokens,
                     protocol=get_protocol(frame_id_dbc),
                     bus_name=bus_name,
                     signal_groups=get_signal_groups(frame_id_dbc),
-                    sort_signals=sort_signals))
+                    sort_signals=sort_signals,
+                    lazy=True))
 
     return messages
 
@@ -1958,12 +2240,17 @@ def get_definitions_rel_dict(definitions, defaults):
 
 
 def load_string(string: str, strict: bool = True,
-                sort_signals: type_sort_signals = sort_signals_by_start_bit) -> InternalDatabase:
-    """Parse given string.
+                sort_signals: type_sort_signals = sort_signals_by_start_bit,
+                streaming: bool = False) -> InternalDatabase:
+    """Parse given string, with the streaming parser if `streaming` is
+    ``True``.
 
     """
 
-    tokens = Parser().parse(string)
+    if streaming:
+        tokens = StreamingParser().parse(string)
+    else:
+        tokens = Parser().parse(string)
 
     comments = _load_comments(tokens)
     definitions = _load_attribute_definitions(tokens)
@@ -4,6 +4,17 @@ from collections import OrderedDict
 
 class DbcSpecifics(object):
 
+    # The dictionaries are created when first accessed, as most of them
+    # are empty for messages and signals.
+    __slots__ = (
+        '_attributes',
+        '_attribute_definitions',
+        '_environment_variables',
+        '_value_tables',
+        '_attributes_rel',
+        '_attribute_definitions_rel',
+    )
+
     def __init__(self,
                  attributes=None,
                  attribute_definitions=None,
@@ -11,24 +22,6 @@ class DbcSpecifics(object):
                  value_tables=None,
                  attributes_rel=None,
                  attribute_definitions_rel=None):
-        if attributes is None:
-            attributes = OrderedDict()
-
-        if attribute_definitions is None:
-            attribute_definitions = OrderedDict()
-
-        if environment_variables is None:
-            environment_variables = OrderedDict()
-
-        if value_tables is None:
-            value_tables = OrderedDict()
-
-        if attributes_rel is None:
-            attributes_rel = OrderedDict()
-
-        if attribute_definitions_rel is None:
-            attribute_definitions_rel = OrderedDict()
-
         self._attributes = attributes
         self._attribute_definitions = attribute_definitions
         self._environment_variables = environment_variables
@@ -43,6 +36,9 @@ class DbcSpecifics(object):
 
         """
 
+        if self._attributes is None:
+            self._attributes = OrderedDict()
+
         return self._attributes
 
     @attributes.setter
@@ -55,6 +51,9 @@ class DbcSpecifics(object):
 
         """
 
+        if self._attribute_definitions is None:
+            self._attribute_definitions = OrderedDict()
+
         return self._attribute_definitions
 
     @property
@@ -64,6 +63,9 @@ class DbcSpecifics(object):
 
         """
 
+        if self._value_tables is None:
+            self._value_tables = OrderedDict()
+
         return self._value_tables
 
     @property
@@ -73,6 +75,9 @@ class DbcSpecifics(object):
 
         """
 
+        if self._environment_variables is None:
+            self._environment_variables = OrderedDict()
+
         return self._environment_variables
 
     @property
@@ -81,6 +86,9 @@ class DbcSpecifics(object):
 
         """
 
+        if self._attributes_rel is None:
+            self._attributes_rel = OrderedDict()
+
         return self._attributes_rel
 
     @property
@@ -89,4 +97,7 @@ class DbcSpecifics(object):
 
         """
 
+        if self._attribute_definitions_rel is None:
+            self._attribute_definitions_rel = OrderedDict()
+
         return self._attribute_definitions_rel
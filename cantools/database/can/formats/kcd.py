@@ -243,7 +243,8 @@ def _load_message_element(message, bus_name, nodes, strict, sort_signals):
                    comment=notes,
                    bus_name=bus_name,
                    strict=strict,
-                   sort_signals=sort_signals)
+                   sort_signals=sort_signals,
+                   lazy=True)
 
 
 def _indent_xml(element, indent, level=0):
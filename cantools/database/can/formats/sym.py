@@ -697,7 +697,8 @@ def _load_message(frame_id,
                    comment=comment,
                    bus_name=None,
                    strict=strict,
-                   sort_signals=sort_signals)
+                   sort_signals=sort_signals,
+                   lazy=True)
 
 
 def _parse_message_frame_ids(message):
@@ -1,34 +1,64 @@
 # A CAN message.
 
 import logging
+import math
+import sys
 from copy import deepcopy
+from itertools import product
 from typing import (
+    Iterable,
+    Iterator,
     List,
+    NamedTuple,
     Optional,
     Union,
     Dict,
+    Any,
     TYPE_CHECKING,
+    Sequence,
     Set,
     Tuple,
+    Type,
     cast
 )
 
 from .signal import NamedSignalValue, Signal
 from .signal_group import SignalGroup
+from .decoder import DecodedRecord
+from .decoder import LazyDecodedMessage
+from .decoder import LazyFields
+from .decoder import MessageDecoder
+from .decoder import create_lazy_fields
+from .decoder import create_record_class
+from .encoder import MessageEncoder
+from .container import ContainerPacker
+from ..utils import format_and
 from ..utils import format_or
 from ..utils import start_bit
 from ..utils import encode_data
 from ..utils import decode_data
+from ..utils import data_view
+from ..utils import formats_fit
 from ..utils import create_encode_decode_formats
+from ..utils import create_field_bounds
 from ..utils import type_sort_signals
 from ..utils import sort_signals_by_start_bit
 from ..utils import SORT_SIGNALS_DEFAULT
+from .. import vectorized
+from ..engines import check_codec_engine
+from ..engines import create_decoder
+from ..engines import FieldTableEntry
+from ..engines import create_field_table
+from ..engines import field_shift
 from ..errors import Error
 from ..errors import EncodeError
 from ..errors import DecodeError
 from ...typechecking import (
+    BytesLike,
     Comments,
+    ChoiceTable,
     Codec,
+    FieldBounds,
     SignalDictType,
     SignalMappingType,
     ContainerHeaderSpecType,
@@ -47,6 +77,32 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# The field table of the active signals and the names of the inactive
+# signals of a multiplexer branch, used by Message.decode_into().
+DecodeIntoTable = Tuple[List[FieldTableEntry], List[str]]
+
+# Multiplexed messages with more multiplexer branch combinations than
+# this are not flattened into a dispatch table.
+MAX_MUX_DISPATCH_BRANCHES = 4096
+
+
+class MuxDispatchNode(NamedTuple):
+    """A node of the flattened multiplexer dispatch table of a message.
+
+    The raw value of the multiplexer signal is extracted from the
+    payload integer of matching byte order with `shift`, `mask` and
+    `sign_bit`, and `branches` maps it to either the next node or the
+    codec of all signals of the selected branch.
+
+    """
+
+    is_big_endian: bool
+    shift: int
+    mask: int
+    sign_bit: int
+    branches: Dict[int, Union['MuxDispatchNode', Codec]]
+
+
 
 class Message(object):
     """A CAN message with frame id, comment, signals and other
@@ -59,8 +115,60 @@ class Message(object):
     If you don't want them to be sorted pass `sort_signals = None`.
     If you want the signals to be sorted in another way pass something like
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
+
+    `codec_engine` selects how signals are encoded and decoded, see
+    :attr:`.codec_engine`.
+
+    If `lazy` is ``True`` the codecs are created when first needed
+    instead of by :meth:`.refresh()`, see :attr:`.lazy`.
     """
 
+    __slots__ = (
+        '_frame_id',
+        '_header_id',
+        '_header_byte_order',
+        '_is_extended_frame',
+        '_is_fd',
+        '_name',
+        '_length',
+        '_unused_bit_pattern',
+        '_signals',
+        '_signal_dict',
+        '_contained_messages',
+        '_comments',
+        '_senders',
+        '_send_type',
+        '_cycle_time',
+        '_dbc',
+        '_autosar',
+        '_bus_name',
+        '_signal_groups',
+        '_codecs',
+        '_mux_dispatch',
+        '_mux_dispatch_created',
+        '_decoders',
+        '_lazy_fields',
+        '_decode_into_tables',
+        '_record_class',
+        '_bounds',
+        '_padding_pattern',
+        '_padding_masks',
+        '_contained_messages_by_header_id',
+        '_contained_messages_by_name',
+        '_contained_messages_version',
+        '_signal_tree',
+        '_strict',
+        '_protocol',
+        '_codec_engine',
+        '_lazy',
+        '_refresh_strict',
+    )
+
+    # Incremented whenever the header id or name of any message is
+    # changed, which invalidates the contained message indexes of all
+    # container messages.
+    _contained_messages_changes = 0
+
     def __init__(self,
                  frame_id: int,
                  name: str,
@@ -86,7 +194,10 @@ class Message(object):
                  strict: bool = True,
                  protocol: Optional[str] = None,
                  sort_signals: type_sort_signals = sort_signals_by_start_bit,
+                 codec_engine: str = 'bitstruct',
+                 lazy: bool = False,
                  ) -> None:
+        check_codec_engine(codec_engine)
         frame_id_bit_length = frame_id.bit_length()
 
         if is_extended_frame:
@@ -129,7 +240,7 @@ class Message(object):
             # multi-lingual dictionary
             self._comments = comment
 
-        self._senders = senders if senders else []
+        self._senders = [sys.intern(sender) for sender in senders or []]
         self._send_type = send_type
         self._cycle_time = cycle_time
         self._dbc = dbc_specifics
@@ -137,9 +248,24 @@ class Message(object):
         self._bus_name = bus_name
         self._signal_groups = signal_groups
         self._codecs: Optional[Codec] = None
+        self._mux_dispatch: Optional[MuxDispatchNode] = None
+        self._mux_dispatch_created = False
+        self._decoders: Dict[Tuple[str, ...], MessageDecoder] = {}
+        self._lazy_fields: Dict[int, Optional[LazyFields]] = {}
+        self._decode_into_tables: Dict[int, Optional[DecodeIntoTable]] = {}
+        self._record_class: Optional[Type[DecodedRecord]] = None
+        self._bounds: Dict[str, FieldBounds] = {}
+        self._padding_pattern = 0
+        self._padding_masks: Dict[Tuple[int, ...], int] = {}
+        self._contained_messages_by_header_id: Dict[Optional[int], List['Message']] = {}
+        self._contained_messages_by_name: Dict[str, List['Message']] = {}
+        self._contained_messages_version = -1
         self._signal_tree: Optional[List[Union[str, List[str]]]] = None
         self._strict = strict
         self._protocol = protocol
+        self._codec_engine = codec_engine
+        self._lazy = lazy
+        self._refresh_strict = strict
         self.refresh()
 
     def _create_codec(self,
@@ -196,10 +322,15 @@ class Message(object):
 
             signals.append(signal)
 
+        formats = create_encode_decode_formats(signals, self._length)
+
         return {
             'signals': signals,
-            'formats': create_encode_decode_formats(signals,
-                                                    self._length),
+            'formats': formats,
+            'decoder': create_decoder(self._codec_engine,
+                                      signals,
+                                      self._length,
+                                      formats),
             'multiplexers': multiplexers
         }
 
@@ -228,6 +359,181 @@ class Message(object):
 
         return nodes
 
+    def _create_mux_branches(self, codec: Codec) \
+            -> List[Tuple[Tuple[Tuple[Signal, int], ...], List[Signal]]]:
+        """Return all combinations of multiplexer ids of given codec as
+        ``(conditions, signals)`` tuples, where `conditions` are the
+        ``(multiplexer signal, multiplexer id)`` tuples in decoding
+        order and `signals` are all signals decoded in that case, in
+        decoding order. This is a recursive function.
+
+        """
+
+        per_multiplexer = []
+
+        for signal_name, mux_codecs in codec['multiplexers'].items():
+            signal = self.get_signal_by_name(signal_name)
+            per_multiplexer.append([
+                (((signal, mux),) + conditions, signals)
+                for mux, mux_codec in mux_codecs.items()
+                for conditions, signals in self._create_mux_branches(mux_codec)
+            ])
+
+        branches = []
+
+        for combination in product(*per_multiplexer):
+            conditions: Tuple[Tuple[Signal, int], ...] = ()
+            signals = list(codec['signals'])
+
+            for mux_conditions, mux_signals in combination:
+                conditions += mux_conditions
+                signals += mux_signals
+
+            branches.append((conditions, signals))
+
+        return branches
+
+    def _is_dispatchable_multiplexer(self, signal: Signal) -> bool:
+        """Returns ``True`` if the multiplexer id selected by given signal
+        always equals its raw value, independently of scaling and
+        choices. See ``_get_mux_number()``.
+
+        """
+
+        if signal.is_float or field_shift(signal, self._length) is None:
+            return False
+
+        if type(signal.scale) is not int \
+           or type(signal.offset) is not int \
+           or signal.scale != 1 \
+           or signal.offset != 0:
+            return False
+
+        if signal.choices:
+            names = [str(choice) for choice in signal.choices.values()]
+
+            if len(set(names)) != len(names):
+                return False
+
+        return True
+
+    def _count_mux_branches(self, codec: Codec) -> Optional[int]:
+        """Returns the number of combinations of multiplexer ids of given
+        codec without enumerating them, or ``None`` if any of its
+        multiplexers cannot be dispatched on. This is a recursive
+        function.
+
+        """
+
+        count = 1
+
+        for signal_name, mux_codecs in codec['multiplexers'].items():
+            signal = self.get_signal_by_name(signal_name)
+
+            if not self._is_dispatchable_multiplexer(signal):
+                return None
+
+            mux_count = 0
+
+            for mux_codec in mux_codecs.values():
+                branch_count = self._count_mux_branches(mux_codec)
+
+                if branch_count is None:
+                    return None
+
+                mux_count += branch_count
+
+            count *= mux_count
+
+        return count
+
+    def _create_mux_dispatch(self, codec: Codec) -> Optional[MuxDispatchNode]:
+        """Flatten the multiplexers of given codec into a dispatch table,
+        mapping raw multiplexer values to a codec of all signals of the
+        selected branch. Returns ``None`` if the codec is not
+        multiplexed or cannot be flattened.
+
+        """
+
+        if not codec['multiplexers']:
+            return None
+
+        count = self._count_mux_branches(codec)
+
+        if count is None or count > MAX_MUX_DISPATCH_BRANCHES:
+            return None
+
+        branches = self._create_mux_branches(codec)
+
+        root: Optional[MuxDispatchNode] = None
+        positions = {id(signal): i for i, signal in enumerate(self._signals)}
+
+        for conditions, signals in branches:
+            # The formats expect the signals in message order, while
+            # the decoded signals shall be in decoding order.
+            formats = create_encode_decode_formats(
+                sorted(signals, key=lambda signal: positions[id(signal)]),
+                self._length)
+            branch_codec: Codec = {
+                'signals': signals,
+                'formats': formats,
+                'decoder': create_decoder(self._codec_engine,
+                                          signals,
+                                          self._length,
+                                          formats),
+                'multiplexers': {}
+            }
+            parent: Optional[MuxDispatchNode] = None
+            node = root
+
+            for i, (signal, mux) in enumerate(conditions):
+                if node is None:
+                    node = MuxDispatchNode(
+                        signal.byte_order == 'big_endian',
+                        cast(int, field_shift(signal, self._length)),
+                        (1 << signal.length) - 1,
+                        (1 << (signal.length - 1)) if signal.is_signed else 0,
+                        {})
+
+                    if parent is None:
+                        root = node
+                    else:
+                        parent.branches[conditions[i - 1][1]] = node
+
+                parent = node
+
+                if i == len(conditions) - 1:
+                    node.branches[mux] = branch_codec
+                else:
+                    node = cast(Optional[MuxDispatchNode],
+                                node.branches.get(mux))
+
+        return root
+
+    def _dispatch_mux(self,
+                      dispatch: MuxDispatchNode,
+                      data: BytesLike) -> Optional[Codec]:
+        """Find the codec of all signals present in given data using given
+        flattened multiplexer dispatch table. Returns ``None`` if a
+        multiplexer value is invalid.
+
+        """
+
+        node: Union[MuxDispatchNode, Codec, None] = dispatch
+        big = int.from_bytes(data, 'big')
+        little = int.from_bytes(data, 'little')
+
+        while isinstance(node, MuxDispatchNode):
+            value = ((big if node.is_big_endian else little) >> node.shift) \
+                & node.mask
+
+            if node.sign_bit:
+                value = (value ^ node.sign_bit) - node.sign_bit
+
+            node = node.branches.get(value)
+
+        return node
+
     @property
     def header_id(self) -> Optional[int]:
         """The header ID of the message if it is part of a container message.
@@ -239,6 +545,7 @@ class Message(object):
     @header_id.setter
     def header_id(self, value: int) -> None:
         self._header_id = value
+        Message._contained_messages_changes += 1
 
     @property
     def header_byte_order(self) -> str:
@@ -300,6 +607,7 @@ class Message(object):
     @name.setter
     def name(self, value: str) -> None:
         self._name = value
+        Message._contained_messages_changes += 1
 
     @property
     def length(self) -> int:
@@ -312,6 +620,7 @@ class Message(object):
     @length.setter
     def length(self, value: int) -> None:
         self._length = value
+        self._padding_pattern = self._create_padding_pattern()
 
     @property
     def signals(self) -> List[Signal]:
@@ -333,6 +642,8 @@ class Message(object):
     def contained_messages(self) -> Optional[List['Message']]:
         """The list of messages potentially contained within this message
 
+        Call :meth:`.refresh()` after changing this list.
+
         """
 
         return self._contained_messages
@@ -353,9 +664,10 @@ class Message(object):
             LOGGER.info(f'Invalid unused bit pattern "{value}". Must be '
                         f'an integer between 0 and 255')
             self._unused_bit_pattern = 0
-            return
+        else:
+            self._unused_bit_pattern = value
 
-        self._unused_bit_pattern = value
+        self._padding_pattern = self._create_padding_pattern()
 
     @property
     def signal_groups(self) -> Optional[List[SignalGroup]]:
@@ -503,6 +815,72 @@ class Message(object):
     def protocol(self, value: Optional[str]) -> None:
         self._protocol = value
 
+    @property
+    def codec_engine(self) -> str:
+        """The engine used to decode signals. Call :meth:`.refresh()` after
+        changing it.
+
+        ``'bitstruct'`` (the default) unpacks the signals with
+        compiled ``bitstruct`` formats. ``'compiled'`` generates a
+        Python function per message (and multiplexer branch) at
+        refresh time, which extracts all signals from the payload
+        with shifts and masks and has the scale, offset and choices
+        of each signal inlined. The decoded values are identical. Messages with
+        overlapping signals, only loaded if `strict` is ``False``,
+        are decoded by ``bitstruct`` with all engines, which raises
+        an error.
+
+        """
+
+        return self._codec_engine
+
+    @codec_engine.setter
+    def codec_engine(self, value: str) -> None:
+        check_codec_engine(value)
+        self._codec_engine = value
+
+    @property
+    def lazy(self) -> bool:
+        """If ``True``, :meth:`.refresh()` does not create the codecs and
+        the signal tree used to encode and decode the message, nor
+        checks that the signals are not overlapping and fit in the
+        message. This is instead done when first needed, for example
+        when the message is first encoded or decoded, which then
+        raises any error of the `strict` checks. Call
+        :meth:`.refresh()` after changing it.
+
+        Loading databases with many messages of which only a few are
+        used is considerably faster with lazy messages.
+
+        """
+
+        return self._lazy
+
+    @lazy.setter
+    def lazy(self, value: bool) -> None:
+        self._lazy = value
+
+    @property
+    def record_class(self) -> Type[DecodedRecord]:
+        """The named tuple class of the records returned by
+        :meth:`decode()` if `as_record` is ``True``, with one field
+        per signal of this message. It is created when first used
+        after :meth:`.refresh()`.
+
+        A record takes considerably less memory than a dictionary of
+        signal values. Signal names which are not valid field names
+        are renamed, see
+        :func:`~cantools.database.can.decoder.create_record_class()`.
+
+        """
+
+        if self._record_class is None:
+            self._record_class = create_record_class(
+                self._name,
+                [signal.name for signal in self._signals])
+
+        return self._record_class
+
     @property
     def signal_tree(self):
         """All signal names and multiplexer ids as a tree. Multiplexer signals
@@ -517,6 +895,9 @@ class Message(object):
 
         """
 
+        if self._codecs is None:
+            self._create_codecs()
+
         return self._signal_tree
 
     def gather_signals(self,
@@ -532,8 +913,7 @@ class Message(object):
         '''
 
         if node is None:
-            node = self._codecs
-        assert node is not None
+            node = self._get_codecs()
 
         result = {}
 
@@ -736,10 +1116,11 @@ class Message(object):
                                     scaling: bool) -> None:
 
         for signal_name, signal_value in data.items():
-            signal = self.get_signal_by_name(signal_name)
+            bounds = self._bounds[signal_name]
 
             if isinstance(signal_value, (str, NamedSignalValue)):
                 # Check choices
+                signal = self._signal_dict[signal_name]
                 signal_value_num = signal.choice_string_to_number(str(signal_value))
 
                 if signal_value_num is None:
@@ -748,137 +1129,214 @@ class Message(object):
 
                 continue
 
-            if signal.minimum is not None:
-                min_effective = signal.minimum
-
-                # undo the scaling of the signal's minimum value if we
-                # are not supposed to scale the input value
-                if not scaling:
-                    min_effective = (signal.minimum - signal.offset)/signal.scale
+            limits = bounds.physical if scaling else bounds.raw
 
-                if signal_value < min_effective - signal.scale*1e-6:
-                    raise EncodeError(
-                        f'Expected signal "{signal.name}" value greater than '
-                        f'or equal to {min_effective} in message "{self.name}", '
-                        f'but got {signal_value}.')
+            if signal_value < limits.lower:
+                raise EncodeError(
+                    f'Expected signal "{signal_name}" value greater than '
+                    f'or equal to {limits.minimum} in message "{self.name}", '
+                    f'but got {signal_value}.')
 
-            if signal.maximum is not None:
-                max_effective = signal.maximum
+            if signal_value > limits.upper:
+                raise EncodeError(
+                    f'Expected signal "{signal_name}" value less than or '
+                    f'equal to {limits.maximum} in message "{self.name}", '
+                    f'but got {signal_value}.')
 
-                if not scaling:
-                    # undo the scaling of the signal's maximum value if we
-                    # are not supposed to scale the input value
-                    max_effective = (signal.maximum - signal.offset)/signal.scale
+    def _select_mux_codec(self,
+                          node: Codec,
+                          data: SignalMappingType,
+                          signal: str) -> Tuple[int, Codec]:
+        multiplexers = node['multiplexers']
+        mux = self._get_mux_number(data, signal)
+
+        try:
+            return mux, multiplexers[signal][mux]
+        except KeyError:
+            raise EncodeError(f'Expected multiplexer id in '
+                              f'{{{format_or(list(multiplexers[signal].keys()))}}}, '
+                              f'for multiplexer "{signal}" '
+                              f'but got {mux}')
+
+    def _select_mux_ids(self,
+                        node: Codec,
+                        data: SignalMappingType,
+                        mux_ids: List[int]) -> None:
+        for signal in node['multiplexers']:
+            mux, mux_node = self._select_mux_codec(node, data, signal)
+            mux_ids.append(mux)
+            self._select_mux_ids(mux_node, data, mux_ids)
+
+    def _encode(self,
+                node: Codec,
+                data: SignalMappingType,
+                scaling: bool,
+                mux_ids: List[int]) -> Tuple[int, List[Signal]]:
+        """Encode the signals of given codec and its selected multiplexer
+        branches. The selected multiplexer ids are appended to
+        `mux_ids` in depth-first order, which identifies the branch.
 
-                if signal_value > max_effective + signal.scale*1e-6:
-                    raise EncodeError(
-                        f'Expected signal "{signal.name}" value less than or '
-                        f'equal to {max_effective} in message "{self.name}", '
-                        f'but got {signal_value}.')
+        """
 
-    def _encode(self, node: Codec, data: SignalMappingType, scaling: bool) -> Tuple[int, int, List[Signal]]:
         encoded = encode_data(data,
                               node['signals'],
                               node['formats'],
                               scaling)
-        padding_mask = node['formats'].padding_mask
-        multiplexers = node['multiplexers']
 
         all_signals = list(node['signals'])
-        for signal in multiplexers:
-            mux = self._get_mux_number(data, signal)
+        for signal in node['multiplexers']:
+            mux, mux_node = self._select_mux_codec(node, data, signal)
+            mux_ids.append(mux)
+            mux_encoded, mux_signals = self._encode(mux_node,
+                                                    data,
+                                                    scaling,
+                                                    mux_ids)
+            all_signals.extend(mux_signals)
+            encoded |= mux_encoded
 
-            try:
-                node = multiplexers[signal][mux]
-            except KeyError:
-                raise EncodeError(f'Expected multiplexer id in '
-                                  f'{{{format_or(list(multiplexers[signal].keys()))}}}, '
-                                  f'for multiplexer "{signal}" '
-                                  f'but got {mux}')
+        return encoded, all_signals
 
-            mux_encoded, mux_padding_mask, mux_signals = \
-                self._encode(node, data, scaling)
-            all_signals.extend(mux_signals)
+    def _create_padding_pattern(self) -> int:
+        return int.from_bytes(bytes([self._unused_bit_pattern]) * self._length,
+                              'big')
 
-            encoded |= mux_encoded
-            padding_mask &= mux_padding_mask
+    def _create_padding_mask(self, node: Codec, mux_ids: Iterator[int]) -> int:
+        padding_mask = node['formats'].padding_mask
 
-        return encoded, padding_mask, all_signals
+        for mux_codecs in node['multiplexers'].values():
+            padding_mask &= self._create_padding_mask(mux_codecs[next(mux_ids)],
+                                                      mux_ids)
 
-    def _encode_container(self,
-                          data: ContainerEncodeInputType,
+        return padding_mask
+
+    def _padding_mask(self, mux_ids: Tuple[int, ...]) -> int:
+        """Returns the padding mask of the multiplexer branch selected by
+        given multiplexer ids, see ``_encode()``. The masks are cached
+        per branch until the message is refreshed.
+
+        """
+
+        try:
+            return self._padding_masks[mux_ids]
+        except KeyError:
+            padding_mask = self._create_padding_mask(self._get_codecs(),
+                                                     iter(mux_ids))
+            self._padding_masks[mux_ids] = padding_mask
+
+            return padding_mask
+
+    def padding_mask_for(self, mux_values: SignalMappingType) -> int:
+        """Returns the mask of the bits of this message which are not used
+        by any signal if its multiplexers have given values, as an
+        integer of :attr:`length` bytes in big endian byte order.
+
+        `mux_values` maps the name of each multiplexer selecting the
+        branch to its value, either the multiplexer id or its choice,
+        just like the data passed to :meth:`encode()`. Other keys are
+        ignored. Padding bits set by :meth:`encode()` are the bits of
+        this mask set in the unused bit pattern.
+
+        >>> hex(foo.padding_mask_for({'Mux': 1}))
+        '0xffff000000000000'
+
+        """
+
+        codecs = self._get_codecs()
+
+        mux_ids: List[int] = []
+        self._select_mux_ids(codecs, mux_values, mux_ids)
+
+        return self._padding_mask(tuple(mux_ids))
+
+    def _encode_contained(self,
+                          header: ContainerHeaderSpecType,
+                          value: Union[bytes, SignalMappingType],
                           scaling: bool,
-                          padding: bool) -> bytes:
+                          padding: bool) -> Tuple[int, bytes]:
+        """Returns the header id and payload of given contained message.
 
-        result = bytes()
+        """
 
-        for header, value in data:
-            if isinstance(header, str):
-                contained_message = \
-                    self.get_contained_message_by_name(header)
-            elif isinstance(header, Message):
-                # contained message is specified directly. We go once
-                # around the circle to ensure that a contained message
-                # with the given header ID is there.
-                contained_message = \
-                    self.get_contained_message_by_header_id(header.header_id) # type: ignore
-            elif isinstance(header, int):
-                # contained message is specified directly. We go once
-                # around the circle to ensure that a contained message
-                # with the given header ID is there.
-                contained_message = \
-                    self.get_contained_message_by_header_id(header)
-            else:
-                raise EncodeError(f'Could not determine message corresponding '
-                                  f'to header {header}')
+        if isinstance(header, str):
+            contained_message = \
+                self.get_contained_message_by_name(header)
+        elif isinstance(header, Message):
+            # contained message is specified directly. We go once
+            # around the circle to ensure that a contained message
+            # with the given header ID is there.
+            contained_message = \
+                self.get_contained_message_by_header_id(header.header_id) # type: ignore
+        elif isinstance(header, int):
+            # contained message is specified directly. We go once
+            # around the circle to ensure that a contained message
+            # with the given header ID is there.
+            contained_message = \
+                self.get_contained_message_by_header_id(header)
+        else:
+            raise EncodeError(f'Could not determine message corresponding '
+                              f'to header {header}')
 
-            if contained_message is None:
-                if isinstance(value, bytes) and isinstance(header, int):
-                    # the contained message waw specified as raw data
-                    header_id = header
-                else:
-                    raise EncodeError(f'No message corresponding to header '
-                                      f'{header} could be determined')
+        if contained_message is None:
+            if isinstance(value, bytes) and isinstance(header, int):
+                # the contained message waw specified as raw data
+                header_id = header
             else:
-                assert contained_message.header_id is not None
-                header_id = contained_message.header_id
+                raise EncodeError(f'No message corresponding to header '
+                                  f'{header} could be determined')
+        else:
+            assert contained_message.header_id is not None
+            header_id = contained_message.header_id
 
-            if isinstance(value, bytes):
-                # raw data
+        if isinstance(value, bytes):
+            # raw data
 
-                # ensure that the size of the blob corresponds to the
-                # one specified by the featured message.
-                if contained_message is not None and \
-                   len(value) != contained_message.length:
+            # ensure that the size of the blob corresponds to the
+            # one specified by the featured message.
+            if contained_message is not None and \
+               len(value) != contained_message.length:
 
-                    raise EncodeError(f'Specified data for contained message '
-                                      f'{contained_message.name} is '
-                                      f'{len(value)} bytes instead of '
-                                      f'{contained_message.length} bytes')
+                raise EncodeError(f'Specified data for contained message '
+                                  f'{contained_message.name} is '
+                                  f'{len(value)} bytes instead of '
+                                  f'{contained_message.length} bytes')
 
-                contained_payload = value
+            contained_payload = value
 
-            elif isinstance(value, dict):
-                # signal_name to signal_value dictionary
-                assert contained_message is not None
-                contained_payload = contained_message.encode(value,
-                                                             scaling,
-                                                             padding,
-                                                             strict=False)
+        elif isinstance(value, dict):
+            # signal_name to signal_value dictionary
+            assert contained_message is not None
+            contained_payload = contained_message.encode(value,
+                                                         scaling,
+                                                         padding,
+                                                         strict=False)
 
-            else:
-                assert contained_message is not None
-                raise EncodeError(f'Cannot encode payload for contained '
-                                  f'message "{contained_message.name}".')
+        else:
+            assert contained_message is not None
+            raise EncodeError(f'Cannot encode payload for contained '
+                              f'message "{contained_message.name}".')
+
+        return header_id, contained_payload
+
+    def _encode_container(self,
+                          data: ContainerEncodeInputType,
+                          scaling: bool,
+                          padding: bool) -> bytes:
+
+        result = bytearray()
+        hbo = 'big' if self.header_byte_order == 'big_endian' else 'little'
 
-            hbo = 'big' if self.header_byte_order == 'big_endian' else 'little'
+        for header, value in data:
+            header_id, contained_payload = self._encode_contained(header,
+                                                                  value,
+                                                                  scaling,
+                                                                  padding)
             result += int.to_bytes(header_id,
                                    3,
                                    hbo) # type: ignore
             result += int.to_bytes(len(contained_payload), 1, 'big')
             result += contained_payload
 
-        return result
+        return bytes(result)
 
     def encode(self,
                data: EncodeInputType,
@@ -937,32 +1395,91 @@ class Message(object):
                                   f'signal value dictionary')
             self.assert_signals_encodable(data, scaling=scaling)
 
-        if self._codecs is None:
-            raise ValueError('Codec is not initialized.')
+        codecs = self._get_codecs()
 
-        encoded, padding_mask, all_signals = self._encode(self._codecs,
-                                                          cast(SignalMappingType, data),
-                                                          scaling)
+        mux_ids: List[int] = []
+        encoded, all_signals = self._encode(codecs,
+                                            cast(SignalMappingType, data),
+                                            scaling,
+                                            mux_ids)
 
         if padding:
-            padding_pattern = int.from_bytes([self._unused_bit_pattern] * self._length, "big")
-            encoded |= (padding_mask & padding_pattern)
+            padding_mask = self._padding_mask(tuple(mux_ids))
+            encoded |= (padding_mask & self._padding_pattern)
 
         return encoded.to_bytes(self._length, "big")
 
+    def make_encoder(self,
+                     signal_names: Sequence[str],
+                     scaling: bool = True,
+                     padding: bool = False,
+                     strict: bool = True) -> MessageEncoder:
+        """Create an encoder of the signals with given names, which are
+        either all signals of the message or all signals of a
+        multiplexer branch, including its multiplexers. The encoder is
+        called with the signal values as positional arguments in
+        given order and returns the encoded message as ``bytes``.
+
+        The signal value ranges, scaling, choices and padding pattern
+        are looked up once when the encoder is created, which makes
+        encoding considerably faster than :meth:`encode()`. See
+        :meth:`encode()` for a description of `scaling`, `padding`
+        and `strict`.
+
+        The encoder must be created again after this message has been
+        modified.
+
+        >>> encoder = foo.make_encoder(['Bar', 'Fum'])
+        >>> encoder(1, 5.0)
+        b'\x01\x45\x23\x00\x11'
+
+        """
+
+        return MessageEncoder(self, signal_names, scaling, padding, strict)
+
+    def make_container_packer(self,
+                              scaling: bool = True,
+                              padding: bool = False,
+                              strict: bool = True,
+                              timeout: Optional[float] = None) -> ContainerPacker:
+        """Create a packer of contained messages into frames of this
+        container message, which writes them one by one into a
+        preallocated buffer and keeps track of the remaining capacity
+        of the frame. See :class:`~cantools.database.can.container.ContainerPacker`
+        for `timeout`, and :meth:`encode()` for a description of
+        `scaling`, `padding` and `strict`.
+
+        >>> packer = container.make_container_packer(timeout=0.01)
+        >>> packer.fill(pending)
+        2
+        >>> if packer.is_due():
+        ...     frame = packer.flush()
+
+        """
+
+        return ContainerPacker(self, scaling, padding, strict, timeout)
+
     def _decode(self,
                 node: Codec,
-                data: bytes,
+                data: BytesLike,
                 decode_choices: bool,
                 scaling: bool,
                 allow_truncated: bool) -> SignalDictType:
-        decoded = decode_data(data,
-                              self.length,
-                              node['signals'],
-                              node['formats'],
-                              decode_choices,
-                              scaling,
-                              allow_truncated)
+        decoder = node['decoder']
+
+        if decoder is None:
+            decoded = decode_data(data,
+                                  self.length,
+                                  node['signals'],
+                                  node['formats'],
+                                  decode_choices,
+                                  scaling,
+                                  allow_truncated)
+        else:
+            decoded = decoder.decode(data,
+                                     decode_choices,
+                                     scaling,
+                                     allow_truncated)
 
         multiplexers = node['multiplexers']
 
@@ -988,8 +1505,10 @@ class Message(object):
         return decoded
 
     def unpack_container(self,
-                         data: bytes,
-                         allow_truncated: bool = False) \
+                         data: BytesLike,
+                         allow_truncated: bool = False,
+                         offset: int = 0,
+                         length: Optional[int] = None) \
                          -> ContainerUnpackResultType:
         """Unwrap the contents of a container message.
 
@@ -1002,8 +1521,50 @@ class Message(object):
         Note that ``contained_message`` is the header ID integer value
         if a contained message is unknown. Further, if something goes
         seriously wrong, a ``DecodeError`` is raised.
+
+        `data` may be any object supporting the buffer protocol. The
+        contained data are slices of `data`, i.e. ``memoryview``
+        objects referring to the original buffer if `data` is not a
+        ``bytes`` object or if `offset` or `length` is given. See
+        :meth:`decode()` for a description of `offset` and `length`.
+        """
+
+        data = data_view(data, offset, length)
+        self._assert_container_unpackable(data)
+
+        return list(self._iter_container(data, allow_truncated))
+
+    def iter_container(self,
+                       data: BytesLike,
+                       allow_truncated: bool = False,
+                       offset: int = 0,
+                       length: Optional[int] = None) \
+                       -> Iterator[Union[Tuple['Message', memoryview],
+                                         Tuple[int, memoryview]]]:
+        """Iterate over the contents of a container message.
+
+        This yields the same ``(contained_message, contained_data)``
+        tuples as :meth:`unpack_container()`, one at a time and
+        without copying any data, as ``contained_data`` is always a
+        ``memoryview`` of `data`. A ``DecodeError`` is raised by this
+        method if `data` is not a valid container payload, and while
+        iterating if a contained message is malformed.
+
+        >>> container = db.get_message_by_name('Container')
+        >>> for contained_message, contained_data in container.iter_container(data):
+        ...     print(contained_message.decode(contained_data))
+
         """
 
+        view = cast(memoryview,
+                    data_view(memoryview(data).cast('B'), offset, length))
+        self._assert_container_unpackable(view)
+
+        return cast(Iterator[Union[Tuple['Message', memoryview],
+                                   Tuple[int, memoryview]]],
+                    self._iter_container(view, allow_truncated))
+
+    def _assert_container_unpackable(self, data: BytesLike) -> None:
         if not self.is_container:
             raise DecodeError(f'Cannot unpack non-container message '
                               f'"{self.name}"')
@@ -1013,17 +1574,26 @@ class Message(object):
                               f'as exhibiting at most {self.length} but '
                               f'received a {len(data)} bytes long frame')
 
-        result: ContainerUnpackListType = []
+    def _iter_container(self,
+                        data: BytesLike,
+                        allow_truncated: bool) \
+                        -> Iterator[Union[Tuple['Message', BytesLike],
+                                          Tuple[int, BytesLike]]]:
+        contained_messages = self._get_contained_messages_by_header_id()
+        number = 0
         pos = 0
+
         while pos < len(data):
+            number += 1
+
             if pos + 4 > len(data):
                 # TODO: better throw an exception? only warn in strict mode?
                 LOGGER.info(f'Malformed container message '
                             f'"{self.name}" encountered while decoding: '
                             f'No valid header specified for contained '
-                            f'message #{len(result)+1} starting at position '
+                            f'message #{number} starting at position '
                             f'{pos}. Ignoring.')
-                return result
+                return
 
             contained_id = int.from_bytes(data[pos:pos+3], 'big')
             contained_len = data[pos+3]
@@ -1032,32 +1602,36 @@ class Message(object):
                 if not allow_truncated:
                     raise DecodeError(f'Malformed container message '
                                       f'"{self.name}": Contained message '
-                                      f'{len(result)+1} would exceed total '
+                                      f'{number} would exceed total '
                                       f'message size.')
                 else:
                     contained_len = len(data) - pos - 4
 
-
             contained_data = data[pos+4:pos+4+contained_len]
-            contained_msg = \
-                self.get_contained_message_by_header_id(contained_id)
             pos += 4+contained_len
-
-            if contained_msg is None:
-                result.append((contained_id, contained_data))
+            candidates = contained_messages.get(contained_id)
+
+            if candidates is None:
+                yield contained_id, contained_data
+            elif len(candidates) > 1:
+                raise Error(f'Container message "{self.name}" contains '
+                            f'multiple contained messages exhibiting id '
+                            f'0x{contained_id:x}')
             else:
-                result.append((contained_msg, contained_data))
-
-        return result
+                yield candidates[0], contained_data
 
     def decode(self,
-               data: bytes,
+               data: BytesLike,
                decode_choices: bool = True,
                scaling: bool = True,
                decode_containers: bool = False,
-               allow_truncated: bool = False
+               allow_truncated: bool = False,
+               offset: int = 0,
+               length: Optional[int] = None,
+               signals: Optional[Sequence[str]] = None,
+               as_record: bool = False
                ) \
-               -> DecodeResultType:
+               -> Union[DecodeResultType, DecodedRecord]:
         """Decode given data as a message of this type.
 
         If `decode_choices` is ``False`` scaled values are not
@@ -1086,24 +1660,86 @@ class Message(object):
         ``False``, `DecodeError` will be raised when trying to decode
         incomplete messages.
 
+        `data` may be any object supporting the buffer protocol, for
+        example ``bytes``, ``bytearray`` or ``memoryview``. If
+        `offset` and/or `length` are given, the message is decoded
+        from `length` bytes of `data` starting at `offset` without
+        copying them first. This is useful to decode frames stored
+        back-to-back in a large receive buffer.
+
+        >>> buf = bytearray(b'\xff\xff\x01\x45\x23\x00\x11')
+        >>> foo.decode(buf, offset=2, length=5)
+        {'Bar': 1, 'Fum': 5.0}
+
+        If `signals` is given, only the signals with given names are
+        decoded and returned. This is faster than decoding all
+        signals if only a few signals of a large message are of
+        interest. See :meth:`make_decoder()` for details. `signals`
+        cannot be given for container messages.
+
+        >>> foo.decode(b'\x01\x45\x23\x00\x11', signals=['Fum'])
+        {'Fum': 5.0}
+
+        If `as_record` is ``True``, an instance of
+        :attr:`record_class` is returned instead of a dictionary, with
+        ``None`` for signals which are not decoded. Records cannot be
+        returned for container messages.
+
+        >>> foo.decode(b'\x01\x45\x23\x00\x11', as_record=True)
+        Foo(Bar=1, Fum=5.0)
+
         """
 
+        if as_record:
+            if self.is_container:
+                raise DecodeError(f'Cannot decode container message '
+                                  f'"{self.name}" as a record')
+
+            decoded = self.decode_simple(data,
+                                         decode_choices,
+                                         scaling,
+                                         allow_truncated,
+                                         offset,
+                                         length,
+                                         signals)
+            record_class: Any = self.record_class
+
+            # A list has a known length, and avoids over-allocating
+            # the tuple as when created from an iterator.
+            return cast(DecodedRecord,
+                        record_class._make([
+                            decoded.get(name)
+                            for name in record_class._signal_names
+                        ]))
+
         if decode_containers and self.is_container:
+            if signals is not None:
+                raise DecodeError(f'Cannot decode selected signals of '
+                                  f'container message "{self.name}"')
+
             return self.decode_container(data,
                                          decode_choices,
                                          scaling,
-                                         allow_truncated)
+                                         allow_truncated,
+                                         offset,
+                                         length)
 
         return self.decode_simple(data,
                                   decode_choices,
                                   scaling,
-                                  allow_truncated)
+                                  allow_truncated,
+                                  offset,
+                                  length,
+                                  signals)
 
     def decode_simple(self,
-                      data: bytes,
+                      data: BytesLike,
                       decode_choices: bool = True,
                       scaling: bool = True,
-                      allow_truncated: bool = False) \
+                      allow_truncated: bool = False,
+                      offset: int = 0,
+                      length: Optional[int] = None,
+                      signals: Optional[Sequence[str]] = None) \
                       -> SignalDictType:
         """Decode given data as a container message.
 
@@ -1114,22 +1750,281 @@ class Message(object):
 
         if self.is_container:
             raise DecodeError(f'Message "{self.name}" is a container')
-        elif self._codecs is None:
-            raise ValueError('Codec is not initialized.')
 
-        data = data[:self._length]
+        codecs = self._get_codecs()
+
+        if signals is not None:
+            key = tuple(signals)
+            decoder = self._decoders.get(key)
 
-        return self._decode(self._codecs,
+            if decoder is None:
+                decoder = self.make_decoder(key)
+                self._decoders[key] = decoder
+
+            return decoder.decode(data,
+                                  decode_choices,
+                                  scaling,
+                                  allow_truncated,
+                                  offset,
+                                  length)
+
+        data = data_view(data, offset, length)[:self._length]
+
+        mux_dispatch = self._get_mux_dispatch()
+
+        if mux_dispatch is not None and len(data) == self._length:
+            codec = self._dispatch_mux(mux_dispatch, data)
+
+            if codec is not None:
+                return self._decode(codec,
+                                    data,
+                                    decode_choices,
+                                    scaling,
+                                    allow_truncated)
+
+        return self._decode(codecs,
                             data,
                             decode_choices,
                             scaling,
                             allow_truncated)
 
+    def make_decoder(self, signal_names: Iterable[str]) -> MessageDecoder:
+        """Create a decoder of the signals with given names. Only the given
+        signals and the multiplexers they depend on are extracted from
+        the data, which makes the decoder faster than :meth:`decode()`
+        if only a subset of the signals is needed.
+
+        The decoder is a callable taking the same arguments as
+        :meth:`decode_simple()`, except `signals`. It must be created
+        again after this message has been modified.
+
+        >>> decoder = foo.make_decoder(['Fum'])
+        >>> decoder(b'\x01\x45\x23\x00\x11')
+        {'Fum': 5.0}
+
+        """
+
+        if self.is_container:
+            raise DecodeError(f'Message "{self.name}" is a container')
+
+        return MessageDecoder(self, signal_names)
+
+    def decode_lazy(self,
+                    data: BytesLike,
+                    decode_choices: bool = True,
+                    scaling: bool = True,
+                    allow_truncated: bool = False,
+                    offset: int = 0,
+                    length: Optional[int] = None) -> LazyDecodedMessage:
+        """Decode given data as a message of this type, but only extract
+        the value of a signal when it is accessed. This is faster than
+        :meth:`decode_simple()` if only a few signals of a large
+        message are accessed.
+
+        Returns a read-only mapping of signal names to values, which
+        contains the same signals as the dictionary returned by
+        :meth:`decode_simple()`. Multiplexers are decoded immediately
+        to find the signals present in given data. Data of
+        unexpected length and messages that cannot be decoded lazily
+        are decoded immediately.
+
+        >>> decoded = foo.decode_lazy(b'\x01\x45\x23\x00\x11')
+        >>> decoded['Fum']
+        5.0
+
+        """
+
+        if self.is_container:
+            raise DecodeError(f'Message "{self.name}" is a container')
+
+        codecs = self._get_codecs()
+
+        data = data_view(data, offset, length)[:self._length]
+        codec: Optional[Codec] = None
+
+        if len(data) == self._length:
+            mux_dispatch = self._get_mux_dispatch()
+
+            if mux_dispatch is not None:
+                codec = self._dispatch_mux(mux_dispatch, data)
+            elif not codecs['multiplexers']:
+                codec = codecs
+
+        if codec is not None:
+            key = id(codec)
+
+            try:
+                fields = self._lazy_fields[key]
+            except KeyError:
+                if formats_fit(codec['formats'], self._length):
+                    fields = create_lazy_fields(self, codec['signals'])
+                else:
+                    fields = None
+
+                self._lazy_fields[key] = fields
+
+            if fields is not None:
+                return LazyDecodedMessage(fields,
+                                          int.from_bytes(data, 'big'),
+                                          int.from_bytes(data, 'little'),
+                                          decode_choices,
+                                          scaling)
+
+        return LazyDecodedMessage.from_decoded(
+            self.decode_simple(data,
+                               decode_choices,
+                               scaling,
+                               allow_truncated))
+
+    def _create_decode_into_table(self, codec: Codec) -> Optional[DecodeIntoTable]:
+        if not formats_fit(codec['formats'], self._length):
+            return None
+
+        table = create_field_table(codec['signals'], self._length)
+
+        if table is None:
+            return None
+
+        active = {signal.name for signal in codec['signals']}
+        inactive = [
+            signal.name for signal in self._signals if signal.name not in active
+        ]
+
+        return table, inactive
+
+    def decode_into(self,
+                    data: BytesLike,
+                    out: Any,
+                    index: Optional[int] = None,
+                    scaling: bool = True,
+                    allow_truncated: bool = False,
+                    missing: Union[int, float] = math.nan,
+                    offset: int = 0,
+                    length: Optional[int] = None) -> Any:
+        """Decode given data as a message of this type and write the
+        value of each signal into `out`, which is returned.
+
+        If `index` is ``None``, `out` is assigned the values as
+        ``out[signal_name] = value``, for example a row of a NumPy
+        structured array with one field per signal. Otherwise `out`
+        is either a NumPy structured array, whose row `index` is
+        assigned, or a mapping of signal name to array, which is
+        assigned as ``out[signal_name][index] = value``.
+
+        Choices are not decoded. If `scaling` is ``False`` the raw
+        values are written. Signals not present in given data,
+        because another multiplexer branch is selected or because
+        the data is truncated and `allow_truncated` is ``True``, are
+        assigned `missing`, which defaults to NaN.
+
+        Unlike :meth:`decode()` no dictionary of signal values is
+        created, unless the data is of unexpected length or the
+        message cannot be decoded with shifts and masks. See
+        :meth:`decode()` for a description of `offset` and `length`.
+
+        >>> row = np.zeros(1, dtype=[('Bar', 'f8'), ('Fum', 'f8')])[0]
+        >>> foo.decode_into(b'\x01\x45\x23\x00\x11', row)
+        (1., 5.)
+
+        """
+
+        if self.is_container:
+            raise DecodeError(f'Message "{self.name}" is a container')
+
+        codecs = self._get_codecs()
+
+        data = data_view(data, offset, length)[:self._length]
+        table: Optional[DecodeIntoTable] = None
+
+        if len(data) == self._length:
+            codec: Optional[Codec] = None
+
+            mux_dispatch = self._get_mux_dispatch()
+
+            if mux_dispatch is not None:
+                codec = self._dispatch_mux(mux_dispatch, data)
+            elif not codecs['multiplexers']:
+                codec = codecs
+
+            if codec is not None:
+                key = id(codec)
+
+                try:
+                    table = self._decode_into_tables[key]
+                except KeyError:
+                    table = self._create_decode_into_table(codec)
+                    self._decode_into_tables[key] = table
+
+        if index is None:
+            target = out
+        elif hasattr(out, 'dtype'):
+            # A structured array, whose rows are views.
+            target = out[index]
+        else:
+            target = None
+
+        if table is None:
+            decoded = self.decode_simple(data,
+                                         False,
+                                         scaling,
+                                         allow_truncated)
+
+            for signal in self._signals:
+                decoded_value = decoded.get(signal.name, missing)
+
+                if target is None:
+                    out[signal.name][index] = decoded_value
+                else:
+                    target[signal.name] = decoded_value
+
+            return out
+
+        fields, inactive = table
+        big = int.from_bytes(data, 'big')
+        little = int.from_bytes(data, 'little')
+        value: Union[int, float]
+
+        for (name,
+             is_big_endian,
+             shift,
+             mask,
+             sign_bit,
+             unpack,
+             byte_length,
+             is_identity,
+             scale,
+             value_offset,
+             _) in fields:
+            value = ((big if is_big_endian else little) >> shift) & mask
+
+            if unpack is not None:
+                value = unpack(value.to_bytes(byte_length, 'big'))[0]
+            elif sign_bit:
+                value = (value ^ sign_bit) - sign_bit
+
+            if scaling and not is_identity:
+                value = scale * value + value_offset
+
+            if target is None:
+                out[name][index] = value
+            else:
+                target[name] = value
+
+        for name in inactive:
+            if target is None:
+                out[name][index] = missing
+            else:
+                target[name] = missing
+
+        return out
+
     def decode_container(self,
-                         data: bytes,
+                         data: BytesLike,
                          decode_choices: bool = True,
                          scaling: bool = True,
-                         allow_truncated: bool = False) \
+                         allow_truncated: bool = False,
+                         offset: int = 0,
+                         length: Optional[int] = None) \
                          -> ContainerDecodeResultType:
         """Decode given data as a container message.
 
@@ -1141,7 +2036,12 @@ class Message(object):
         if not self.is_container:
             raise DecodeError(f'Message "{self.name}" is not a container')
 
-        unpacked = self.unpack_container(data, allow_truncated)
+        data = data_view(data, offset, length)
+        self._assert_container_unpackable(data)
+
+        # Unpack all contained messages before decoding any of them, to
+        # raise errors of a malformed container first.
+        unpacked = list(self._iter_container(data, allow_truncated))
 
         result: ContainerDecodeResultListType = []
 
@@ -1158,15 +2058,409 @@ class Message(object):
 
         return result
 
+    def _batch_mux_numbers(self,
+                           signal: Signal,
+                           matrix: Any,
+                           decode_choices: bool,
+                           scaling: bool) -> Any:
+        """The multiplexer id selected by given multiplexer signal for each
+        row of the payload matrix. This is the vectorized counterpart
+        of ``_get_mux_number()``.
+
+        """
+
+        np = vectorized.np
+        raw = vectorized.extract_raw(matrix, signal)
+
+        if scaling:
+            numbers = signal.scale * raw + signal.offset
+        else:
+            numbers = raw
+
+        numbers = np.trunc(numbers).astype(np.int64)
+
+        if decode_choices and signal.choices:
+            is_choice = np.isin(raw, list(signal.choices.keys()))
+            numbers = np.where(is_choice, raw, numbers)
+
+        return numbers
+
+    def _batch_choice_tables(self,
+                             node: Codec,
+                             choice_tables: Dict[str, ChoiceTable]) -> None:
+        """Collect the choice tables of all signals of given codec node.
+        This is a recursive function.
+
+        """
+
+        choice_tables.update(node['formats'].choice_tables)
+
+        for mux_nodes in node['multiplexers'].values():
+            for mux_node in mux_nodes.values():
+                self._batch_choice_tables(mux_node, choice_tables)
+
+    def _batch_active_rows(self,
+                           node: Codec,
+                           matrix: Any,
+                           lengths: Any,
+                           rows: Any,
+                           decode_choices: bool,
+                           scaling: bool,
+                           active: Dict[str, Any]) -> None:
+        """Find the rows in which each signal of given codec node is
+        present. This is a recursive function.
+
+        """
+
+        for signal in node['signals']:
+            if signal.name in active:
+                active[signal.name] = active[signal.name] | rows
+            else:
+                active[signal.name] = rows
+
+        for signal_name, mux_nodes in node['multiplexers'].items():
+            signal = self.get_signal_by_name(signal_name)
+            numbers = self._batch_mux_numbers(signal,
+                                              matrix,
+                                              decode_choices,
+                                              scaling)
+            mux_rows = rows & (lengths >= vectorized.field_end(signal))
+
+            for mux, mux_node in mux_nodes.items():
+                self._batch_active_rows(mux_node,
+                                        matrix,
+                                        lengths,
+                                        mux_rows & (numbers == mux),
+                                        decode_choices,
+                                        scaling,
+                                        active)
+
+    def decode_batch(self,
+                     payloads: Any,
+                     decode_choices: bool = True,
+                     scaling: bool = True,
+                     allow_truncated: bool = False) -> Dict[str, Any]:
+        """Decode many frames of this message at once.
+
+        `payloads` is either a 2-D ``uint8`` array with one frame per
+        row or a sequence of ``bytes`` objects. A dictionary of signal
+        name to NumPy array with one value per frame is returned. This
+        requires the ``numpy`` package.
+
+        Signals of multiplexed messages which are not present in all
+        frames are returned as masked arrays, where frames that
+        select another multiplexer id are masked. The same applies to
+        signals not contained in all frames if `allow_truncated` is
+        ``True``.
+
+        See ``decode()`` for the meaning of `decode_choices`,
+        `scaling` and `allow_truncated`. If choices are decoded, the
+        arrays of signals with choices have dtype ``object``.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.decode_batch([b'\\x01\\x45\\x23\\x00\\x11',
+        ...                   b'\\x02\\x45\\x23\\x00\\x11'])
+        {'Bar': array([1, 2]), 'Fum': array([5., 5.])}
+
+        """
+
+        if self.is_container:
+            raise DecodeError(f'Message "{self.name}" is a container')
+
+        codecs = self._get_codecs()
+
+        np = vectorized.np
+        matrix, lengths = vectorized.payload_matrix(payloads, self._length)
+        choice_tables: Dict[str, ChoiceTable] = {}
+        self._batch_choice_tables(codecs, choice_tables)
+        decoded = vectorized.decode_batch_data(matrix,
+                                               lengths,
+                                               self._length,
+                                               self._signals,
+                                               choice_tables,
+                                               decode_choices,
+                                               scaling,
+                                               allow_truncated)
+        active: Dict[str, Any] = {}
+        self._batch_active_rows(codecs,
+                                matrix,
+                                lengths,
+                                np.ones(len(matrix), dtype=bool),
+                                decode_choices,
+                                scaling,
+                                active)
+
+        return {
+            name: vectorized.mask_inactive(value, active[name])
+            for name, value in decoded.items()
+            if name in active
+        }
+
+    def _batch_column(self, columns: Dict[str, Any], name: str) -> Any:
+        try:
+            return columns[name]
+        except KeyError:
+            raise EncodeError(f'Expected a column for signal "{name}" of '
+                              f'message "{self.name}".') from None
+
+    def _batch_encode_active_rows(self,
+                                  node: Codec,
+                                  columns: Dict[str, Any],
+                                  rows: Any,
+                                  active: Dict[str, Any]) -> None:
+        """Find the rows in which each signal of given codec node is
+        encoded, given the multiplexer columns. This is a recursive
+        function.
+
+        """
+
+        np = vectorized.np
+
+        for signal in node['signals']:
+            if signal.name in active:
+                active[signal.name] = active[signal.name] | rows
+            else:
+                active[signal.name] = rows
+
+        for signal_name, mux_nodes in node['multiplexers'].items():
+            row_numbers = np.flatnonzero(rows)
+
+            if len(row_numbers) == 0:
+                continue
+
+            signal = self.get_signal_by_name(signal_name)
+            column = self._batch_column(columns, signal_name)[row_numbers]
+            numbers, choices, is_choice = vectorized.split_column(signal, column)
+
+            # The same as _get_mux_number().
+            numbers = np.where(is_choice, choices, np.trunc(numbers))
+            selected = np.zeros(len(row_numbers), dtype=bool)
+
+            for mux, mux_node in mux_nodes.items():
+                mux_selected = (numbers == mux)
+                selected |= mux_selected
+                mux_rows = np.zeros(len(rows), dtype=bool)
+                mux_rows[row_numbers[mux_selected]] = True
+                self._batch_encode_active_rows(mux_node,
+                                               columns,
+                                               mux_rows,
+                                               active)
+
+            if not selected.all():
+                raise EncodeError(
+                    f'Expected multiplexer id in '
+                    f'{{{format_or(list(mux_nodes.keys()))}}}, for '
+                    f'multiplexer "{signal_name}" but got '
+                    f'{column[~selected][0]} in rows '
+                    f'{format_and(row_numbers[~selected].tolist())}')
+
+    def encode_batch(self,
+                     columns: Any,
+                     scaling: bool = True,
+                     padding: bool = False,
+                     strict: bool = True) -> Any:
+        """Encode many frames of this message at once.
+
+        `columns` is either a dictionary of signal name to array-like
+        with one value per frame, or a NumPy structured array with
+        one field per signal. A 2-D ``uint8`` array with one encoded
+        frame per row is returned. This requires the ``numpy``
+        package.
+
+        The multiplexer columns of multiplexed messages select the
+        signals encoded in each row. Other signals are ignored in
+        rows where they are not selected, and may for example be
+        masked arrays as returned by :meth:`decode_batch()`.
+
+        See :meth:`encode()` for the meaning of `scaling`, `padding`
+        and `strict`. Columns of signals with choices may contain
+        choice strings.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.encode_batch({'Bar': [1, 2], 'Fum': [5.0, 5.0]})
+        array([[  1,  69,  35,   0,  17],
+               [  2,  69,  35,   0,  17]], dtype=uint8)
+
+        """
+
+        if self.is_container:
+            raise EncodeError(f'Message "{self.name}" is a container')
+
+        codecs = self._get_codecs()
+
+        np = vectorized.np
+        columns, count = vectorized.column_arrays(columns)
+
+        if strict:
+            unknown = set(columns) - set(self._signal_dict)
+
+            if unknown:
+                raise EncodeError(f'The following signals were specified but '
+                                  f'are not part of the message: {unknown}')
+
+        active: Dict[str, Any] = {}
+        self._batch_encode_active_rows(codecs,
+                                       columns,
+                                       np.ones(count, dtype=bool),
+                                       active)
+        matrix = np.zeros((count, self._length), dtype=np.uint8)
+        used = np.zeros((count, self._length), dtype=np.uint8)
+
+        for signal in self._signals:
+            row_numbers = np.flatnonzero(active.get(signal.name, False))
+
+            if len(row_numbers) == 0:
+                continue
+
+            column = self._batch_column(columns, signal.name)[row_numbers]
+            numbers, choices, is_choice = vectorized.split_column(signal, column)
+
+            if strict:
+                bounds = self._bounds[signal.name]
+                vectorized.assert_in_range(
+                    signal,
+                    bounds.physical if scaling else bounds.raw,
+                    numbers[~is_choice],
+                    row_numbers[~is_choice])
+
+            raw = vectorized.physical_to_raw(signal,
+                                             numbers,
+                                             choices,
+                                             is_choice,
+                                             scaling)
+            bits = np.zeros(count, dtype=np.uint64)
+            bits[row_numbers] = vectorized.raw_to_bits(signal, raw, row_numbers)
+            vectorized.insert_bits(matrix, signal, bits)
+
+            if padding:
+                bits = np.zeros(count, dtype=np.uint64)
+                bits[row_numbers] = np.uint64((1 << signal.length) - 1)
+                vectorized.insert_bits(used, signal, bits)
+
+        if padding:
+            matrix |= ~used & np.uint8(self._unused_bit_pattern)
+
+        return matrix
+
+    def _batch_out_of_range_rows(self,
+                                 columns: Dict[str, Any],
+                                 scaling: bool) -> Dict[str, Any]:
+        np = vectorized.np
+        out_of_range_rows = {}
+
+        for name, column in columns.items():
+            bounds = self._bounds.get(name)
+
+            if bounds is None:
+                continue
+
+            limits = bounds.physical if scaling else bounds.raw
+
+            if limits.minimum is None and limits.maximum is None:
+                continue
+
+            signal = self._signal_dict[name]
+            numbers, _, is_choice = vectorized.split_column(signal, column)
+            invalid = vectorized.out_of_range(limits, numbers)
+            invalid &= ~is_choice
+            invalid &= ~np.ma.getmaskarray(column)
+            rows = np.flatnonzero(invalid)
+
+            if len(rows) > 0:
+                out_of_range_rows[name] = rows
+
+        return out_of_range_rows
+
+    def validate_batch(self,
+                       columns: Any,
+                       scaling: bool = True) -> Dict[str, Any]:
+        """Check that the values of many frames of this message are
+        within the minimum and maximum of their signals, the same way
+        as :meth:`encode()` does in strict mode.
+
+        `columns` is either a dictionary of signal name to array-like
+        with one value per frame, or a NumPy structured array with
+        one field per signal. Columns of other names, choice strings
+        and masked values are not checked. A dictionary of signal
+        name to NumPy array of the row indices of out of range values
+        is returned, with only signals having such values. This
+        requires the ``numpy`` package.
+
+        If `scaling` is ``False`` the values are raw values.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.validate_batch({'Bar': [1, 2, 600], 'Fum': [5.0, -10.0, 5.0]})
+        {'Bar': array([2]), 'Fum': array([1])}
+
+        """
+
+        if self.is_container:
+            raise EncodeError(f'Message "{self.name}" is a container')
+
+        columns, _ = vectorized.column_arrays(columns)
+
+        return self._batch_out_of_range_rows(columns, scaling)
+
+    def validate_raw(self,
+                     payloads: Any,
+                     allow_truncated: bool = False) -> Dict[str, Any]:
+        """Check that the signal values of many encoded frames of this
+        message are within the minimum and maximum of their signals,
+        for example to find implausible values in recorded logs.
+
+        `payloads` is either a 2-D ``uint8`` array with one frame per
+        row or a sequence of ``bytes`` objects. The raw signal values
+        are compared to the raw bounds of the signals, without scaling
+        them. Signals not present in a frame, because of its
+        multiplexer ids or a truncated frame if `allow_truncated` is
+        ``True``, are not checked. See :meth:`validate_batch()` for
+        the returned dictionary.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.validate_raw([b'\\x01\\x45\\x23\\x00\\x11',
+        ...                   b'\\xff\\x45\\x23\\x00\\x11'])
+        {'Bar': array([1])}
+
+        """
+
+        decoded = self.decode_batch(payloads,
+                                    decode_choices=False,
+                                    scaling=False,
+                                    allow_truncated=allow_truncated)
+
+        return self._batch_out_of_range_rows(decoded, False)
+
+    def _create_contained_messages_indexes(self) -> None:
+        self._contained_messages_by_header_id = {}
+        self._contained_messages_by_name = {}
+
+        for message in self._contained_messages or []:
+            self._contained_messages_by_header_id.setdefault(
+                message.header_id, []).append(message)
+            self._contained_messages_by_name.setdefault(
+                message.name, []).append(message)
+
+        self._contained_messages_version = Message._contained_messages_changes
+
+    def _get_contained_messages_by_header_id(self) \
+        -> Dict[Optional[int], List['Message']]:
+        if self._contained_messages_version != Message._contained_messages_changes:
+            self._create_contained_messages_indexes()
+
+        return self._contained_messages_by_header_id
+
+    def _get_contained_messages_by_name(self) -> Dict[str, List['Message']]:
+        if self._contained_messages_version != Message._contained_messages_changes:
+            self._create_contained_messages_indexes()
+
+        return self._contained_messages_by_name
+
     def get_contained_message_by_header_id(self, header_id: int) \
         -> Optional['Message']:
 
-        if self.contained_messages is None:
-            return None
-
-        tmp = [ x for x in self.contained_messages if x.header_id == header_id ]
+        tmp = self._get_contained_messages_by_header_id().get(header_id)
 
-        if len(tmp) == 0:
+        if tmp is None:
             return None
         elif len(tmp) > 1:
             raise Error(f'Container message "{self.name}" contains multiple '
@@ -1177,12 +2471,9 @@ class Message(object):
     def get_contained_message_by_name(self, name: str) \
         -> Optional['Message']:
 
-        if self.contained_messages is None:
-            return None
-
-        tmp = [ x for x in self.contained_messages if x.name == name ]
+        tmp = self._get_contained_messages_by_name().get(name)
 
-        if len(tmp) == 0:
+        if tmp is None:
             return None
         elif len(tmp) > 1:
             raise Error(f'Container message "{self.name}" contains multiple '
@@ -1205,10 +2496,9 @@ class Message(object):
         True
 
         """
-        if self._codecs is None:
-            raise ValueError('Codec is not initialized.')
+        codecs = self._get_codecs()
 
-        return bool(self._codecs['multiplexers'])
+        return bool(codecs['multiplexers'])
 
     def _check_signal(self, message_bits, signal):
         signal_bits = signal.length * [signal.name]
@@ -1294,16 +2584,65 @@ class Message(object):
         """
 
         self._check_signal_lengths()
-        self._codecs = self._create_codec()
-        self._signal_tree = self._create_signal_tree(self._codecs)
+        self._codecs = None
+        self._signal_tree = None
+        self._mux_dispatch = None
+        self._mux_dispatch_created = False
         self._signal_dict = {signal.name: signal for signal in self._signals}
+        self._bounds = {
+            signal.name: create_field_bounds(signal) for signal in self._signals
+        }
+        self._decoders = {}
+        self._lazy_fields = {}
+        self._decode_into_tables = {}
+        self._record_class = None
+        self._padding_pattern = self._create_padding_pattern()
+        self._padding_masks = {}
+        self._create_contained_messages_indexes()
 
         if strict is None:
             strict = self._strict
 
-        if strict:
+        self._refresh_strict = strict
+
+        if not self._lazy:
+            self._create_codecs()
+
+    def _create_codecs(self) -> None:
+        """Create the codecs and the signal tree, and check the signals
+        if the message was refreshed in strict mode. Called by
+        :meth:`.refresh()`, or when first needed if the message is lazy.
+
+        """
+
+        codecs = self._create_codec()
+        signal_tree = self._create_signal_tree(codecs)
+
+        if self._refresh_strict:
             message_bits = 8 * self.length * [None]
-            self._check_signal_tree(message_bits, self.signal_tree)
+            self._check_signal_tree(message_bits, signal_tree)
+
+        self._signal_tree = signal_tree
+        self._codecs = codecs
+
+    def _get_codecs(self) -> Codec:
+        if self._codecs is None:
+            self._create_codecs()
+
+        return cast(Codec, self._codecs)
+
+    def _get_mux_dispatch(self) -> Optional[MuxDispatchNode]:
+        """Returns the multiplexer dispatch table, which is created when
+        first needed as it compiles the formats of every multiplexer
+        branch.
+
+        """
+
+        if not self._mux_dispatch_created:
+            self._mux_dispatch = self._create_mux_dispatch(self._get_codecs())
+            self._mux_dispatch_created = True
+
+        return self._mux_dispatch
 
     def __repr__(self) -> str:
         return \
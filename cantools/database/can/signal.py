@@ -1,5 +1,6 @@
 # A CAN signal.
 import decimal
+import sys
 from typing import Optional, Dict, TYPE_CHECKING, List, Any, Union
 
 from ...typechecking import Comments, ByteOrder, Choices
@@ -19,6 +20,8 @@ class Decimal(object):
 
     """
 
+    __slots__ = ('_scale', '_offset', '_minimum', '_maximum')
+
     def __init__(self,
                  scale: Optional[decimal.Decimal] = None,
                  offset: Optional[decimal.Decimal] = None,
@@ -88,6 +91,8 @@ class NamedSignalValue(object):
     descriptions for the named value.
     """
 
+    __slots__ = ('_name', '_value', '_comments')
+
     def __init__(self,
                  value: int,
                  name: str,
@@ -185,6 +190,32 @@ class Signal(object):
 
     """
 
+    # Databases may have hundreds of thousands of signals.
+    __slots__ = (
+        'name',
+        'scale',
+        'offset',
+        'is_float',
+        'minimum',
+        'maximum',
+        'choices',
+        'start',
+        'length',
+        'byte_order',
+        'is_signed',
+        'initial',
+        'invalid',
+        'decimal',
+        'unit',
+        'dbc',
+        'receivers',
+        'is_multiplexer',
+        'multiplexer_ids',
+        'multiplexer_signal',
+        'spn',
+        'comments',
+    )
+
     def __init__(self,
                  name: str,
                  start: int,
@@ -212,7 +243,7 @@ class Signal(object):
         # avoid using properties to improve encoding/decoding performance
 
         #: The signal name as a string.
-        self.name: str = name
+        self.name: str = sys.intern(name)
 
         #: The scale factor of the signal value.
         self.scale: float = scale
@@ -265,13 +296,15 @@ class Signal(object):
         self.decimal: Decimal = Decimal() if decimal is None else decimal
 
         #: The unit of the signal as a string, or ``None`` if unavailable.
-        self.unit: Optional[str] = unit
+        self.unit: Optional[str] = None if unit is None else sys.intern(unit)
 
         #: An object containing dbc specific properties like e.g. attributes.
         self.dbc: Optional["DbcSpecifics"] = dbc_specifics
 
         #: A list of all receiver nodes of this signal.
-        self.receivers: List[str] = receivers or []
+        self.receivers: List[str] = [
+            sys.intern(receiver) for receiver in receivers or []
+        ]
 
         #: ``True`` if this is the multiplexer signal in a message, ``False``
         #: otherwise.
@@ -283,7 +316,8 @@ class Signal(object):
 
         #: The multiplexer signal if the signal is part of a multiplexed
         #: message, ``None`` otherwise.
-        self.multiplexer_signal: Optional[str] = multiplexer_signal
+        self.multiplexer_signal: Optional[str] = (
+            None if multiplexer_signal is None else sys.intern(multiplexer_signal))
 
         #: The J1939 Suspect Parameter Number (SPN) value if the signal
         #: has this attribute, ``None`` otherwise.
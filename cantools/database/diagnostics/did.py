@@ -4,6 +4,7 @@ import binascii
 
 from ..utils import encode_data
 from ..utils import decode_data
+from ..utils import data_view
 from ..utils import create_encode_decode_formats
 
 
@@ -103,7 +104,9 @@ class Did(object):
                data,
                decode_choices=True,
                scaling=True,
-               allow_truncated=False):
+               allow_truncated=False,
+               offset=0,
+               length=None):
         """Decode given data as a DID of this type.
 
         If `decode_choices` is ``False`` scaled values are not
@@ -115,9 +118,14 @@ class Did(object):
         >>> foo.decode(b'\\x01\\x45\\x23\\x00\\x11')
         {'Bar': 1, 'Fum': 5.0}
 
+        `data` may be any object supporting the buffer protocol. If
+        `offset` and/or `length` are given, the DID is decoded from
+        `length` bytes of `data` starting at `offset` without copying
+        them first.
+
         """
 
-        return decode_data(data[:self._length],
+        return decode_data(data_view(data, offset, length)[:self._length],
                            self.length,
                            self._codec['datas'],
                            self._codec['formats'],
@@ -0,0 +1,384 @@
+# Alternative encode/decode engines.
+#
+# The default 'bitstruct' engine unpacks each codec node with the
+# compiled bitstruct formats created by
+# create_encode_decode_formats(). The 'compiled' engine instead
+# converts the payload to integers once and extracts every field with
+# precomputed shifts and masks by generated code.
+
+import math
+import struct
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .utils import decode_data
+from .utils import formats_fit
+from .utils import sawtooth_to_network_bitnum
+from ..typechecking import BytesLike, ChoiceValueType, Formats, SignalDictType
+
+if TYPE_CHECKING:
+    from .can.signal import Signal
+    from .diagnostics import Data
+
+CODEC_ENGINES = ('bitstruct', 'compiled')
+
+DecodeFunction = Callable[[BytesLike, bool, bool, bool], SignalDictType]
+
+FLOAT_FORMATS = {
+    16: '>e',
+    32: '>f',
+    64: '>d'
+}
+
+
+def check_codec_engine(codec_engine: str) -> None:
+    if codec_engine not in CODEC_ENGINES:
+        raise ValueError(
+            "expected codec engine {}, but got '{}'".format(
+                ' or '.join([f"'{engine}'" for engine in CODEC_ENGINES]),
+                codec_engine))
+
+
+def field_shift(field: Union["Signal", "Data"],
+                expected_length: int) -> Optional[int]:
+    """Returns the right shift that moves the least significant bit of
+    given field to bit 0 of the payload integer of matching byte
+    order, i.e. ``int.from_bytes(data, 'little')`` for little endian
+    fields and ``int.from_bytes(data, 'big')`` for big endian fields.
+
+    ``None`` is returned if the field does not fit in
+    `expected_length` bytes.
+
+    """
+
+    if field.byte_order == 'little_endian':
+        shift = field.start
+        end = field.start + field.length
+    else:
+        msb = sawtooth_to_network_bitnum(field.start)
+        end = msb + field.length
+        shift = 8 * expected_length - end
+
+    if shift < 0 or end > 8 * expected_length:
+        return None
+
+    return shift
+
+
+class FieldExtractor(NamedTuple):
+    """Extracts the raw value of a field from the payload converted to
+    integers, see :func:`create_field_extractor()`.
+
+    """
+
+    is_big_endian: bool
+    shift: int
+    mask: int
+    sign_bit: int
+    unpack: Optional[Callable[[bytes], Tuple[float]]]
+    byte_length: int
+
+    def extract(self, big: int, little: int) -> Union[int, float]:
+        """Returns the raw value of the field given the payload as big and
+        little endian integers.
+
+        """
+
+        value = ((big if self.is_big_endian else little) >> self.shift) \
+            & self.mask
+
+        if self.unpack is not None:
+            return self.unpack(value.to_bytes(self.byte_length, 'big'))[0]
+        elif self.sign_bit:
+            return (value ^ self.sign_bit) - self.sign_bit
+
+        return value
+
+
+def create_field_extractor(field: Union["Signal", "Data"],
+                           expected_length: int) -> Optional[FieldExtractor]:
+    """Create an extractor of given field from payloads of
+    `expected_length` bytes, or ``None`` if the field does not fit or
+    is a float of unsupported length.
+
+    """
+
+    shift = field_shift(field, expected_length)
+
+    if shift is None:
+        return None
+
+    unpack = None
+
+    if field.is_float:
+        fmt = FLOAT_FORMATS.get(field.length)
+
+        if fmt is None:
+            return None
+
+        unpack = struct.Struct(fmt).unpack
+
+    return FieldExtractor(
+        field.byte_order == 'big_endian',
+        shift,
+        (1 << field.length) - 1,
+        (1 << (field.length - 1)) if field.is_signed else 0,
+        unpack,
+        field.length // 8)
+
+
+def source_literal(value: Any, name: str, namespace: Dict[str, Any]) -> str:
+    """Returns given number as a source code literal if it can be
+    represented exactly, and otherwise as a name bound to it in
+    `namespace`.
+
+    """
+
+    if type(value) is int or (type(value) is float and math.isfinite(value)):
+        return repr(value)
+
+    namespace[name] = value
+
+    return name
+
+
+def _generate_decode(fields: Sequence[Union["Signal", "Data"]],
+                     expected_length: int,
+                     formats: Formats) -> Optional[DecodeFunction]:
+    namespace: Dict[str, Any] = {
+        '_decode_data': decode_data,
+        '_fields': fields,
+        '_formats': formats,
+        '_from_bytes': int.from_bytes
+    }
+    extract_lines: List[str] = []
+    uses_big = False
+    uses_little = False
+
+    for i, field in enumerate(fields):
+        shift = field_shift(field, expected_length)
+
+        if shift is None:
+            return None
+
+        if field.byte_order == 'little_endian':
+            source = 'little'
+            uses_little = True
+        else:
+            source = 'big'
+            uses_big = True
+
+        if shift > 0:
+            source = f'({source} >> {shift})'
+
+        mask = (1 << field.length) - 1
+        value = f'({source} & 0x{mask:x})'
+
+        if field.is_float:
+            fmt = FLOAT_FORMATS.get(field.length)
+
+            if fmt is None:
+                return None
+
+            namespace[f'_unpack{i}'] = struct.Struct(fmt).unpack
+            value = f'_unpack{i}({value}.to_bytes({field.length // 8}, "big"))[0]'
+        elif field.is_signed:
+            sign_bit = 1 << (field.length - 1)
+            value = f'(({value} ^ 0x{sign_bit:x}) - 0x{sign_bit:x})'
+
+        extract_lines.append(f'    r{i} = {value}')
+
+    scaled_items = []
+    raw_items = []
+    choices_lines = []
+
+    for i, field in enumerate(fields):
+        name = repr(field.name)
+        raw_items.append(f'{name}: r{i}')
+
+        if type(field.scale) is int \
+           and type(field.offset) is int \
+           and field.scale == 1 \
+           and field.offset == 0:
+            scaled_items.append(f'{name}: r{i}')
+        else:
+            scale = source_literal(field.scale, f'_scale{i}', namespace)
+            offset = source_literal(field.offset, f'_offset{i}', namespace)
+            scaled_items.append(f'{name}: {scale} * r{i} + {offset}')
+
+        if field.choices is not None:
+            namespace[f'_choices{i}'] = field.choices
+            choices_lines += [
+                f'        choice = _choices{i}.get(r{i})',
+                '        if choice is not None:',
+                f'            decoded[{name}] = choice'
+            ]
+
+    lines = [
+        'def decode(data, decode_choices, scaling, allow_truncated):',
+        f'    if len(data) != {expected_length}:',
+        '        return _decode_data(data,',
+        f'                            {expected_length},',
+        '                            _fields,',
+        '                            _formats,',
+        '                            decode_choices,',
+        '                            scaling,',
+        '                            allow_truncated)'
+    ]
+
+    if uses_big:
+        lines.append('    big = _from_bytes(data, "big")')
+
+    if uses_little:
+        lines.append('    little = _from_bytes(data, "little")')
+
+    lines += extract_lines
+    lines += [
+        '    if scaling:',
+        '        decoded = {' + ', '.join(scaled_items) + '}',
+        '    else:',
+        '        decoded = {' + ', '.join(raw_items) + '}'
+    ]
+
+    if choices_lines:
+        lines.append('    if decode_choices:')
+        lines += choices_lines
+
+    lines.append('    return decoded')
+    exec(compile('\n'.join(lines), '<cantools compiled decoder>', 'exec'),
+         namespace)
+
+    return cast(DecodeFunction, namespace['decode'])
+
+
+class CompiledDecoder(object):
+    """Decoder of a codec node generated as straight-line Python code.
+
+    Each field is extracted with a shift and a mask from the payload
+    converted to an integer, with the scale, offset and choices
+    inlined. Payloads of unexpected length are decoded by
+    :func:`~cantools.database.utils.decode_data()`.
+
+    """
+
+    def __init__(self,
+                 fields: Sequence[Union["Signal", "Data"]],
+                 expected_length: int,
+                 formats: Formats) -> None:
+        self._fields = fields
+        self._expected_length = expected_length
+        self._formats = formats
+        decode = _generate_decode(fields, expected_length, formats)
+
+        if decode is None:
+            decode = self._decode_data
+
+        #: The decode function called as ``decode(data, decode_choices,
+        #: scaling, allow_truncated)``.
+        self.decode: DecodeFunction = decode
+
+    def _decode_data(self,
+                     data: BytesLike,
+                     decode_choices: bool,
+                     scaling: bool,
+                     allow_truncated: bool) -> SignalDictType:
+        return decode_data(data,
+                           self._expected_length,
+                           self._fields,
+                           self._formats,
+                           decode_choices,
+                           scaling,
+                           allow_truncated)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Generated functions cannot be pickled, so the decoder is
+        # generated again when unpickled.
+        return (CompiledDecoder,
+                (self._fields, self._expected_length, self._formats))
+
+
+#: An entry of a field table, see create_field_table().
+FieldTableEntry = Tuple[str,
+                        bool,
+                        int,
+                        int,
+                        int,
+                        Optional[Callable[[bytes], Tuple[float]]],
+                        int,
+                        bool,
+                        Any,
+                        Any,
+                        Optional[Callable[[Any], Optional[ChoiceValueType]]]]
+
+
+def create_field_table(fields: Sequence[Union["Signal", "Data"]],
+                       expected_length: int) -> Optional[List[FieldTableEntry]]:
+    """Create a table of given fields for extracting them from payloads
+    of `expected_length` bytes, or ``None`` if any field cannot be
+    extracted with a shift and a mask.
+
+    Each entry is a tuple of the field name, the fields of its
+    :class:`FieldExtractor`, whether its scale and offset are the
+    identity transform, its scale, its offset and the lookup of its
+    choices, which returns ``None`` for raw values without a choice.
+
+    """
+
+    table = []
+
+    for field in fields:
+        extractor = create_field_extractor(field, expected_length)
+
+        if extractor is None:
+            return None
+
+        # Scale and offset of the identity transform are skipped to
+        # keep raw integers as integers, just as decode_data() does.
+        is_identity = (type(field.scale) is int
+                       and type(field.offset) is int
+                       and field.scale == 1
+                       and field.offset == 0)
+        lookup_choice: Optional[Callable[[Any], Optional[ChoiceValueType]]] = None
+
+        if field.choices is not None:
+            lookup_choice = field.choices.get
+
+        table.append((field.name,
+                      *extractor,
+                      is_identity,
+                      field.scale,
+                      field.offset,
+                      lookup_choice))
+
+    return table
+
+
+def create_decoder(codec_engine: str,
+                   fields: Sequence[Union["Signal", "Data"]],
+                   expected_length: int,
+                   formats: Formats) -> Optional[CompiledDecoder]:
+    """Create a decoder of given fields for given codec engine, or
+    ``None`` if the fields shall be decoded by
+    :func:`~cantools.database.utils.decode_data()`. Overlapping fields
+    are always decoded by it, to raise the same error for all engines.
+
+    """
+
+    if not formats_fit(formats, expected_length):
+        return None
+
+    if codec_engine == 'compiled':
+        return CompiledDecoder(fields, expected_length, formats)
+
+    return None
@@ -1,6 +1,7 @@
 # Utility functions.
 
 from collections import OrderedDict
+import math
 import os.path
 import re
 from typing import Union, List, Callable, Tuple, Optional, Dict, Sequence, TYPE_CHECKING
@@ -8,8 +9,13 @@ from typing import Union, List, Callable, Tuple, Optional, Dict, Sequence, TYPE_
 from typing_extensions import Literal, Final
 
 from ..typechecking import (
+    BytesLike,
+    ChoiceTable,
+    FieldBounds,
     Formats,
+    Limits,
     Choices,
+    ChoiceValueType,
     SignalMappingType,
     SignalDictType,
     ByteOrder,
@@ -99,7 +105,28 @@ def encode_data(data: SignalMappingType,
     return packed_union
 
 
-def decode_data(data: bytes,
+def data_view(data: BytesLike,
+              offset: int = 0,
+              length: Optional[int] = None) -> BytesLike:
+    """Returns `length` bytes of given buffer starting at `offset`. Any
+    object supporting the buffer protocol may be given. No data is
+    copied, i.e. a ``memoryview`` is returned if `offset` or `length`
+    is given.
+
+    """
+
+    if offset == 0 and length is None:
+        return data
+
+    view = memoryview(data).cast('B')
+
+    if length is None:
+        return view[offset:]
+
+    return view[offset:offset + length]
+
+
+def decode_data(data: BytesLike,
                 expected_length: int,
                 fields: Sequence[Union["Signal", "Data"]],
                 formats: Formats,
@@ -110,11 +137,18 @@ def decode_data(data: bytes,
 
     actual_length = len(data)
     if allow_truncated and actual_length < expected_length:
-        data = data.ljust(expected_length, b"\xFF")
+        data = bytes(data).ljust(expected_length, b"\xFF")
+
+    # The little endian fields are unpacked from the reversed data,
+    # which is a copy. bitstruct only accepts contiguous buffers.
+    reversed_data = data[::-1]
+
+    if isinstance(reversed_data, memoryview):
+        reversed_data = reversed_data.tobytes()
 
     unpacked = {
-        **formats.big_endian.unpack(bytes(data)),
-        **formats.little_endian.unpack(bytes(data[::-1])),
+        **formats.big_endian.unpack(data),
+        **formats.little_endian.unpack(reversed_data),
     }
 
     if allow_truncated and actual_length < expected_length:
@@ -132,17 +166,20 @@ def decode_data(data: bytes,
             if sequential_startbit + field.length > valid_bit_count:
                 del unpacked[field.name]
 
-    decoded = {}
+    # The choice tables are looked up by name, as the order of given
+    # fields may differ from the order the formats were created in.
+    choice_tables = formats.choice_tables
+    decoded: SignalDictType = {}
     for field in fields:
         try:
             value = unpacked[field.name]
 
-            if decode_choices:
-                try:
-                    decoded[field.name] = field.choices[value]  # type: ignore[index]
+            if decode_choices and field.name in choice_tables:
+                choice = choice_tables[field.name].lookup(value)
+
+                if choice is not None:
+                    decoded[field.name] = choice
                     continue
-                except (KeyError, TypeError):
-                    pass
 
             if scaling:
                 decoded[field.name] = field.scale * value + field.offset
@@ -157,6 +194,42 @@ def decode_data(data: bytes,
     return decoded
 
 
+#: The largest range of raw values of choices stored in a list.
+DENSE_CHOICES_MAX_LENGTH = 256
+
+
+def create_choice_table(choices: Optional[Choices]) -> Optional[ChoiceTable]:
+    """Create the lookup table of given choices, or ``None`` if there
+    are no choices.
+
+    Raw values are looked up in the choices dictionary itself, which
+    returns ``None`` instead of raising an exception for values
+    without a choice. Choices of small, mostly contiguous ranges of
+    raw values are also stored in a list indexed by the raw value
+    minus the smallest one, with ``None`` for the gaps, for lookups
+    of many values at once. The choice objects are shared with the
+    choices dictionary.
+
+    """
+
+    if not choices:
+        return None
+
+    minimum = min(choices)
+    length = max(choices) - minimum + 1
+    dense: Optional[List[Optional[ChoiceValueType]]] = None
+
+    if all(type(value) is int for value in choices) \
+       and length <= DENSE_CHOICES_MAX_LENGTH \
+       and 2 * len(choices) >= length:
+        dense = [None] * length
+
+        for value, choice in choices.items():
+            dense[value - minimum] = choice
+
+    return ChoiceTable(choices.get, minimum, dense)
+
+
 def create_encode_decode_formats(datas: Sequence[Union["Data", "Signal"]], number_of_bytes: int) -> Formats:
     format_length = (8 * number_of_bytes)
 
@@ -260,9 +333,70 @@ def create_encode_decode_formats(datas: Sequence[Union["Data", "Signal"]], numbe
     except Exception as e:
         little_compiled = bitstruct.compile(little_fmt, little_names)
 
+    choice_tables = {}
+
+    for data in datas:
+        choice_table = create_choice_table(data.choices)
+
+        if choice_table is not None:
+            choice_tables[data.name] = choice_table
+
     return Formats(big_compiled,
                    little_compiled,
-                   big_padding_mask & little_padding_mask)
+                   big_padding_mask & little_padding_mask,
+                   choice_tables)
+
+
+def formats_fit(formats: Formats, number_of_bytes: int) -> bool:
+    """Returns ``True`` if given formats fit in `number_of_bytes` bytes.
+    Formats of overlapping fields, only allowed if the database was
+    loaded with `strict` set to ``False``, do not fit, and unpacking
+    them raises an error.
+
+    """
+
+    format_length = 8 * number_of_bytes
+
+    big_length: int = formats.big_endian.calcsize()
+    little_length: int = formats.little_endian.calcsize()
+
+    return big_length <= format_length and little_length <= format_length
+
+
+def _create_limits(minimum: Optional[float],
+                   maximum: Optional[float],
+                   tolerance: float) -> Limits:
+    return Limits(minimum,
+                  maximum,
+                  -math.inf if minimum is None else minimum - tolerance,
+                  math.inf if maximum is None else maximum + tolerance)
+
+
+def create_field_bounds(field: Union["Signal", "Data"]) -> FieldBounds:
+    """Create the bounds of given field's physical and raw values, used
+    to validate values before encoding. The minimum and maximum are
+    reported in errors, while values below the lower and above the
+    upper limit are invalid.
+
+    """
+
+    minimum = field.minimum
+    maximum = field.maximum
+    tolerance = abs(field.scale) * 1e-6
+    physical = _create_limits(minimum, maximum, tolerance)
+
+    # Undo the scaling of the minimum and maximum values, swapping
+    # them for negative scales.
+    if minimum is not None:
+        minimum = (minimum - field.offset) / field.scale
+
+    if maximum is not None:
+        maximum = (maximum - field.offset) / field.scale
+
+    if field.scale < 0:
+        minimum, maximum = maximum, minimum
+
+    return FieldBounds(physical, _create_limits(minimum, maximum, tolerance))
 
 
 def sawtooth_to_network_bitnum(sawtooth_bitnum: int) -> int:
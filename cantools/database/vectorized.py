@@ -0,0 +1,528 @@
+# Vectorized (columnar) encoding and decoding using NumPy.
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .can.signal import NamedSignalValue
+from .errors import DecodeError
+from .errors import EncodeError
+from .errors import Error
+from .utils import format_and
+from .utils import sawtooth_to_network_bitnum
+from ..typechecking import ChoiceTable
+from ..typechecking import Limits
+
+if TYPE_CHECKING:
+    from .can.signal import Signal
+    from .diagnostics import Data
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+class NumpyNotInstalledError(Error):
+
+    def __init__(self) -> None:
+        super().__init__("The numpy package is not installed and is required "
+                         "for batch encoding and decoding.")
+
+
+def assert_numpy_available() -> None:
+    if np is None:
+        raise NumpyNotInstalledError()
+
+
+def payload_matrix(payloads: Any,
+                   expected_length: int) -> Tuple[Any, Any]:
+    """Convert given payloads to a 2-D ``uint8`` array with one row per
+    frame and a 1-D array with the number of valid bytes of each
+    row.
+
+    `payloads` is either a 2-D array-like of bytes or a sequence of
+    bytes-like objects. Payloads longer than `expected_length` are
+    truncated, while shorter ones are padded with ``0xff``.
+
+    """
+
+    assert_numpy_available()
+
+    if isinstance(payloads, np.ndarray) and payloads.ndim == 2:
+        matrix = payloads.astype(np.uint8, copy=False)[:, :expected_length]
+        lengths = np.full(len(matrix), matrix.shape[1], dtype=np.intp)
+    else:
+        payloads = [bytes(payload[:expected_length]) for payload in payloads]
+        lengths = np.fromiter((len(payload) for payload in payloads),
+                              dtype=np.intp,
+                              count=len(payloads))
+        joined = b''.join([payload.ljust(expected_length, b'\xff')
+                           for payload in payloads])
+        matrix = np.frombuffer(joined, dtype=np.uint8)
+        matrix = matrix.reshape(len(payloads), expected_length)
+
+    if matrix.shape[1] < expected_length:
+        padding = np.full((len(matrix), expected_length - matrix.shape[1]),
+                          0xff,
+                          dtype=np.uint8)
+        matrix = np.hstack((matrix, padding))
+
+    return matrix, lengths
+
+
+def _field_byte_span(field: Union["Signal", "Data"]) -> Tuple[int, int, int]:
+    """Returns the first and last byte index of given field and the bit
+    position of the field's least significant bit relative to the
+    least significant bit of its first (little endian) or last (big
+    endian) byte.
+
+    """
+
+    if field.byte_order == 'little_endian':
+        first = field.start // 8
+        last = (field.start + field.length - 1) // 8
+
+        return first, last, field.start % 8
+    else:
+        msb = sawtooth_to_network_bitnum(field.start)
+        lsb = msb + field.length - 1
+
+        return msb // 8, lsb // 8, 7 - lsb % 8
+
+
+def field_end(field: Union["Signal", "Data"]) -> int:
+    """The number of bytes required to hold given field.
+
+    """
+
+    return _field_byte_span(field)[1] + 1
+
+
+def extract_raw(matrix: Any, field: Union["Signal", "Data"]) -> Any:
+    """Extract the raw values of given field from each row of the payload
+    matrix `matrix`.
+
+    Integers are returned as ``int64`` arrays (``uint64`` for
+    unsigned 64 bit fields) and floats as ``float64`` arrays.
+
+    """
+
+    if field.length > 64:
+        raise DecodeError(f'Batch decoding of fields longer than 64 bits is '
+                          f'not supported (field "{field.name}").')
+
+    first, last, bit_offset = _field_byte_span(field)
+
+    if last >= matrix.shape[1]:
+        raise DecodeError(f'Field "{field.name}" does not fit in '
+                          f'{matrix.shape[1]} bytes of data.')
+
+    value = np.zeros(len(matrix), dtype=np.uint64)
+
+    for index in range(first, last + 1):
+        if field.byte_order == 'little_endian':
+            shift = 8 * (index - first) - bit_offset
+        else:
+            shift = 8 * (last - index) - bit_offset
+
+        column = matrix[:, index].astype(np.uint64)
+
+        if shift >= 0:
+            value |= column << np.uint64(shift)
+        else:
+            value |= column >> np.uint64(-shift)
+
+    if field.length < 64:
+        value &= np.uint64((1 << field.length) - 1)
+
+    if field.is_float:
+        if field.length == 16:
+            return value.astype(np.uint16).view(np.float16).astype(np.float64)
+        elif field.length == 32:
+            return value.astype(np.uint32).view(np.float32).astype(np.float64)
+        else:
+            return value.view(np.float64)
+    elif field.is_signed:
+        if field.length == 64:
+            return value.view(np.int64)
+
+        sign_bit = 1 << (field.length - 1)
+
+        return (value.astype(np.int64) ^ sign_bit) - sign_bit
+    elif field.length == 64:
+        return value
+
+    return value.astype(np.int64)
+
+
+def scale_raw(field: Union["Signal", "Data"],
+              raw: Any,
+              choice_table: Optional[ChoiceTable],
+              decode_choices: bool,
+              scaling: bool) -> Any:
+    """Apply given choice table and scaling to the raw values of given
+    field the same way as :func:`~cantools.database.utils.decode_data()`
+    does for a single frame.
+
+    """
+
+    if scaling:
+        value = field.scale * raw + field.offset
+    else:
+        value = raw
+
+    if not decode_choices or choice_table is None:
+        return value
+
+    dense = choice_table.dense
+
+    if dense is not None and raw.dtype.kind in 'iu':
+        # Index the list of choices with the raw values. Values out
+        # of its range index an extra entry without a choice.
+        length = len(dense)
+        lookup = np.empty(length + 1, dtype=object)
+        has_choice = np.zeros(length + 1, dtype=bool)
+
+        for i, choice in enumerate(dense):
+            lookup[i] = choice
+            has_choice[i] = choice is not None
+
+        index = raw.astype(np.int64) - choice_table.minimum
+        index[(index < 0) | (index >= length)] = length
+        is_choice = has_choice[index]
+        value = np.asarray(value).astype(object)
+        value[is_choice] = lookup[index[is_choice]]
+
+        return value
+
+    # Look up the choices once per distinct raw value instead of once
+    # per row.
+    unique, inverse = np.unique(raw, return_inverse=True)
+    unique_values = (field.scale * unique + field.offset) if scaling else unique
+    lookup = np.empty(len(unique), dtype=object)
+
+    for i, (raw_value, value) in enumerate(zip(unique.tolist(),
+                                               unique_values.tolist())):
+        choice = choice_table.lookup(raw_value)
+        lookup[i] = value if choice is None else choice
+
+    return lookup[inverse.reshape(-1)]
+
+
+def decode_batch_data(matrix: Any,
+                      lengths: Any,
+                      expected_length: int,
+                      fields: Sequence[Union["Signal", "Data"]],
+                      choice_tables: Dict[str, ChoiceTable],
+                      decode_choices: bool,
+                      scaling: bool,
+                      allow_truncated: bool,
+                      ) -> Dict[str, Any]:
+    """Vectorized counterpart of
+    :func:`~cantools.database.utils.decode_data()`.
+
+    `choice_tables` is a dictionary of field name to choice table, as
+    created by :func:`~cantools.database.utils.create_choice_table()`.
+
+    Returns a dictionary of field name to NumPy array. If
+    `allow_truncated` is ``True``, fields not fully contained in the
+    payload of some rows are returned as masked arrays, and fields
+    not contained in any row are omitted.
+
+    """
+
+    truncated = bool((lengths < expected_length).any())
+
+    if truncated and not allow_truncated:
+        raise DecodeError(f'Expected {expected_length} bytes of data, but '
+                          f'got at least one payload of '
+                          f'{int(lengths.min())} bytes.')
+
+    decoded = {}
+
+    for field in fields:
+        # Payloads of float fields may be NaNs, which are decoded as
+        # NaNs without warnings, just as decode_data() does.
+        with np.errstate(invalid='ignore'):
+            raw = extract_raw(matrix, field)
+            value = scale_raw(field,
+                              raw,
+                              choice_tables.get(field.name),
+                              decode_choices,
+                              scaling)
+
+        if truncated:
+            available = lengths >= field_end(field)
+
+            if not available.any():
+                continue
+            elif not available.all():
+                value = np.ma.masked_array(value, mask=~available)
+
+        decoded[field.name] = value
+
+    return decoded
+
+
+def mask_inactive(value: Any, active: Optional[Any]) -> Any:
+    """Mask all rows of `value` where `active` is ``False``.
+
+    """
+
+    if active is None or active.all():
+        return value
+
+    if isinstance(value, np.ma.MaskedArray):
+        return np.ma.masked_array(value.data,
+                                  mask=np.ma.getmaskarray(value) | ~active)
+
+    return np.ma.masked_array(value, mask=~active)
+
+
+def _as_array(values: Any) -> Any:
+    """Convert given values to a NumPy array. Python integers not
+    fitting in a common signed type are converted to ``uint64``
+    instead of losing precision as ``float64``.
+
+    """
+
+    array = np.asanyarray(values)
+
+    if array.dtype.kind in 'fO' \
+       and not isinstance(values, np.ndarray) \
+       and len(array) > 0 \
+       and all(type(value) is int for value in values):
+        try:
+            array = np.array(values, dtype=np.uint64)
+        except OverflowError:
+            pass
+
+    return array
+
+
+def column_arrays(columns: Any) -> Tuple[Dict[str, Any], int]:
+    """Convert given columns to a dictionary of field name to 1-D NumPy
+    array and return it along with the number of rows.
+
+    `columns` is either a mapping of field name to array-like or a
+    structured array with one field per column.
+
+    """
+
+    assert_numpy_available()
+
+    if isinstance(columns, np.ndarray) and columns.dtype.names is not None:
+        arrays = {name: columns[name] for name in columns.dtype.names}
+    else:
+        arrays = {name: _as_array(column) for name, column in columns.items()}
+
+    lengths = {len(array) for array in arrays.values()}
+
+    if len(lengths) > 1:
+        raise EncodeError(f'Expected columns of equal length, but got '
+                          f'{format_and(sorted(lengths))}.')
+
+    return arrays, lengths.pop() if lengths else 0
+
+
+def _choice_number(field: Union["Signal", "Data"], value: Any) -> int:
+    return field.choice_string_to_number(str(value))
+
+
+def split_column(field: Union["Signal", "Data"],
+                 column: Any) -> Tuple[Any, Any, Any]:
+    """Split given column of physical or raw values and choices into an
+    array of numbers, an array of choice raw values and a mask of
+    the rows holding choices. The numbers of rows holding choices are
+    zero.
+
+    """
+
+    if column.dtype.kind in 'US':
+        unique, inverse = np.unique(column, return_inverse=True)
+        lookup = np.array([_choice_number(field, value) for value in unique],
+                          dtype=np.int64)
+        is_choice = np.ones(len(column), dtype=bool)
+
+        return (np.zeros(len(column), dtype=np.int64),
+                lookup[inverse.reshape(-1)],
+                is_choice)
+    elif column.dtype.kind == 'O':
+        is_choice = np.array([isinstance(value, (str, NamedSignalValue))
+                              for value in column],
+                             dtype=bool)
+        choices = np.zeros(len(column), dtype=np.int64)
+
+        if is_choice.any():
+            cache: Dict[str, int] = {}
+
+            for row in np.flatnonzero(is_choice):
+                name = str(column[row])
+
+                if name not in cache:
+                    cache[name] = _choice_number(field, name)
+
+                choices[row] = cache[name]
+
+        # Let NumPy find a common type of the numbers to keep integers
+        # exact.
+        numbers = _as_array([0 if choice else value
+                             for value, choice in zip(column.tolist(),
+                                                      is_choice.tolist())])
+
+        if numbers.dtype.kind not in 'iuf':
+            numbers = numbers.astype(np.float64)
+
+        return numbers, choices, is_choice
+
+    return (np.ma.getdata(column),
+            np.zeros(len(column), dtype=np.int64),
+            np.zeros(len(column), dtype=bool))
+
+
+def physical_to_raw(field: Union["Signal", "Data"],
+                    numbers: Any,
+                    choices: Any,
+                    is_choice: Any,
+                    scaling: bool) -> Any:
+    """Convert given numbers and choices to raw values the same way as
+    ``encode_data()`` does for a single frame. Floats are returned
+    as ``float64`` arrays and integers as ``int64`` arrays
+    (``uint64`` for unsigned 64 bit fields).
+
+    """
+
+    if scaling and not (field.offset == 0 and field.scale == 1):
+        numbers = (numbers - field.offset) / field.scale
+
+    if field.is_float:
+        raw = numbers.astype(np.float64)
+    else:
+        if numbers.dtype.kind == 'f':
+            numbers = np.rint(numbers)
+
+        # Numbers out of the range of the integer type are reported by
+        # raw_to_bits() as out of the range of the field.
+        with np.errstate(invalid='ignore'):
+            if not field.is_signed and field.length == 64:
+                raw = numbers.astype(np.uint64)
+            else:
+                raw = numbers.astype(np.int64)
+
+    if is_choice.any():
+        raw = np.where(is_choice, choices.astype(raw.dtype), raw)
+
+    return raw
+
+
+def raw_to_bits(field: Union["Signal", "Data"],
+                raw: Any,
+                row_numbers: Any) -> Any:
+    """Convert given raw values to an ``uint64`` array of the bits of
+    given field. Raises ``EncodeError`` if an integer does not fit in
+    the field. `row_numbers` are the row numbers of the values,
+    reported in errors.
+
+    """
+
+    if field.is_float:
+        if field.length == 16:
+            return raw.astype(np.float16).view(np.uint16).astype(np.uint64)
+        elif field.length == 32:
+            return raw.astype(np.float32).view(np.uint32).astype(np.uint64)
+        elif field.length == 64:
+            return raw.astype(np.float64).view(np.uint64)
+
+        raise EncodeError(f'Batch encoding of {field.length} bits floats is '
+                          f'not supported (field "{field.name}").')
+
+    if field.length > 64:
+        raise EncodeError(f'Batch encoding of fields longer than 64 bits is '
+                          f'not supported (field "{field.name}").')
+
+    if field.length < 64:
+        if field.is_signed:
+            minimum = -(1 << (field.length - 1))
+            maximum = (1 << (field.length - 1)) - 1
+        else:
+            minimum = 0
+            maximum = (1 << field.length) - 1
+
+        invalid = (raw < minimum) | (raw > maximum)
+
+        if invalid.any():
+            raise EncodeError(
+                f'Field "{field.name}" raw value out of range in rows '
+                f'{format_and(row_numbers[invalid].tolist())}.')
+
+    bits = raw.view(np.uint64) if raw.dtype == np.int64 else raw
+
+    if field.length < 64:
+        bits = bits & np.uint64((1 << field.length) - 1)
+
+    return bits
+
+
+def insert_bits(matrix: Any, field: Union["Signal", "Data"], bits: Any) -> None:
+    """Insert the bits of given field in each row of the payload matrix
+    `matrix`. This is the inverse of :func:`extract_raw()`.
+
+    """
+
+    first, last, bit_offset = _field_byte_span(field)
+
+    if last >= matrix.shape[1]:
+        raise EncodeError(f'Field "{field.name}" does not fit in '
+                          f'{matrix.shape[1]} bytes of data.')
+
+    for index in range(first, last + 1):
+        if field.byte_order == 'little_endian':
+            shift = 8 * (index - first) - bit_offset
+        else:
+            shift = 8 * (last - index) - bit_offset
+
+        if shift >= 0:
+            column = bits >> np.uint64(shift)
+        else:
+            column = bits << np.uint64(-shift)
+
+        matrix[:, index] |= (column & np.uint64(0xff)).astype(np.uint8)
+
+
+def out_of_range(limits: Limits, numbers: Any) -> Any:
+    """Returns a mask of given numbers outside given limits.
+
+    """
+
+    return (numbers < limits.lower) | (numbers > limits.upper)
+
+
+def assert_in_range(field: Union["Signal", "Data"],
+                    limits: Limits,
+                    numbers: Any,
+                    row_numbers: Any) -> None:
+    """Raise ``EncodeError`` if any of given numbers is outside given
+    limits of given field, the same way as ``Message.encode()`` does
+    for a single frame in strict mode. `row_numbers` are the row
+    numbers of the numbers, reported in errors.
+
+    """
+
+    for invalid, text, limit in [(numbers < limits.lower,
+                                  'greater than',
+                                  limits.minimum),
+                                 (numbers > limits.upper,
+                                  'less than',
+                                  limits.maximum)]:
+        if invalid.any():
+            raise EncodeError(
+                f'Expected signal "{field.name}" value {text} or equal to '
+                f'{limit}, but got {numbers[invalid][0]} in rows '
+                f'{format_and(row_numbers[invalid].tolist())}.')
@@ -417,6 +417,7 @@ class Plotter:
         self.x_invalid_syntax = []
         self.x_unknown_frames = []
         self.x_invalid_data = []
+        self.decoders = {}
 
     # ------- while reading data -------
 
@@ -431,7 +432,7 @@ class Plotter:
             return
 
         try:
-            decoded_signals = message.decode(data, self.decode_choices)
+            decoded_signals = self.get_decoder(message)(data, self.decode_choices)
         except Exception as e:
             if self.show_invalid_data:
                 self.x_invalid_data.append(timestamp)
@@ -447,6 +448,27 @@ class Plotter:
             signal = message.name + '.' + signal
             self.signals.add_value(signal, x, y)
 
+    def get_decoder(self, message):
+        '''
+        Returns a function decoding only the signals of given message
+        which are displayed.
+        '''
+        decoder = self.decoders.get(message.frame_id)
+
+        if decoder is None:
+            if message.is_container:
+                decoder = message.decode
+            else:
+                decoder = message.make_decoder([
+                    signal.name
+                    for signal in message.signals
+                    if self.signals.is_displayed_signal(message.name + '.' + signal.name)
+                ])
+
+            self.decoders[message.frame_id] = decoder
+
+        return decoder
+
     def failed_to_parse_line(self, timestamp, line):
         if self.show_invalid_syntax:
             self.x_invalid_syntax.append(timestamp)
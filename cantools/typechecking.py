@@ -20,27 +20,52 @@ if TYPE_CHECKING:
     import sys
     from .database import Signal, Message
     from .database.can.signal import NamedSignalValue
+    from .database.engines import CompiledDecoder
+
+
+ChoiceValueType = Union[str, "NamedSignalValue"]
+
+
+class ChoiceTable(NamedTuple):
+    lookup: Callable[[Any], Optional[ChoiceValueType]]
+    minimum: int
+    dense: Optional[List[Optional[ChoiceValueType]]]
 
 
 class Formats(NamedTuple):
     big_endian: CompiledFormatDict
     little_endian: CompiledFormatDict
     padding_mask: int
+    choice_tables: Dict[str, ChoiceTable]
+
+
+class Limits(NamedTuple):
+    minimum: Optional[float]
+    maximum: Optional[float]
+    lower: float
+    upper: float
+
+
+class FieldBounds(NamedTuple):
+    physical: Limits
+    raw: Limits
 
 
 StringPathLike = Union[str, "os.PathLike[str]"]
+BytesLike = Union[bytes, bytearray, memoryview]
 Comments = Dict[Optional[str], str]
 Codec = TypedDict(
     "Codec",
     {
         "signals": List["Signal"],
         "formats": Formats,
+        "decoder": Optional["CompiledDecoder"],
         "multiplexers": Mapping[str, Mapping[int, Any]],  # "Any" should be "Codec" (cyclic definition is not possible though)
     },
 )
 
 ByteOrder = Literal["little_endian", "big_endian"]
-Choices = OrderedDict[int, Union[str, "NamedSignalValue"]]
+Choices = OrderedDict[int, ChoiceValueType]
 
 # Type aliases. Introduced to reduce type annotation complexity while
 # allowing for more complex encode/decode schemes like the one used
@@ -49,13 +74,13 @@ SignalValueType = Union[float, str, "NamedSignalValue"]
 SignalDictType = Dict[str, SignalValueType]
 SignalMappingType = Mapping[str, SignalValueType]
 ContainerHeaderSpecType = Union["Message", str, int]
-ContainerUnpackResultType = Sequence[Union[Tuple["Message", bytes], Tuple[int, bytes]]]
-ContainerUnpackListType = List[Union[Tuple["Message", bytes], Tuple[int, bytes]]]
+ContainerUnpackResultType = Sequence[Union[Tuple["Message", BytesLike], Tuple[int, BytesLike]]]
+ContainerUnpackListType = List[Union[Tuple["Message", BytesLike], Tuple[int, BytesLike]]]
 ContainerDecodeResultType = Sequence[
-    Union[Tuple["Message", SignalMappingType], Tuple[int, bytes]]
+    Union[Tuple["Message", SignalMappingType], Tuple[int, BytesLike]]
 ]
 ContainerDecodeResultListType = List[
-    Union[Tuple["Message", SignalDictType], Tuple[int, bytes]]
+    Union[Tuple["Message", SignalDictType], Tuple[int, BytesLike]]
 ]
 ContainerEncodeInputType = Sequence[
     Tuple[ContainerHeaderSpecType, Union[bytes, SignalMappingType]]
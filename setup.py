@@ -38,6 +38,7 @@ setup(name='cantools',
       ],
       extras_require={
           'plot': ['matplotlib'],
+          'numpy': ['numpy'],
           'windows-all': ["windows-curses;platform_system=='Windows'"],
       },
       test_suite="tests",
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import glob
 import sys
 import math
+import pickle
 import unittest
+import warnings
 from decimal import Decimal
+from collections import deque
 from collections import namedtuple
+from copy import deepcopy
 import textparser
 import os
 import re
@@ -14,6 +19,8 @@ import logging
 from xml.etree import ElementTree
 import timeit
 
+import numpy as np
+
 import cantools.autosar
 from cantools.database.utils import prune_signal_choices, sort_choices_by_value, sort_signals_by_name
 
@@ -1094,6 +1101,241 @@ class CanToolsDatabaseTest(unittest.TestCase):
                          b'\n\x0b\x0c\t{\x00\xc8\x01\x04V\x0eI@\n\x0b\x0c\t'
                          b'\xa0\xa1\xa2\xa3\xa4\xa5\xa6\xa7\xa8')
 
+    def test_iter_container(self):
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        db_msg = db.get_message_by_name('OneToContainThemAll')
+        message1 = db_msg.get_contained_message_by_name('message1')
+
+        self.assertEqual(message1.name, 'message1')
+        self.assertIs(
+            db_msg.get_contained_message_by_header_id(message1.header_id),
+            message1)
+        self.assertIsNone(db_msg.get_contained_message_by_name('Foo'))
+        self.assertIsNone(db_msg.get_contained_message_by_header_id(0xddeeff))
+
+        encoded = db_msg.encode([
+            (
+                'message1',
+                {
+                    'message1_SeqCounter': 123,
+                    'message1_CRC': 456,
+                    'signal6': 'zero',
+                    'signal1': 5.2,
+                    'signal5': 3.1415
+                }
+            ),
+            (0xddeeff, b'\xa0\xa1\xa2\xa3\xa4')
+        ])
+        buf = bytearray(b'\x00\x00' + encoded)
+        unpacked = list(db_msg.iter_container(buf, offset=2))
+
+        self.assertEqual(unpacked, db_msg.unpack_container(encoded))
+        self.assertIs(unpacked[0][0], message1)
+        self.assertEqual(unpacked[1][0], 0xddeeff)
+
+        for _, contained_data in unpacked:
+            self.assertIsInstance(contained_data, memoryview)
+            self.assertIs(contained_data.obj, buf)
+
+        self.assertIsInstance(next(db_msg.iter_container(encoded))[1],
+                              memoryview)
+
+        # Errors are raised when iterating.
+        unpacked = db_msg.iter_container(encoded[:-1])
+        next(unpacked)
+
+        with self.assertRaises(cantools.database.DecodeError):
+            next(unpacked)
+
+        unpacked = db_msg.iter_container(encoded[:-1], allow_truncated=True)
+        self.assertEqual(list(unpacked)[1], (0xddeeff, b'\xa0\xa1\xa2\xa3'))
+
+        # Except for invalid payloads.
+        with self.assertRaises(cantools.database.DecodeError):
+            db_msg.iter_container(encoded + bytes(db_msg.length))
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message1.iter_container(encoded)
+
+        # Lookups with multiple contained messages of the same header
+        # id or name fail.
+        container = cantools.database.can.Message(
+            frame_id=1,
+            name='Container',
+            length=64,
+            signals=[],
+            contained_messages=[
+                cantools.database.can.Message(frame_id=2,
+                                              name='Foo',
+                                              length=1,
+                                              signals=[],
+                                              header_id=5),
+                cantools.database.can.Message(frame_id=3,
+                                              name='Foo',
+                                              length=1,
+                                              signals=[],
+                                              header_id=5)
+            ])
+
+        with self.assertRaises(cantools.database.Error):
+            container.get_contained_message_by_header_id(5)
+
+        with self.assertRaises(cantools.database.Error):
+            container.get_contained_message_by_name('Foo')
+
+        with self.assertRaises(cantools.database.Error):
+            list(container.iter_container(b'\x00\x00\x05\x01\x00'))
+
+        # Contained messages are found by their current header id.
+        foo = container.contained_messages[0]
+        foo.header_id = 6
+        self.assertIs(container.get_contained_message_by_header_id(6), foo)
+        self.assertEqual(list(container.iter_container(b'\x00\x00\x06\x01\x00')),
+                         [(foo, b'\x00')])
+        self.assertIs(container.get_contained_message_by_header_id(5),
+                      container.contained_messages[1])
+        foo.name = 'Fie'
+        self.assertIs(container.get_contained_message_by_name('Fie'), foo)
+        self.assertIs(container.get_contained_message_by_name('Foo'),
+                      container.contained_messages[1])
+
+        # Added contained messages are found after a refresh.
+        bar = cantools.database.can.Message(0, 'Bar', 1, [], header_id=7)
+        container.contained_messages.append(bar)
+        container.refresh()
+        self.assertIs(container.get_contained_message_by_header_id(7), bar)
+        self.assertIs(container.get_contained_message_by_name('Bar'), bar)
+
+        # The framing of a malformed container is validated before any
+        # contained message is decoded, here the first one with too
+        # short data.
+        with self.assertRaises(cantools.database.DecodeError) as cm:
+            db_msg.decode(b'\x0a\x0b\x0c\x02\x00\x00'
+                          b'\x00\x00\x01\x09\x00',
+                          decode_containers=True)
+
+        self.assertEqual(
+            str(cm.exception),
+            'Malformed container message "OneToContainThemAll": Contained '
+            'message 2 would exceed total message size.')
+
+    def test_container_packer(self):
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        db_msg = db.get_message_by_name('OneToContainThemAll')
+        message1 = db_msg.get_contained_message_by_name('message1')
+        signals = {
+            'message1_SeqCounter': 123,
+            'message1_CRC': 456,
+            'signal6': 'zero',
+            'signal1': 5.2,
+            'signal5': 3.1415
+        }
+        contained = [
+            ('message1', signals),
+            (0xddeeff, b'\xa0\xa1\xa2\xa3\xa4')
+        ]
+        clock = [10.0]
+        packer = cantools.database.can.container.ContainerPacker(
+            db_msg,
+            timeout=0.5,
+            clock=lambda: clock[0])
+
+        self.assertEqual(packer.capacity, db_msg.length)
+        self.assertFalse(packer.is_due())
+
+        for header, data in contained:
+            self.assertTrue(packer.add(header, data))
+
+        self.assertEqual(len(packer), 2)
+        self.assertEqual(packer.size, 13 + 9)
+        self.assertEqual(packer.capacity, db_msg.length - 22)
+        self.assertFalse(packer.is_due())
+        clock[0] = 10.5
+        self.assertTrue(packer.is_due())
+        self.assertEqual(packer.flush(), db_msg.encode(contained))
+        self.assertEqual(len(packer), 0)
+        self.assertEqual(packer.size, 0)
+        self.assertFalse(packer.is_due())
+
+        # Fill frames from a queue of pending contained messages.
+        pending = deque(5 * [(message1, signals)])
+        packer = db_msg.make_container_packer()
+        frames = []
+
+        while pending:
+            packer.fill(pending)
+            self.assertTrue(packer.capacity < 4 + message1.length
+                            or not pending)
+            frames.append(packer.flush())
+
+        per_frame = db_msg.length // (4 + message1.length)
+        self.assertEqual(len(frames), -(-5 // per_frame))
+        self.assertEqual(
+            frames[0],
+            db_msg.encode(per_frame * [(message1, signals)]))
+        self.assertEqual(
+            [len(unpacked) for unpacked in map(db_msg.unpack_container, frames)],
+            [min(per_frame, 5 - i) for i in range(0, 5, per_frame)])
+
+        # The frame is full if no contained message fits.
+        message3 = db_msg.get_contained_message_by_name('message3')
+        pending = deque(10 * [(message3, bytes(message3.length))])
+        self.assertEqual(packer.fill(pending), 8)
+        self.assertEqual(len(pending), 2)
+        self.assertTrue(packer.is_full)
+        self.assertTrue(packer.is_due())
+        packer.flush()
+
+        # A contained message that does not fit is not added.
+        packer.add(message1, signals)
+        self.assertFalse(packer.add(0xddeeff, bytes(db_msg.length)))
+        self.assertEqual(len(packer), 1)
+
+        # Strict mode.
+        with self.assertRaises(cantools.database.EncodeError):
+            packer.add('message1', {'signal1': 5.2})
+
+        # The capacity is checked before the contained message is
+        # validated and encoded.
+        while packer.add(message1, signals):
+            pass
+
+        self.assertFalse(packer.add('message1', {'signal1': 5.2}))
+        packer.flush()
+
+        # Header ids are 24 bits.
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            packer.add(0x1000000, b'\x00')
+
+        self.assertEqual(str(cm.exception),
+                         'Header id 0x1000000 of contained message is more '
+                         'than 24 bits')
+        self.assertEqual(len(packer), 0)
+
+        # Neither the frame nor the queue is modified if a contained
+        # message cannot be encoded.
+        packer.flush()
+        pending = deque([(message1, signals), ('message1', {'signal1': 5.2})])
+
+        with self.assertRaises(cantools.database.EncodeError):
+            packer.fill(pending)
+
+        self.assertEqual(len(packer), 0)
+        self.assertEqual(packer.size, 0)
+        self.assertFalse(packer.is_due())
+        self.assertEqual(len(pending), 2)
+        pending.pop()
+        self.assertEqual(packer.fill(pending), 1)
+        self.assertEqual(packer.flush(), db_msg.encode([(message1, signals)]))
+
+        packer = db_msg.make_container_packer(strict=False)
+
+        with self.assertRaises(KeyError):
+            packer.add('message1', {'signal1': 5.2})
+
+        with self.assertRaises(cantools.database.EncodeError):
+            db.get_message_by_name('Message1').make_container_packer()
+
     def test_gather_signals(self):
         db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
 
@@ -6188,6 +6430,93 @@ class CanToolsDatabaseTest(unittest.TestCase):
         self.assertEqual(sig.choices[1], 'DRIVER_HEARTBEAT_cmd_SYNC')
         self.assertEqual(sig.choices[2], 'DRIVER_HEARTBEAT_cmd_REBOOT')
 
+    def test_cache_keys(self):
+        filename = 'tests/files/dbc/socialledge.dbc'
+
+        # Different options must not return the same cached database.
+        db = cantools.database.load_file(filename,
+                                         prune_choices=False,
+                                         cache_dir=self.cache_dir)
+        sig = db.get_message_by_name('DRIVER_HEARTBEAT').signals[0]
+        self.assertEqual(sig.choices[0], 'DRIVER_HEARTBEAT_cmd_NOOP')
+
+        db = cantools.database.load_file(filename,
+                                         prune_choices=True,
+                                         cache_dir=self.cache_dir)
+        sig = db.get_message_by_name('DRIVER_HEARTBEAT').signals[0]
+        self.assertEqual(sig.choices[0], 'NOOP')
+
+        db = cantools.database.load_file(filename,
+                                         prune_choices=True,
+                                         cache_dir=self.cache_dir)
+        sig = db.get_message_by_name('DRIVER_HEARTBEAT').signals[0]
+        self.assertEqual(sig.choices[0], 'NOOP')
+
+        with cantools.database.cache.DatabaseCache(self.cache_dir) as cache:
+            statistics = cache.statistics()
+
+            self.assertEqual(statistics.hits, 1)
+            self.assertEqual(statistics.misses, 2)
+            self.assertEqual(statistics.stat_hits, 2)
+            self.assertGreater(statistics.volume, 0)
+
+            # A database loaded with a lambda is not cached.
+            options = {'sort_signals': lambda signals: signals}
+            self.assertIsNone(cantools.database.cache.options_key(options))
+            self.assertEqual(cache.load(filename, options, lambda: 'foo'), 'foo')
+            self.assertEqual(cache.load(filename, options, lambda: 'bar'), 'bar')
+            self.assertEqual(cache.statistics()[:3], statistics[:3])
+
+            # Functions defined in a script are not cached either, as
+            # other scripts may define functions of the same name.
+            def sort_signals(signals):
+                return signals
+
+            sort_signals.__module__ = '__main__'
+            sort_signals.__qualname__ = 'sort_signals'
+            options = {'sort_signals': sort_signals}
+            self.assertIsNone(cantools.database.cache.options_key(options))
+            sort_signals.__module__ = 'foo'
+            self.assertEqual(cantools.database.cache.options_key(options),
+                             (('sort_signals', 'foo.sort_signals'), ))
+
+            cache.clear()
+
+            self.assertEqual(cache.statistics()[:4], (0, 0, 0, 0))
+
+        # A modified file is hashed again.
+        os.makedirs(self.cache_dir + '_files', exist_ok=True)
+        copy = os.path.join(self.cache_dir + '_files', 'socialledge.dbc')
+
+        try:
+            shutil.copyfile(filename, copy)
+            db = cantools.database.load_file(copy, cache_dir=self.cache_dir)
+            self.assertEqual(db.get_message_by_name('DRIVER_HEARTBEAT').name,
+                             'DRIVER_HEARTBEAT')
+
+            with open(copy, 'a', encoding='cp1252') as fout:
+                fout.write('\nBO_ 1999 FOO: 8 Vector__XXX\n')
+
+            os.utime(copy, ns=(0, 0))
+            db = cantools.database.load_file(copy, cache_dir=self.cache_dir)
+            self.assertEqual(db.get_message_by_name('FOO').frame_id, 1999)
+
+            with cantools.database.cache.DatabaseCache(self.cache_dir) as cache:
+                self.assertEqual(cache.statistics()[:3], (0, 2, 0))
+
+            # Statistics are not evicted with the databases.
+            with cantools.database.cache.DatabaseCache(self.cache_dir,
+                                                       size_limit=0) as cache:
+                cache.clear()
+
+                for _ in range(3):
+                    cache.load(copy, {}, lambda: bytes(2 ** 16))
+
+                statistics = cache.statistics()
+                self.assertEqual(statistics.misses + statistics.hits, 3)
+        finally:
+            shutil.rmtree(self.cache_dir + '_files')
+
 
     def test_sort_signals_by_name(self):
         filename = 'tests/files/dbc/vehicle.dbc'
@@ -6358,6 +6687,1598 @@ class CanToolsDatabaseTest(unittest.TestCase):
         self.assertNotIn('BA_ "SystemSignalLongSymbol"', long_output)
 
 
+    def test_decode_batch(self):
+        db = cantools.db.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        payloads = [
+            b'\xc0\x06\xe0\x00\x00\x00\x00\x00',
+            b'\x00\x00\x00\x00\x00\x00\x00\x00',
+            b'\xa5\x5a\x12\x34\x56\x78\x9a\xbc'
+        ]
+
+        for decode_choices in [False, True]:
+            for scaling in [False, True]:
+                decoded = message.decode_batch(payloads,
+                                               decode_choices,
+                                               scaling)
+                self.assertEqual(list(decoded), ['Enable',
+                                                 'AverageRadius',
+                                                 'Temperature'])
+
+                for i, payload in enumerate(payloads):
+                    expected = message.decode(payload,
+                                              decode_choices,
+                                              scaling)
+                    self.assertEqual(
+                        {name: value[i] for name, value in decoded.items()},
+                        expected)
+
+        # A 2-D array gives the same result as a list of bytes.
+        matrix = np.frombuffer(b''.join(payloads), dtype=np.uint8)
+        decoded = message.decode_batch(matrix.reshape(3, 8))
+        self.assertEqual(list(decoded['Temperature']), [250.55, 250.0, 236.72])
+        self.assertEqual(list(decoded['Enable']),
+                         ['Enabled', 'Disabled', 'Enabled'])
+        self.assertIsInstance(decoded['Enable'][0], NamedSignalValue)
+
+        # Truncated payloads.
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode_batch([b'\xc0\x06', b'\xc0\x06\xe0'])
+
+        decoded = message.decode_batch([b'\xc0\x06', b'\xc0\x06\xe0'],
+                                       allow_truncated=True)
+        self.assertEqual(list(decoded), ['Enable', 'AverageRadius', 'Temperature'])
+        self.assertEqual(decoded['Temperature'].mask.tolist(), [True, False])
+        self.assertEqual(decoded['Temperature'][1], 250.55)
+
+        decoded = message.decode_batch([b'\xc0'], allow_truncated=True)
+        self.assertEqual(list(decoded), ['Enable', 'AverageRadius'])
+
+        # NaNs, here signaling NaNs of both floats, are decoded without
+        # warnings.
+        db = cantools.db.load_file('tests/files/dbc/floating_point.dbc')
+        message = db.get_message_by_name('Message2')
+        payload = b'\x01\x00\xa0\x7f\x01\x00\xa0\x7f'
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            decoded = message.decode_batch([payload])
+
+        self.assertTrue(math.isnan(decoded['Signal1'][0]))
+        self.assertTrue(math.isnan(decoded['Signal2'][0]))
+        self.assertTrue(math.isnan(message.decode(payload)['Signal1']))
+
+        # Container messages cannot be batch decoded.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode_batch([b''])
+
+    def test_decode_batch_multiplexed(self):
+        db = cantools.db.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        payloads = [
+            bytes([mux, 0x12, 0x34, 0x56, 0x78, 0x9a, 0xbc, 0xde])
+            for mux in range(0, 256, 3)
+        ]
+        decoded = message.decode_batch(payloads)
+
+        for i, payload in enumerate(payloads):
+            try:
+                expected = message.decode(payload)
+            except cantools.database.DecodeError:
+                expected = {}
+
+            actual = {
+                name: value[i]
+                for name, value in decoded.items()
+                if value[i] is not np.ma.masked
+            } if expected else {}
+
+            self.assertEqual(actual, expected)
+
+    def test_encode_batch(self):
+        db = cantools.db.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        rows = [
+            {'Enable': 'Enabled', 'AverageRadius': 0.0, 'Temperature': 250.55},
+            {'Enable': 'Disabled', 'AverageRadius': 1.2, 'Temperature': 250.0},
+            {'Enable': 1, 'AverageRadius': 3.0, 'Temperature': 236.72}
+        ]
+        columns = {
+            'Enable': np.array([row['Enable'] for row in rows], dtype=object),
+            'AverageRadius': [row['AverageRadius'] for row in rows],
+            'Temperature': [row['Temperature'] for row in rows]
+        }
+
+        for padding in [False, True]:
+            encoded = message.encode_batch(columns, padding=padding)
+            self.assertEqual(encoded.shape, (3, 8))
+            self.assertEqual(encoded.dtype, np.uint8)
+            self.assertEqual([bytes(row) for row in encoded],
+                             [message.encode(row, padding=padding)
+                              for row in rows])
+
+        # Raw values, and choices given as strings only.
+        decoded = message.decode_batch([message.encode(row) for row in rows],
+                                       scaling=False)
+        encoded = message.encode_batch(decoded, scaling=False)
+        self.assertEqual([bytes(row) for row in encoded],
+                         [message.encode(row) for row in rows])
+
+        # A structured array.
+        array = np.array([(1, 3.0, 236.72), (0, 1.2, 250.0)],
+                         dtype=[('Enable', np.int64),
+                                ('AverageRadius', np.float64),
+                                ('Temperature', np.float64)])
+        encoded = message.encode_batch(array)
+        self.assertEqual(bytes(encoded[0]), message.encode(rows[2]))
+        self.assertEqual(bytes(encoded[1]), message.encode(rows[1]))
+
+        # Out of range values are reported with their rows.
+        columns['Temperature'] = [250.55, 300.0, 301.0]
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.encode_batch(columns)
+
+        self.assertEqual(
+            str(cm.exception),
+            'Expected signal "Temperature" value less than or equal to '
+            '270.47, but got 300.0 in rows 1 and 2.')
+
+        # Numbers out of the range of 64 bits integers are out of the
+        # range of the field as well, without any warning of numpy.
+        columns['Temperature'] = [250.55, 1e30, 250.0]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+
+            with self.assertRaises(cantools.database.EncodeError) as cm:
+                message.encode_batch(columns, strict=False)
+
+        self.assertEqual(
+            str(cm.exception),
+            'Field "Temperature" raw value out of range in rows 1.')
+
+        # Missing and unknown columns.
+        del columns['Temperature']
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.encode_batch(columns)
+
+        self.assertEqual(
+            str(cm.exception),
+            'Expected a column for signal "Temperature" of message '
+            '"ExampleMessage".')
+
+        # Columns of different lengths.
+        columns['Temperature'] = [250.0]
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.encode_batch(columns)
+
+        self.assertEqual(str(cm.exception),
+                         'Expected columns of equal length, but got 1 and 3.')
+
+    def test_encode_batch_multiplexed(self):
+        db = cantools.db.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        payloads = []
+
+        for mux in range(256):
+            for mux_2 in [1, 2]:
+                payload = bytes([mux, 0x12, 0x34, 0x56, mux_2, 0x9a, 0xbc, 0xde])
+
+                try:
+                    payloads.append(message.encode(message.decode(payload)))
+                except cantools.database.DecodeError:
+                    pass
+
+        self.assertEqual(len(payloads), 36)
+
+        # Masked values of inactive signals are not encoded.
+        encoded = message.encode_batch(message.decode_batch(payloads))
+        self.assertEqual([bytes(row) for row in encoded], payloads)
+
+        # Invalid multiplexer ids.
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.encode_batch({'S0': [0, 7], 'S1': [0, 0], 'S2': [0, 0]},
+                                 strict=False)
+
+        self.assertEqual(
+            str(cm.exception),
+            'Expected multiplexer id in {0 or 1}, for multiplexer "S0" '
+            'but got 7 in rows 1')
+
+    def test_validate_batch(self):
+        db = cantools.db.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        columns = {
+            'Enable': np.array(['Enabled', 0, 'Disabled'], dtype=object),
+            'AverageRadius': [0.0, 1.2, 5.1],
+            'Temperature': [229.51, 250.55, 270.48]
+        }
+        self.assertEqual(
+            {name: rows.tolist()
+             for name, rows in message.validate_batch(columns).items()},
+            {
+                'AverageRadius': [2],
+                'Temperature': [0, 2]
+            })
+
+        # Raw values.
+        columns = {
+            'AverageRadius': [0, 50, 51],
+            'Temperature': [-2048, 0, 2047]
+        }
+        self.assertEqual(
+            {name: rows.tolist()
+             for name, rows in message.validate_batch(columns,
+                                                      scaling=False).items()},
+            {
+                'AverageRadius': [2]
+            })
+
+        # Valid values, unknown columns and masked values.
+        columns = {
+            'Temperature': np.ma.masked_array([250.0, 300.0],
+                                              mask=[False, True]),
+            'Foo': [1000, 1000]
+        }
+        self.assertEqual(message.validate_batch(columns), {})
+
+        # Same as the strict mode of encode().
+        for row in range(3):
+            frame = {
+                'Enable': 1,
+                'AverageRadius': [0.0, 1.2, 5.1][row],
+                'Temperature': [229.51, 250.55, 270.48][row]
+            }
+
+            if row == 1:
+                message.encode(frame)
+            else:
+                with self.assertRaises(cantools.database.EncodeError):
+                    message.encode(frame)
+
+    def test_validate_raw(self):
+        db = cantools.db.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        payloads = [
+            message.encode({'Enable': 1,
+                            'AverageRadius': 3.2,
+                            'Temperature': 250.55}),
+            message.encode({'Enable': 1,
+                            'AverageRadius': 6.3,
+                            'Temperature': 229.52},
+                           strict=False),
+            message.encode({'Enable': 0,
+                            'AverageRadius': 0.0,
+                            'Temperature': 270.47})
+        ]
+        invalid_rows = message.validate_raw(payloads)
+        self.assertEqual(list(invalid_rows), ['AverageRadius'])
+        self.assertEqual(invalid_rows['AverageRadius'].tolist(), [1])
+
+        # Signals not present because of their multiplexer ids are
+        # not checked.
+        db = cantools.db.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Shared')
+        message.get_signal_by_name('S1').maximum = 2
+        message.refresh()
+        payloads = [
+            b'\x31\x00\x00\x00\x00\x00\x00\x00',
+            b'\x32\x00\x00\x00\x00\x00\x00\x00'
+        ]
+        invalid_rows = message.validate_raw(payloads)
+        self.assertEqual(list(invalid_rows), ['S1'])
+        self.assertEqual(invalid_rows['S1'].tolist(), [0])
+
+    def test_decode_into(self):
+        db = cantools.db.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        data = b'\xc0\x06\xe0\x00\x00\x00\x00\x00'
+        dtype = [
+            ('Temperature', np.float64),
+            ('AverageRadius', np.float64),
+            ('Enable', np.int8)
+        ]
+
+        # A structured array row.
+        rows = np.zeros(3, dtype=dtype)
+        row = rows[1]
+        self.assertIs(message.decode_into(data, row), row)
+        self.assertEqual(rows[1].tolist(), (250.55, 3.2, 1))
+        self.assertEqual(rows[0].tolist(), (0.0, 0.0, 0))
+
+        # A structured array and an index.
+        message.decode_into(data, rows, 2, scaling=False)
+        self.assertEqual(rows[2].tolist(), (55.0, 32.0, 1))
+
+        # A mapping of arrays and an index.
+        columns = {name: np.zeros(4) for name, _ in dtype}
+        message.decode_into(b'\x00' + data, columns, 3, offset=1)
+        self.assertEqual(
+            {name: column[3] for name, column in columns.items()},
+            message.decode(data, decode_choices=False))
+
+        # Any object supporting item assignment, if no index is given.
+        out = {}
+        message.decode_into(data, out)
+        self.assertEqual(out, message.decode(data, decode_choices=False))
+
+        # Signals not present in truncated data.
+        message.decode_into(data[:1], out, allow_truncated=True)
+        self.assertEqual(out['Enable'], 1)
+        self.assertEqual(out['AverageRadius'], 3.2)
+        self.assertTrue(math.isnan(out['Temperature']))
+
+        # Signals not present in the selected multiplexer branch.
+        db = cantools.db.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        rows = np.zeros(3, dtype=[(signal.name, np.int64)
+                                  for signal in message.signals])
+        signal_values = [
+            {'S0': 0, 'S1': 0, 'S2': 1, 'S3': 2, 'S6': 1, 'S7': 3},
+            {'S0': 0, 'S1': 2, 'S4': 5, 'S6': 2, 'S8': 4},
+            {'S0': 1, 'S5': 6, 'S6': 1, 'S7': 7}
+        ]
+
+        for i, decoded_message in enumerate(signal_values):
+            message.decode_into(message.encode(decoded_message),
+                                rows,
+                                i,
+                                missing=-1)
+            self.assertEqual(
+                dict(zip(rows.dtype.names, rows[i].tolist())),
+                {
+                    signal.name: decoded_message.get(signal.name, -1)
+                    for signal in message.signals
+                })
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode_into(b'\x03\x00\x00\x00\x00\x00\x00\x00', rows[0])
+
+        # Container messages cannot be decoded into arrays.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode_into(b'', {})
+
+    def test_decode_as_record(self):
+        db = cantools.db.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        data = b'\xc0\x06\xe0\x00\x00\x00\x00\x00'
+        record = message.decode(data, as_record=True)
+
+        self.assertIsInstance(record, message.record_class)
+        self.assertEqual(record.Enable, 'Enabled')
+        self.assertEqual(record.AverageRadius, 3.2)
+        self.assertEqual(record.Temperature, 250.55)
+        self.assertEqual(record._asdict(), message.decode(data))
+        self.assertEqual(
+            repr(record),
+            "ExampleMessage(Enable='Enabled', AverageRadius=3.2, "
+            "Temperature=250.55)")
+        self.assertEqual(db.decode_message('ExampleMessage',
+                                           data,
+                                           decode_choices=False,
+                                           as_record=True),
+                         (1, 3.2, 250.55))
+
+        # Signals which are not decoded are None.
+        record = message.decode(data, signals=['Temperature'], as_record=True)
+        self.assertEqual(record, (None, None, 250.55))
+
+        # Signals not present in the selected multiplexer branch are
+        # None as well.
+        db = cantools.db.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        decoded_message = {'S0': 0, 'S1': 2, 'S4': 5, 'S6': 2, 'S8': 4}
+        record = message.decode(message.encode(decoded_message),
+                                as_record=True)
+        self.assertEqual(
+            record._asdict(),
+            {
+                signal.name: decoded_message.get(signal.name)
+                for signal in message.signals
+            })
+
+        # Names which are not valid identifiers.
+        message = cantools.database.can.Message(
+            frame_id=1,
+            name='My-Message',
+            length=2,
+            signals=[
+                cantools.database.can.Signal('class', 0, 4),
+                cantools.database.can.Signal('Foo.Bar', 4, 4),
+                cantools.database.can.Signal('Fum', 8, 8)
+            ])
+        record = message.decode(b'\x21\x03', as_record=True)
+        self.assertEqual(record, (1, 2, 3))
+        self.assertEqual(record._fields, ('_0', '_1', 'Fum'))
+        self.assertEqual(message.record_class.__name__, 'My_Message')
+        self.assertEqual(message.record_class._signal_names,
+                         ('class', 'Foo.Bar', 'Fum'))
+
+        # The record class is created again after a refresh.
+        record_class = message.record_class
+        self.assertIs(message.record_class, record_class)
+        message.signals.pop()
+        message.refresh()
+        self.assertEqual(message.decode(b'\x21\x03', as_record=True), (1, 2))
+        self.assertIsNot(message.record_class, record_class)
+
+        # Container messages cannot be decoded as records.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode(b'', decode_containers=True, as_record=True)
+
+    def test_choice_tables(self):
+        db = cantools.db.load_file('tests/files/dbc/choices.dbc')
+        message = db.get_message_by_name('Foo')
+        signal = message.get_signal_by_name('Foo')
+
+        # Raw values -5 to 6 are stored in a list.
+        table = cantools.database.utils.create_choice_table(signal.choices)
+        self.assertEqual(table.minimum, -5)
+        self.assertEqual(len(table.dense), 12)
+        self.assertIs(table.dense[0], signal.choices[-5])
+        self.assertIsNone(table.dense[1])
+        self.assertIs(table.dense[11], signal.choices[6])
+        self.assertIs(table.lookup(6), signal.choices[6])
+        self.assertIsNone(table.lookup(7))
+        self.assertEqual(message._codecs['formats'].choice_tables['Foo'].lookup,
+                         table.lookup)
+
+        # Sparse choices are only looked up in the dictionary.
+        table = cantools.database.utils.create_choice_table(
+            {0: 'Zero', 1000: 'Thousand'})
+        self.assertIsNone(table.dense)
+        self.assertEqual(table.lookup(1000), 'Thousand')
+        self.assertIsNone(cantools.database.utils.create_choice_table(None))
+        self.assertIsNone(cantools.database.utils.create_choice_table({}))
+
+        # The same choice object is returned by every decode, and
+        # values without a choice are scaled.
+        with_choice = b'\xfb\x00\x00\x00\x00\x00\x00\x00'
+        without_choice = b'\x07\x00\x00\x00\x00\x00\x00\x00'
+
+        for codec_engine in cantools.database.engines.CODEC_ENGINES:
+            message.codec_engine = codec_engine
+            first = message.decode(with_choice)['Foo']
+            self.assertIs(first, signal.choices[-5])
+            self.assertIs(message.decode(with_choice)['Foo'], first)
+            self.assertEqual(message.decode(without_choice), {'Foo': 7})
+            self.assertEqual(message.decode(with_choice, decode_choices=False),
+                             {'Foo': -5})
+
+        # Batch decoding uses the list of choices.
+        decoded = message.decode_batch([
+            bytes([raw]).ljust(8, b'\x00') for raw in [0xfb, 0x07, 0x06, 0x80]
+        ])
+        self.assertEqual(decoded['Foo'].tolist(),
+                         [signal.choices[-5], 7, signal.choices[6], -128])
+        self.assertIs(decoded['Foo'][0], signal.choices[-5])
+
+    def test_choice_tables_multiplexed(self):
+        # The signals of the multiplexer dispatch codecs are sorted by
+        # their position in the message, and thus not in the order of
+        # the signals of the message.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('MultiplexedMessage')
+        expected = {
+            'MultiplexedStatic': 1.0,
+            'MultiplexedMessage_selector1': 'SELECT_WORLD',
+            'MultiplexedStatic2': 74.0,
+            'World2': 0.0,
+            'World1': -2.0
+        }
+
+        self.assertEqual(message.decode(b'aJ'), expected)
+        self.assertEqual(
+            message.decode(b'aJ',
+                           signals=['MultiplexedMessage_selector1',
+                                    'World2']),
+            {
+                'MultiplexedMessage_selector1': 'SELECT_WORLD',
+                'World2': 0.0
+            })
+        self.assertEqual(message.make_decoder(
+            ['MultiplexedMessage_selector1', 'World2']).decode(b'aJ'),
+                         {
+                             'MultiplexedMessage_selector1': 'SELECT_WORLD',
+                             'World2': 0.0
+                         })
+        self.assertEqual(db.decoder()(message.frame_id, b'aJ'), expected)
+
+        db = cantools.db.load_file('tests/files/kcd/dump.kcd')
+        message = db.get_message_by_name('Message2')
+        self.assertEqual(message.decode(b'\x01\x00\x00\x00'),
+                         {
+                             'Mux1': 0,
+                             'Mux2': 0,
+                             'Signal6': 'init',
+                             'Signal1': 1,
+                             'Signal2': 0,
+                             'Signal5': 0
+                         })
+
+    def test_padding_mask_for(self):
+        db = cantools.db.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+
+        self.assertEqual(message.padding_mask_for({'S0': 0, 'S1': 2, 'S6': 2}),
+                         0xffff)
+        self.assertEqual(message.padding_mask_for({'S0': 0, 'S1': 2, 'S6': 1}),
+                         0)
+        self.assertEqual(message.padding_mask_for({'S0': 1, 'S6': 2}), 0xffff)
+
+        # The masks are cached per branch.
+        self.assertEqual(message._padding_masks, {(0, 2, 2): 0xffff,
+                                                  (0, 2, 1): 0,
+                                                  (1, 2): 0xffff})
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.padding_mask_for({'S0': 0, 'S1': 2, 'S6': 3})
+
+        self.assertEqual(
+            str(cm.exception),
+            'Expected multiplexer id in {1 or 2}, for multiplexer "S6" but '
+            'got 3')
+
+        # The padding pattern follows the unused bit pattern.
+        decoded_message = {'S0': 0, 'S1': 2, 'S4': 5, 'S6': 2, 'S8': 4}
+        self.assertEqual(message.unused_bit_pattern, 0xff)
+        self.assertEqual(message.encode(decoded_message, padding=True),
+                         b'\x20\x05\x00\x00\x02\x04\xff\xff')
+        message.unused_bit_pattern = 0xa5
+        self.assertEqual(message.encode(decoded_message, padding=True),
+                         b'\x20\x05\x00\x00\x02\x04\xa5\xa5')
+        message.unused_bit_pattern = 0x00
+        self.assertEqual(message.encode(decoded_message, padding=True),
+                         b'\x20\x05\x00\x00\x02\x04\x00\x00')
+
+        # The cached masks are dropped by refresh().
+        message.refresh()
+        self.assertEqual(message._padding_masks, {})
+
+    def test_lazy(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                         lazy=True)
+        message = db.get_message_by_name('ExampleMessage')
+
+        self.assertTrue(db.lazy)
+        self.assertTrue(message.lazy)
+        self.assertIsNone(message._codecs)
+
+        # The codecs are created when first needed.
+        self.assertEqual(
+            message.decode(b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+            {'Enable': 'Enabled', 'AverageRadius': 3.2, 'Temperature': 250.55})
+        self.assertIsNotNone(message._codecs)
+        message.refresh()
+        self.assertIsNone(message._codecs)
+        self.assertEqual(message.signal_tree,
+                         ['Enable', 'AverageRadius', 'Temperature'])
+        self.assertIsNotNone(message._codecs)
+
+        # Eager databases create all codecs when refreshed.
+        db.lazy = False
+        self.assertFalse(message.lazy)
+        self.assertIsNotNone(message._codecs)
+        db.lazy = True
+        self.assertIsNone(message._codecs)
+
+        db.warm_up(['ExampleMessage'])
+        self.assertIsNotNone(message._codecs)
+
+        with self.assertRaises(KeyError):
+            db.warm_up(['Missing'])
+
+        # Contained messages are warmed up as well.
+        db = cantools.database.load_file('tests/files/arxml/system-4.2.arxml',
+                                         lazy=True)
+        message = db.get_message_by_name('OneToContainThemAll')
+
+        for contained_message in message.contained_messages:
+            self.assertIsNone(contained_message._codecs)
+
+        db.warm_up()
+
+        for contained_message in message.contained_messages:
+            self.assertIsNotNone(contained_message._codecs)
+
+        # The strict checks are done when first needed.
+        signal = cantools.database.can.Signal('S', 7, 33, 'big_endian')
+        message = cantools.database.can.Message(37,
+                                                'M',
+                                                4,
+                                                [signal],
+                                                lazy=True)
+
+        with self.assertRaises(cantools.database.errors.Error) as cm:
+            message.encode({'S': 0})
+
+        self.assertEqual(str(cm.exception),
+                         'The signal S does not fit in message M.')
+        self.assertIsNone(message._codecs)
+
+        with self.assertRaises(cantools.database.errors.Error):
+            cantools.database.load_file(
+                'tests/files/dbc/bad_message_length.dbc',
+                lazy=True).warm_up()
+
+    def test_compact_representation(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        enable, average_radius, temperature = message.signals
+
+        # Messages and signals have no instance dictionaries.
+        for obj in [message, temperature, temperature.decimal, temperature.dbc]:
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+            with self.assertRaises(AttributeError):
+                obj.foo = 1
+
+        # Names of nodes are interned.
+        self.assertIs(temperature.receivers[0], message.senders[0])
+        self.assertIs(temperature.receivers[0], sys.intern('PCM1'))
+
+        # Equal decimals of signals are shared.
+        self.assertIs(enable.decimal.offset, average_radius.decimal.offset)
+
+        # The dictionaries of DBC specifics are created when first
+        # used.
+        self.assertIsNone(temperature.dbc._value_tables)
+        self.assertEqual(temperature.dbc.value_tables, {})
+        self.assertIs(temperature.dbc.value_tables,
+                      temperature.dbc._value_tables)
+
+        # Slotted objects can still be pickled and copied.
+        message_copy = pickle.loads(pickle.dumps(message))
+        self.assertEqual(message_copy.signals[2].receivers, ['PCM1', 'FOO'])
+        self.assertEqual(
+            message_copy.decode(b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+            message.decode(b'\xc0\x06\xe0\x00\x00\x00\x00\x00'))
+        self.assertEqual(deepcopy(temperature).decimal.offset, 250)
+
+    def test_sniff_database_format(self):
+        datas = [
+            ('tests/files/arxml/system-4.2.arxml', 'utf-8', 'arxml'),
+            ('tests/files/arxml/system-3.2.3.arxml', 'utf-8', 'arxml'),
+            ('tests/files/arxml/system-float-values.arxml', 'utf-8', 'arxml'),
+            ('tests/files/arxml/system-illegal-root-4.2.arxml', 'utf-8', None),
+            ('tests/files/dbc/vehicle.dbc', 'cp1252', 'dbc'),
+            ('tests/files/dbc/foobar.dbc', 'cp1252', 'dbc'),
+            ('tests/files/kcd/the_homer.kcd', 'utf-8', 'kcd'),
+            ('tests/files/kcd/empty.kcd', 'utf-8', 'kcd'),
+            ('tests/files/sym/jopp-6.0.sym', 'cp1252', 'sym'),
+            ('tests/files/sym/special-chars-6.0.sym', 'cp1252', 'sym'),
+            ('tests/files/cdd/example.cdd', 'iso-8859-1', 'cdd')
+        ]
+
+        for filename, encoding, expected in datas:
+            with open(filename, encoding=encoding) as fin:
+                string = fin.read()
+
+            self.assertEqual(cantools.database.sniff_database_format(string),
+                             expected,
+                             filename)
+
+        self.assertIsNone(cantools.database.sniff_database_format(''))
+        self.assertIsNone(cantools.database.sniff_database_format('foo'))
+
+        # A string that is sniffed as a format but does not parse as
+        # it is still tried with all other formats.
+        with self.assertRaises(UnsupportedDatabaseFormatError) as cm:
+            cantools.database.load_string('VERSION "" foo')
+
+        self.assertIsNotNone(cm.exception.e_dbc)
+        self.assertIsNotNone(cm.exception.e_arxml)
+        self.assertIsNotNone(cm.exception.e_sym)
+
+        db = cantools.database.load_string(
+            '<?xml version="1.0"?>\n'
+            '<!-- BO_ -->\n'
+            '<NetworkDefinition xmlns="http://kayak.2codeornot2code.org/1.0" />\n')
+        self.assertEqual(db.messages, [])
+
+    def test_dbc_streaming_parser(self):
+        # The streaming parser gives the same parse tree, or raises the
+        # same error, as the grammar for all DBC files.
+        for filename in sorted(glob.glob('tests/files/dbc/*.dbc')):
+            with open(filename, encoding='cp1252') as fin:
+                string = fin.read()
+
+            try:
+                expected = cantools.database.can.formats.dbc.Parser().parse(string)
+            except textparser.ParseError as e:
+                with self.assertRaises(textparser.ParseError) as cm:
+                    cantools.database.can.formats.dbc.StreamingParser().parse(string)
+
+                self.assertEqual(str(cm.exception), str(e), filename)
+            else:
+                actual = cantools.database.can.formats.dbc.StreamingParser().parse(string)
+                self.assertEqual(actual, expected, filename)
+
+        filename = 'tests/files/dbc/vehicle.dbc'
+        db = cantools.database.load_file(filename)
+        streaming_db = cantools.database.load_file(filename, streaming=True)
+        self.assertEqual(streaming_db.as_dbc_string(), db.as_dbc_string())
+
+        # Statements not matched by the streaming parser, here the
+        # choices without whitespace before the last text, are parsed
+        # by the grammar.
+        db = cantools.database.load_string(
+            'BO_ 1 Foo: 8 Vector__XXX // Comment.\n'
+            ' SG_ Bar : 0|8@1+ (1,0) [0|0] "" Vector__XXX\n'
+            'CM_ BO_ 1 "Foo comment."; // Comment.\n'
+            'BA_DEF_ BO_  "GenMsgCycleTime" INT 0 65535;\n'
+            'VAL_ 1 Bar 0 "Off" 1"On" ;\n'
+            'BA_ "GenMsgCycleTime" BO_ 1 100;\n',
+            streaming=True)
+        message = db.get_message_by_name('Foo')
+        self.assertEqual(message.comment, 'Foo comment.')
+        self.assertEqual(message.cycle_time, 100)
+        self.assertEqual(message.signals[0].choices, {0: 'Off', 1: 'On'})
+
+        # A statement parsed by the grammar spanning several lines.
+        with open('tests/files/dbc/motohawk.dbc') as fin:
+            string = fin.read()
+
+        string = string.replace(
+            'BA_DEF_ BO_  "GenMsgCycleTime" INT 0 65535;',
+            'BA_DEF_\nBO_ "GenMsgCycleTime" INT 0 65535;')
+        self.assertIn('BA_DEF_\nBO_', string)
+        parser = cantools.database.can.formats.dbc
+        self.assertEqual(parser.StreamingParser().parse(string),
+                         parser.Parser().parse(string))
+        db = cantools.database.load_string(string, streaming=True)
+        self.assertEqual(db.as_dbc_string(),
+                         cantools.database.load_string(string).as_dbc_string())
+
+    def test_arxml_streaming(self):
+        # Streaming gives the same database, or raises the same error,
+        # for all ARXML files.
+        for filename in sorted(glob.glob('tests/files/arxml/*.arxml')):
+            databases = []
+
+            for streaming in [False, True]:
+                try:
+                    db = cantools.database.load_file(filename,
+                                                     streaming=streaming)
+                except Exception as e:
+                    databases.append((type(e), str(e)))
+                else:
+                    databases.append(pickle.dumps(db))
+
+            self.assertEqual(databases[1], databases[0], filename)
+
+        # Package elements not needed by the loader are dropped.
+        with open('tests/files/arxml/system-4.2.arxml', encoding='utf-8') as fin:
+            string = fin.read()
+
+        string = string.replace(
+            '<ELEMENTS>',
+            '<ELEMENTS>'
+            '<APPLICATION-SW-COMPONENT-TYPE>'
+            '<SHORT-NAME>Component</SHORT-NAME>'
+            '<ADMIN-DATA><LANGUAGE>EN</LANGUAGE></ADMIN-DATA>'
+            '</APPLICATION-SW-COMPONENT-TYPE>',
+            1)
+        root = cantools.database.can.formats.arxml.parse_streaming(string)
+        kinds = {elem.tag.rpartition('}')[2] for elem in root.iter()}
+
+        self.assertIn('CAN-FRAME', kinds)
+        self.assertIn('COMPU-METHOD', kinds)
+        self.assertIn('SECURED-I-PDU', kinds)
+        self.assertNotIn('APPLICATION-SW-COMPONENT-TYPE', kinds)
+        self.assertNotIn('ADMIN-DATA', kinds)
+
+        db = cantools.database.load_string(string, streaming=True)
+        self.assertEqual(pickle.dumps(db),
+                         pickle.dumps(cantools.database.load_string(string)))
+
+    def test_codec_engine_compiled(self):
+        filenames = [
+            'tests/files/dbc/motohawk.dbc',
+            'tests/files/dbc/vehicle.dbc',
+            'tests/files/dbc/multiplex_2.dbc',
+            'tests/files/dbc/choices.dbc',
+            'tests/files/dbc/floating_point.dbc',
+            'tests/files/dbc/signed.dbc',
+            'tests/files/kcd/the_homer.kcd'
+        ]
+
+        for filename in filenames:
+            db = cantools.database.load_file(filename)
+            db_compiled = cantools.database.load_file(filename,
+                                                      codec_engine='compiled')
+            self.assertEqual(db.codec_engine, 'bitstruct')
+            self.assertEqual(db_compiled.codec_engine, 'compiled')
+
+            for message, message_compiled in zip(db.messages,
+                                                  db_compiled.messages):
+                self.assertEqual(message_compiled.codec_engine, 'compiled')
+
+                for i in range(32):
+                    data = bytes([(17 * i + 3 * j) & 0xff
+                                  for j in range(message.length)])
+
+                    for decode_choices in [False, True]:
+                        for scaling in [False, True]:
+                            try:
+                                expected = message.decode(data,
+                                                          decode_choices,
+                                                          scaling)
+                            except cantools.database.DecodeError:
+                                with self.assertRaises(
+                                        cantools.database.DecodeError):
+                                    message_compiled.decode(data,
+                                                            decode_choices,
+                                                            scaling)
+                                continue
+
+                            actual = message_compiled.decode(data,
+                                                             decode_choices,
+                                                             scaling)
+                            self.assertEqual(actual, expected)
+                            self.assertEqual(
+                                [type(value) for value in actual.values()],
+                                [type(value) for value in expected.values()])
+
+                            # Truncated data is decoded by the
+                            # bitstruct engine.
+                            self.assertEqual(
+                                message_compiled.decode(data[:3],
+                                                        decode_choices,
+                                                        scaling,
+                                                        allow_truncated=True),
+                                message.decode(data[:3],
+                                               decode_choices,
+                                               scaling,
+                                               allow_truncated=True))
+
+        # Switching the engine of a loaded database.
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        db.codec_engine = 'compiled'
+        message = db.get_message_by_name('ExampleMessage')
+        self.assertEqual(message.codec_engine, 'compiled')
+        self.assertEqual(message.decode(b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                         {
+                             'Enable': 'Enabled',
+                             'AverageRadius': 3.2,
+                             'Temperature': 250.55
+                         })
+
+        # The engine of contained messages is switched as well.
+        db = cantools.database.load_file('tests/files/arxml/system-4.2.arxml')
+        container = db.get_message_by_name('OneToContainThemAll')
+        data = container.encode([(0x0a0b0c, {'message1_SeqCounter': 123,
+                                            'message1_CRC': 456,
+                                            'signal6': 'zero',
+                                            'signal1': 5.2,
+                                            'signal5': 3.1415})])
+        expected = container.decode(data, decode_containers=True)
+        db.codec_engine = 'compiled'
+
+        for contained_message in container.contained_messages:
+            self.assertEqual(contained_message.codec_engine, 'compiled')
+
+        self.assertEqual(container.decode(data, decode_containers=True),
+                         expected)
+
+        # Compiled decoders survive pickling, which is used by the
+        # database cache.
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                         codec_engine='compiled',
+                                         cache_dir=self.cache_dir)
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                         codec_engine='compiled',
+                                         cache_dir=self.cache_dir)
+        message = db.get_message_by_name('ExampleMessage')
+        self.assertEqual(message.decode(b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                         {
+                             'Enable': 'Enabled',
+                             'AverageRadius': 3.2,
+                             'Temperature': 250.55
+                         })
+
+        with self.assertRaises(ValueError) as cm:
+            db.codec_engine = 'foo'
+
+        self.assertEqual(
+            str(cm.exception),
+            "expected codec engine 'bitstruct' or 'compiled', but got 'foo'")
+
+    def test_codec_engine_compiled_fd(self):
+        # A CAN FD message with 64 bytes of signals of both byte orders,
+        # signed and unsigned, and 16, 32 and 64 bits floats.
+        def create_message(codec_engine):
+            signals = []
+
+            for i in range(16):
+                signals.append(cantools.database.can.Signal(
+                    f'S{i}',
+                    8 * (2 * i) + (7 if i % 2 else 0),
+                    16,
+                    'big_endian' if i % 2 else 'little_endian',
+                    is_signed=(i % 4 < 2),
+                    scale=0.5,
+                    offset=-3))
+
+            signals += [
+                cantools.database.can.Signal('F16', 256, 16, is_float=True),
+                cantools.database.can.Signal('F32', 272, 32, is_float=True),
+                cantools.database.can.Signal('F64', 311, 64, 'big_endian',
+                                             is_float=True),
+                cantools.database.can.Signal('I64', 368, 64, is_signed=True,
+                                             choices={-1: 'Minus one'}),
+                cantools.database.can.Signal('U1', 511, 1)
+            ]
+
+            return cantools.database.can.Message(frame_id=1,
+                                                 name='Fd',
+                                                 length=64,
+                                                 signals=signals,
+                                                 codec_engine=codec_engine)
+
+        message_bitstruct = create_message('bitstruct')
+        message = create_message('compiled')
+        payloads = [
+            bytes([(37 * i + 11 * j) & 0xff for j in range(64)])
+            for i in range(16)
+        ]
+        payloads.append(b'\x7f\xff' * 24 + b'\xff' * 16)
+        payloads.append(b'\xff' * 64)
+
+        for data in payloads:
+            for decode_choices in [False, True]:
+                for scaling in [False, True]:
+                    expected = message_bitstruct.decode(data,
+                                                        decode_choices,
+                                                        scaling)
+                    actual = message.decode(data, decode_choices, scaling)
+                    self.assertEqual(repr(actual), repr(expected))
+
+        # Truncated data is decoded by the bitstruct engine.
+        self.assertEqual(message.decode(payloads[0][:20],
+                                        allow_truncated=True),
+                         message_bitstruct.decode(payloads[0][:20],
+                                                  allow_truncated=True))
+
+    def test_codec_engine_overlapping_signals(self):
+        # Overlapping signals are decoded by bitstruct with all engines
+        # and decode functions, which raises an error.
+        messages = [
+            ('tests/files/dbc/issue_63.dbc', 'AFT1PSI2'),
+            ('tests/files/kcd/message_layout.kcd', 'Message5')
+        ]
+
+        for filename, name in messages:
+            for codec_engine in cantools.database.engines.CODEC_ENGINES:
+                db = cantools.database.load_file(filename,
+                                                 strict=False,
+                                                 codec_engine=codec_engine)
+                message = db.get_message_by_name(name)
+                data = bytes(range(1, message.length + 1))
+
+                with self.assertRaises(ValueError):
+                    message.decode(data)
+
+                with self.assertRaises(ValueError):
+                    message.decode_lazy(data)
+
+                with self.assertRaises(ValueError):
+                    message.decode_into(data, {})
+
+                with self.assertRaises(ValueError):
+                    db.decoder()(message.frame_id, data)
+
+    def test_multiplexer_dispatch(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+
+        # The dispatch table is created when first needed.
+        self.assertIsNone(message._mux_dispatch)
+
+        # The nested multiplexer S1 only follows S0 = 0, while S6 is
+        # independent of S0.
+        dispatch = message._get_mux_dispatch()
+        self.assertEqual(dispatch.shift, 0)
+        self.assertEqual(dispatch.mask, 0xf)
+        self.assertEqual(sorted(dispatch.branches), [0, 1])
+        self.assertEqual(sorted(dispatch.branches[0].branches), [0, 2])
+        self.assertEqual(sorted(dispatch.branches[1].branches), [1, 2])
+        self.assertEqual(
+            [signal.name
+             for signal in dispatch.branches[0].branches[2].branches[1]['signals']],
+            ['S0', 'S6', 'S1', 'S4', 'S7'])
+
+        signal_values = [
+            {'S0': 0, 'S1': 0, 'S2': 1, 'S3': 2, 'S6': 1, 'S7': 3},
+            {'S0': 0, 'S1': 2, 'S4': 5, 'S6': 2, 'S8': 4},
+            {'S0': 1, 'S5': 6, 'S6': 1, 'S7': 7}
+        ]
+
+        for decoded_message in signal_values:
+            encoded = message.encode(decoded_message)
+
+            for decode_choices in [False, True]:
+                for scaling in [False, True]:
+                    decoded = message.decode(encoded, decode_choices, scaling)
+                    self.assertEqual(decoded, decoded_message)
+
+                    # Same result and signal order as when decoding
+                    # via the codec tree.
+                    dispatch = message._mux_dispatch
+                    message._mux_dispatch = None
+                    expected = message.decode(encoded, decode_choices, scaling)
+                    message._mux_dispatch = dispatch
+                    self.assertEqual(list(decoded.items()),
+                                     list(expected.items()))
+
+        # Invalid multiplexer values are reported as before.
+        with self.assertRaises(cantools.database.DecodeError) as cm:
+            message.decode(b'\x03\x00\x00\x00\x00\x00\x00\x00')
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 0 or 1, but got 3')
+
+        # Multiplexers with choices dispatch on their raw values.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_choices.dbc')
+        message = db.get_message_by_name('Message1')
+        self.assertIsNotNone(message._get_mux_dispatch())
+        encoded = message.encode({'Multiplexor': 'MULTIPLEXOR_8',
+                                  'BIT_C': 1,
+                                  'BIT_G': 1,
+                                  'BIT_J': 1,
+                                  'BIT_L': 1})
+        self.assertEqual(message.decode(encoded),
+                         {
+                             'Multiplexor': 'MULTIPLEXOR_8',
+                             'BIT_C': 1,
+                             'BIT_G': 1,
+                             'BIT_J': 1,
+                             'BIT_L': 'On'
+                         })
+
+    def test_multiplexer_dispatch_too_many_branches(self):
+        # Four independent multiplexers with 40 ids each have 40 ** 4
+        # combinations, which are counted rather than enumerated.
+        signals = []
+
+        for i in range(4):
+            signals.append(cantools.database.can.Signal('M{}'.format(i),
+                                                        8 * i,
+                                                        8,
+                                                        is_multiplexer=True))
+
+            for j in range(40):
+                signals.append(
+                    cantools.database.can.Signal('S{}_{}'.format(i, j),
+                                                 32 + 8 * i,
+                                                 8,
+                                                 multiplexer_ids=[j],
+                                                 multiplexer_signal='M{}'.format(i)))
+
+        message = cantools.database.can.Message(1, 'M', 8, signals)
+
+        self.assertEqual(message._count_mux_branches(message._get_codecs()),
+                         40 ** 4)
+        self.assertIsNone(message._get_mux_dispatch())
+        self.assertEqual(message.decode(b'\x01\x02\x03\x04\x05\x06\x07\x08'),
+                         {
+                             'M0': 1,
+                             'M1': 2,
+                             'M2': 3,
+                             'M3': 4,
+                             'S0_1': 5,
+                             'S1_2': 6,
+                             'S2_3': 7,
+                             'S3_4': 8
+                         })
+
+    def test_decode_buffer(self):
+        """Decode messages from slices of a larger receive buffer without
+        copying them.
+
+        """
+
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        payloads = [
+            b'\xc0\x06\xe0\x00\x00\x00\x00\x00',
+            b'\x00\x00\x00\x00\x00\x00\x00\x00',
+            b'\xa5\x5a\x12\x34\x56\x78\x9a\xbc'
+        ]
+        buf = bytearray(b'\xff\xff\xff' + b''.join(payloads))
+        view = memoryview(buf)
+
+        for codec_engine in ['bitstruct', 'compiled']:
+            message.codec_engine = codec_engine
+            message.refresh()
+
+            for i, payload in enumerate(payloads):
+                expected = message.decode(payload)
+                offset = 3 + 8 * i
+
+                self.assertEqual(message.decode(buf, offset=offset, length=8),
+                                 expected)
+                self.assertEqual(message.decode(view, offset=offset, length=8),
+                                 expected)
+                self.assertEqual(message.decode(view[offset:offset + 8]),
+                                 expected)
+                self.assertEqual(message.decode(bytearray(payload)),
+                                 expected)
+                self.assertEqual(db.decode_message('ExampleMessage',
+                                                   buf,
+                                                   offset=offset,
+                                                   length=8),
+                                 expected)
+
+        # Without a length the message is decoded from the data
+        # starting at given offset.
+        self.assertEqual(message.decode(buf, offset=19),
+                         message.decode(payloads[2]))
+
+        # Truncated data.
+        self.assertEqual(message.decode(buf,
+                                        offset=3,
+                                        length=1,
+                                        allow_truncated=True),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2})
+
+        # Multiplexed message.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        encoded = message.encode({'S0': 0, 'S1': 2, 'S4': 3, 'S6': 1, 'S7': 5})
+        buf = bytearray(b'\x00' + encoded + b'\x00')
+        self.assertEqual(message.decode(buf, offset=1, length=len(encoded)),
+                         message.decode(encoded))
+
+        # Container message. The contained data are views of the
+        # buffer.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+        encoded = message.encode([
+            (
+                'message1',
+                {
+                    'message1_SeqCounter': 123,
+                    'message1_CRC': 456,
+                    'signal6': 'zero',
+                    'signal1': 5.2,
+                    'signal5': 3.1415
+                }
+            ),
+            (0xddeeff, b'\xa0\xa1\xa2\xa3\xa4')
+        ])
+        buf = bytearray(b'\x01\x02' + encoded)
+        unpacked = message.unpack_container(buf, offset=2)
+
+        self.assertEqual(unpacked, message.unpack_container(encoded))
+        self.assertIsInstance(unpacked[1][1], memoryview)
+
+        buf[-1] = 0xff
+        self.assertEqual(unpacked[1][1], b'\xa0\xa1\xa2\xa3\xff')
+
+        decoded = message.decode(buf,
+                                 decode_containers=True,
+                                 offset=2)
+        self.assertEqual(decoded[0], message.decode(encoded,
+                                                    decode_containers=True)[0])
+        self.assertEqual(decoded[1], (0xddeeff, b'\xa0\xa1\xa2\xa3\xff'))
+
+    def test_decode_selected_signals(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        encoded = b'\xc0\x06\xe0\x00\x00\x00\x00\x00'
+
+        self.assertEqual(message.decode(encoded, signals=['Temperature']),
+                         {'Temperature': 250.55})
+        self.assertEqual(message.decode(encoded,
+                                        signals=['Temperature', 'Enable'],
+                                        decode_choices=False,
+                                        scaling=False),
+                         {'Enable': 1, 'Temperature': 55})
+        self.assertEqual(message.decode(encoded, signals=[]), {})
+        self.assertEqual(db.decode_message('ExampleMessage',
+                                           encoded,
+                                           signals=['AverageRadius']),
+                         {'AverageRadius': 3.2})
+
+        decoder = message.make_decoder(['Enable', 'AverageRadius'])
+        self.assertEqual(decoder.message, message)
+        self.assertEqual(decoder.signal_names, ['Enable', 'AverageRadius'])
+        self.assertEqual(decoder(encoded),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2})
+        self.assertEqual(decoder.decode(encoded[:1], allow_truncated=True),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2})
+        self.assertEqual(decoder.decode(b'\xff' + encoded, offset=1),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2})
+        self.assertEqual(repr(decoder),
+                         "decoder('ExampleMessage', ['Enable', 'AverageRadius'])")
+
+        with self.assertRaises(KeyError):
+            message.make_decoder(['Foo'])
+
+        # Multiplexed message. Only the multiplexers are decoded in
+        # addition to the selected signals, but not returned.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+
+        for codec_engine in ['bitstruct', 'compiled']:
+            message.codec_engine = codec_engine
+            message.refresh()
+
+            for decoded_message in [
+                    {'S0': 0, 'S1': 0, 'S2': 1, 'S3': 2, 'S6': 1, 'S7': 3},
+                    {'S0': 0, 'S1': 2, 'S4': 3, 'S6': 2, 'S8': 4},
+                    {'S0': 1, 'S5': 5, 'S6': 1, 'S7': 6}
+            ]:
+                encoded = message.encode(decoded_message)
+
+                for signals in [['S2', 'S8'], ['S7', 'S1'], ['S5'], ['S6']]:
+                    decoded = message.decode(encoded, signals=signals)
+                    self.assertEqual(decoded,
+                                     {
+                                         name: value
+                                         for name, value in decoded_message.items()
+                                         if name in signals
+                                     })
+
+            with self.assertRaises(cantools.database.DecodeError) as cm:
+                message.decode(b'\x03\x00\x00\x00\x00\x00\x00\x00',
+                               signals=['S2'])
+
+            self.assertEqual(str(cm.exception),
+                             'expected multiplexer id 0 or 1, but got 3')
+
+        # Container messages are not supported.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.make_decoder(['signal1'])
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode(b'', decode_containers=True, signals=['signal1'])
+
+    def test_database_decoder(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        encoded = b'\xc0\x06\xe0\x00\x00\x00\x00\x00'
+
+        decoder = db.decoder()
+        self.assertEqual(decoder(496, encoded),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2, 'Temperature': 250.55})
+        self.assertEqual(decoder.decode(496, encoded),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2, 'Temperature': 250.55})
+
+        decoder = db.decoder(decode_choices=False, scaling=False)
+        self.assertEqual(decoder(496, encoded),
+                         {'Enable': 1, 'AverageRadius': 32, 'Temperature': 55})
+
+        decoder = db.decoder(allow_truncated=True)
+        self.assertEqual(decoder(496, encoded[:1]),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2})
+
+        with self.assertRaises(KeyError):
+            decoder(497, encoded)
+
+        # Compare to decode_message() with all options for multiplexed
+        # and non-multiplexed messages of both codec engines.
+        for filename in ['tests/files/dbc/multiplex_2.dbc',
+                         'tests/files/dbc/vehicle.dbc']:
+            for codec_engine in ['bitstruct', 'compiled']:
+                db = cantools.database.load_file(filename,
+                                                 codec_engine=codec_engine)
+
+                for decode_choices, scaling in [(True, True), (False, False)]:
+                    decoder = db.decoder(decode_choices=decode_choices,
+                                         scaling=scaling)
+
+                    for message in db.messages:
+                        for encoded in [bytes(message.length),
+                                        bytes(range(1, message.length + 1))]:
+                            try:
+                                expected = db.decode_message(
+                                    message.frame_id,
+                                    encoded,
+                                    decode_choices=decode_choices,
+                                    scaling=scaling)
+                            except cantools.database.DecodeError as e:
+                                with self.assertRaises(
+                                        cantools.database.DecodeError) as cm:
+                                    decoder(message.frame_id, encoded)
+
+                                self.assertEqual(str(cm.exception), str(e))
+                            else:
+                                self.assertEqual(
+                                    decoder(message.frame_id, encoded),
+                                    expected)
+
+        # Container messages.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+        encoded = b'\n\x0b\x0c\t{\x00\xc8\x01\x04V\x0eI@'
+
+        with self.assertRaises(cantools.database.DecodeError):
+            db.decoder()(message.frame_id, encoded)
+
+        self.assertEqual(db.decoder(decode_containers=True)(message.frame_id,
+                                                            encoded),
+                         message.decode(encoded, decode_containers=True))
+
+    def test_database_decoder_memoizing(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        encoded_1 = b'\xc0\x06\xe0\x00\x00\x00\x00\x00'
+        encoded_2 = b'\x00\x00\x00\x00\x00\x00\x00\x00'
+        encoded_3 = b'\xc0\x07\xe0\x00\x00\x00\x00\x00'
+        decoded_1 = {'Enable': 'Enabled', 'AverageRadius': 3.2, 'Temperature': 250.55}
+
+        decoder = db.decoder(cache_size=2)
+        self.assertEqual(decoder.cache_size, 2)
+        self.assertFalse(decoder.delta)
+
+        decoded = decoder(496, encoded_1)
+        self.assertEqual(decoded, decoded_1)
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (0, 1, 0))
+
+        # The cached signals are returned again and cannot be
+        # modified.
+        self.assertIs(decoder(496, bytearray(encoded_1)), decoded)
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (1, 1, 0))
+
+        with self.assertRaises(TypeError):
+            decoded['Enable'] = 'Disabled'
+
+        # The least recently used frame is evicted.
+        decoder(496, encoded_2)
+        decoder(496, encoded_1)
+        decoder(496, encoded_3)
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (2, 3, 1))
+        decoder(496, encoded_1)
+        decoder(496, encoded_2)
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (3, 4, 2))
+
+        decoder.clear()
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (0, 0, 0))
+
+        with self.assertRaises(KeyError):
+            decoder(497, encoded_1)
+
+        # Delta mode, comparing raw values.
+        decoder = db.decoder(delta=True)
+        self.assertTrue(decoder.delta)
+        self.assertEqual(decoder(496, encoded_1), decoded_1)
+        self.assertEqual(decoder(496, encoded_1), {})
+        self.assertEqual(decoder(496, encoded_3), {'Temperature': 250.63})
+        self.assertEqual(decoder(496, encoded_2),
+                         {'Enable': 'Disabled', 'AverageRadius': 0.0, 'Temperature': 250.0})
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (0, 4, 0))
+
+        decoder = db.decoder(decode_choices=False,
+                             scaling=False,
+                             cache_size=10,
+                             delta=True)
+        self.assertEqual(decoder(496, encoded_1),
+                         {'Enable': 1, 'AverageRadius': 32, 'Temperature': 55})
+        self.assertEqual(decoder(496, encoded_3), {'Temperature': 63})
+        self.assertEqual(decoder(496, encoded_1), {'Temperature': 55})
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (1, 2, 0))
+
+        # Signals of another multiplexer branch are changed.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Shared')
+        decoder = db.decoder(cache_size=10, delta=True)
+        decoder(message.frame_id, b'\x01\x00\x00\x00\x00\x00\x00\x00')
+        self.assertEqual(
+            decoder(message.frame_id, b'\x01\x00\x00\x00\x00\x00\x00\x00'),
+            {})
+        self.assertEqual(
+            set(decoder(message.frame_id, b'\x02\x00\x00\x00\x00\x00\x00\x00')),
+            {'S0', 'S2'})
+
+        # The signals are scaled and converted to choices as when
+        # decoded by the message.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_choices.dbc')
+        message = db.get_message_by_name('Message1')
+        encoded = message.encode({'Multiplexor': 'MULTIPLEXOR_8',
+                                  'BIT_C': 1,
+                                  'BIT_G': 1,
+                                  'BIT_J': 1,
+                                  'BIT_L': 1})
+
+        for decode_choices in [False, True]:
+            for scaling in [False, True]:
+                decoder = db.decoder(decode_choices=decode_choices,
+                                     scaling=scaling,
+                                     delta=True)
+                self.assertEqual(
+                    list(decoder(message.frame_id, encoded).items()),
+                    list(message.decode(encoded,
+                                        decode_choices,
+                                        scaling).items()))
+
+        # NaN raw values of float signals are unchanged.
+        db = cantools.database.load_file('tests/files/dbc/floating_point.dbc')
+        decoder = db.decoder(cache_size=0, delta=True)
+        encoded = b'\x00\x00\x00\x00\x00\x00\xf8\x7f'
+        self.assertTrue(math.isnan(decoder(1024, encoded)['Signal1']))
+        self.assertEqual(decoder(1024, encoded), {})
+
+        # Container messages are not cached.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+        encoded = b'\n\x0b\x0c\t{\x00\xc8\x01\x04V\x0eI@'
+        decoder = db.decoder(decode_containers=True, cache_size=10)
+        self.assertEqual(decoder(message.frame_id, encoded),
+                         message.decode(encoded, decode_containers=True))
+        self.assertEqual((decoder.hits, decoder.misses, decoder.evictions),
+                         (0, 0, 0))
+
+    def test_decode_lazy(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        encoded = b'\xc0\x06\xe0\x00\x00\x00\x00\x00'
+
+        decoded = message.decode_lazy(encoded)
+        self.assertEqual(decoded['Temperature'], 250.55)
+        self.assertEqual(len(decoded), 3)
+        self.assertIn('Enable', decoded)
+        self.assertNotIn('Foo', decoded)
+        self.assertEqual(list(decoded), ['Enable', 'AverageRadius', 'Temperature'])
+        self.assertEqual(decoded, message.decode(encoded))
+        self.assertEqual(repr(decoded),
+                         "{'Enable': 'Enabled', 'AverageRadius': 3.2, 'Temperature': 250.55}")
+
+        with self.assertRaises(KeyError):
+            decoded['Foo']
+
+        with self.assertRaises(TypeError):
+            decoded['Enable'] = 'Disabled'
+
+        self.assertEqual(message.decode_lazy(encoded,
+                                             decode_choices=False,
+                                             scaling=False),
+                         {'Enable': 1, 'AverageRadius': 32, 'Temperature': 55})
+        self.assertEqual(message.decode_lazy(b'\xff' + encoded, offset=1),
+                         message.decode(encoded))
+
+        # Truncated data is decoded immediately.
+        self.assertEqual(message.decode_lazy(encoded[:1], allow_truncated=True),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2})
+
+        # Formatting of lazily decoded messages.
+        self.assertEqual(
+            cantools.subparsers.__utils__._format_signals(message, decoded),
+            [
+                'Enable: Enabled',
+                'AverageRadius: 3.2 m',
+                'Temperature: 250.55 degK'
+            ])
+
+        # Multiplexed messages.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+
+        for message in db.messages:
+            for decoded_message in [
+                    {'S0': 0, 'S1': 0, 'S2': 1, 'S3': 2, 'S6': 1, 'S7': 3},
+                    {'S0': 0, 'S1': 2, 'S4': 3, 'S6': 2, 'S8': 4},
+                    {'S0': 1, 'S5': 5, 'S6': 1, 'S7': 6}
+            ]:
+                try:
+                    encoded = message.encode(decoded_message, strict=False)
+                    expected = message.decode(encoded)
+                except (cantools.database.Error, KeyError):
+                    continue
+
+                decoded = message.decode_lazy(encoded)
+                self.assertEqual(list(decoded), list(expected))
+                self.assertEqual(decoded, expected)
+
+        message = db.get_message_by_name('Extended')
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode_lazy(b'\x03\x00\x00\x00\x00\x00\x00\x00')
+
+    def test_make_encoder(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+
+        encoder = message.make_encoder(['Temperature', 'AverageRadius', 'Enable'])
+        self.assertEqual(encoder.message, message)
+        self.assertEqual(encoder.signal_names,
+                         ['Temperature', 'AverageRadius', 'Enable'])
+        self.assertEqual(repr(encoder),
+                         "encoder('ExampleMessage', "
+                         "['Temperature', 'AverageRadius', 'Enable'])")
+        self.assertEqual(encoder(250.55, 3.2, 'Enabled'),
+                         b'\xc0\x06\xe0\x00\x00\x00\x00\x00')
+        self.assertEqual(encoder.encode(250.55, 3.2, 1),
+                         b'\xc0\x06\xe0\x00\x00\x00\x00\x00')
+
+        encoder = message.make_encoder(['Enable', 'AverageRadius', 'Temperature'],
+                                       scaling=False,
+                                       padding=True)
+        self.assertEqual(encoder(1, 32, 55),
+                         b'\xc0\x06\xff\xff\xff\xff\xff\xff')
+
+        # Invalid values.
+        encoder = message.make_encoder(['Temperature', 'AverageRadius', 'Enable'])
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            encoder(300, 3.2, 'Enabled')
+
+        self.assertEqual(str(cm.exception),
+                         'Expected signal "Temperature" value less than or '
+                         'equal to 270.47 in message "ExampleMessage", but '
+                         'got 300.')
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            encoder(250.55, -1, 'Enabled')
+
+        self.assertEqual(str(cm.exception),
+                         'Expected signal "AverageRadius" value greater than '
+                         'or equal to 0 in message "ExampleMessage", but '
+                         'got -1.')
+
+        with self.assertRaises(KeyError):
+            encoder(250.55, 3.2, 'Foo')
+
+        encoder = message.make_encoder(['Temperature', 'AverageRadius', 'Enable'],
+                                       strict=False)
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            encoder(250.55, 100, 'Enabled')
+
+        self.assertEqual(str(cm.exception),
+                         'Signal "AverageRadius" raw value 1000 does not fit '
+                         'in 6 bits.')
+
+        # Invalid signals.
+        with self.assertRaises(KeyError):
+            message.make_encoder(['Foo'])
+
+        with self.assertRaises(cantools.database.EncodeError):
+            message.make_encoder(['Temperature', 'AverageRadius'])
+
+        with self.assertRaises(cantools.database.EncodeError):
+            message.make_encoder(['Temperature', 'AverageRadius', 'Enable', 'Enable'])
+
+        # Multiplexed message.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        encoder = message.make_encoder(['S0', 'S1', 'S2', 'S3', 'S6', 'S7'])
+        self.assertEqual(encoder(0, 0, 1, 2, 1, 3),
+                         message.encode({'S0': 0, 'S1': 0, 'S2': 1,
+                                         'S3': 2, 'S6': 1, 'S7': 3}))
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            encoder(0, 2, 1, 2, 1, 3)
+
+        self.assertEqual(str(cm.exception),
+                         'Expected multiplexer ids (S0, S1, S6) in {(0, 0, 1)}, '
+                         'but got (0, 2, 1)')
+
+        encoder = message.make_encoder(['S0', 'S5', 'S6', 'S7'])
+        self.assertEqual(encoder(1, 5, 1, 6),
+                         message.encode({'S0': 1, 'S5': 5, 'S6': 1, 'S7': 6}))
+
+
 # This file is not '__main__' when executed via 'python setup.py3
 # test'.
 logging.basicConfig(level=logging.WARNING)
@@ -496,6 +496,18 @@ class CanToolsDiagnosticsDatabaseTest(unittest.TestCase):
         self.assertEqual(len(db.dids[-1].datas), 2)
 
 
+    def test_decode_buffer(self):
+        db = cantools.db.load_file('tests/files/cdd/le-example.cdd',
+                                   encoding='iso-8859-1')
+        did = db.get_did_by_name('ECU_Identification')
+        encoded = b'\x34\x12\x78\x56\x12\x90\x56\x34\xcd\xab'
+        buf = bytearray(b'\x00\x00' + encoded)
+
+        self.assertEqual(did.decode(buf, offset=2, length=len(encoded)),
+                         did.decode(encoded))
+        self.assertEqual(did.decode(memoryview(buf)[2:]),
+                         did.decode(encoded))
+
 # This file is not '__main__' when executed via 'python setup.py3
 # test'.
 logging.basicConfig(level=logging.WARNING)